@@ -56,6 +56,7 @@ from erirpg.agent.plan import Plan, Step, StepStatus
 from erirpg.agent.run import RunState, save_run, load_run, get_latest_run, Decision, RunSummary
 from erirpg.agent.learner import auto_learn, get_knowledge, is_stale, update_learning
 from erirpg.memory import load_knowledge as load_knowledge_store, git_head, in_git_repo
+from erirpg.hooks.active import refresh_active
 from erirpg.config import load_config, ProjectConfig
 
 if TYPE_CHECKING:
@@ -840,7 +841,7 @@ class Agent:
             return
 
         try:
-            from erirpg.memory import load_knowledge, save_knowledge
+            from erirpg.memory import flush_knowledge, load_knowledge
             from erirpg.registry import Registry
 
             # Find project name
@@ -860,7 +861,7 @@ class Agent:
                     stored.versions[-1].commit_after = commit_hash
                     store.add_learning(stored)
 
-            save_knowledge(self.project_path, store)
+            flush_knowledge(self.project_path, store)
         except Exception as e:
             print(f"Warning: Could not update learning commits: {e}")
 
@@ -1077,12 +1078,14 @@ class Agent:
         state_file = state_dir / "preflight_state.json"
         with open(state_file, "w") as f:
             json.dump(state, f, indent=2)
+        refresh_active(self.project_path)
 
     def _clear_preflight_state(self) -> None:
         """Clear preflight state file."""
         state_file = Path(self.project_path) / ".eri-rpg" / "preflight_state.json"
         if state_file.exists():
             state_file.unlink()
+            refresh_active(self.project_path)
 
     def _snapshot_file(self, file_path: str) -> None:
         """Snapshot a file's content for potential rollback."""
@@ -1401,7 +1404,7 @@ class Agent:
         Rollback a file to a previous version.
 
         Can rollback using either:
-        1. Stored snapshots (default) - from LearningVersion.files_content
+        1. Stored snapshots (default) - from LearningVersion file content blobs
         2. Git (use_git=True) - checkout from commit_before
 
         Args:
@@ -1448,24 +1451,25 @@ class Agent:
         # Determine target version
         target = to_version if to_version is not None else learning.current_version - 1
 
-        if target < 0 or target >= len(learning.versions):
+        # Look up by version number - retention may have pruned older ones
+        version = learning.get_version(target)
+        if version is None:
+            available = [v.version for v in learning.versions]
             result = RollbackResult(
                 from_version=learning.current_version,
                 to_version=target,
                 module_path=file_path,
                 success=False,
-                error=f"Version {target} not found (have {len(learning.versions)} versions)",
+                error=f"Version {target} not found (available: {available})",
             )
             return result
 
-        version = learning.versions[target]
-
         # Git-based rollback
         if use_git and version.commit_before:
             return self._rollback_git(file_path, version.commit_before, learning, dry_run)
 
         # Snapshot-based rollback
-        if not version.files_content:
+        if not version.has_content():
             result = RollbackResult(
                 from_version=learning.current_version,
                 to_version=target,
@@ -1481,7 +1485,7 @@ class Agent:
             return result
 
         # Enable writes temporarily for rollback
-        files_to_restore = list(version.files_content.keys())
+        files_to_restore = version.content_paths()
         if not dry_run:
             enable_writes(files_to_restore, self.project_path)
 
@@ -1624,7 +1628,7 @@ class Agent:
                 "timestamp": v.timestamp.isoformat(),
                 "operation": v.operation,
                 "change_description": v.change_description,
-                "has_content": bool(v.files_content),
+                "has_content": v.has_content(),
                 "commit_before": v.commit_before,
                 "commit_after": v.commit_after,
                 "is_current": v.version == learning.current_version,
@@ -1679,13 +1683,12 @@ class Agent:
             result["reason"] = "Already at first version"
             return result
 
-        if target >= len(learning.versions):
+        version = learning.get_version(target)
+        if version is None:
             result["reason"] = f"Version {target} not found"
             return result
 
-        version = learning.versions[target]
-
-        result["snapshot_available"] = bool(version.files_content)
+        result["snapshot_available"] = version.has_content()
         result["git_available"] = bool(version.commit_before)
 
         if result["snapshot_available"] or result["git_available"]:
@@ -9,7 +9,7 @@ import os
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from erirpg.memory import KnowledgeStore, StoredLearning, load_knowledge, save_knowledge
+from erirpg.memory import KnowledgeStore, StoredLearning, flush_knowledge, load_knowledge
 from erirpg.refs import CodeRef
 
 
@@ -72,9 +72,9 @@ def auto_learn(
         store.add_learning(learning)
         learned.append(file_path)
 
-    # Save updated knowledge
+    # Journal new learnings (no full rewrite of knowledge.json)
     if learned:
-        save_knowledge(project_path, store)
+        flush_knowledge(project_path, store)
 
     return learned
 
@@ -125,7 +125,7 @@ def update_learning(
 
     existing.learned_at = datetime.now()
     store.add_learning(existing)  # Overwrites existing
-    save_knowledge(project_path, store)
+    flush_knowledge(project_path, store)
     return True
 
 
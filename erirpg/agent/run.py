@@ -15,6 +15,7 @@ from typing import Any, Dict, List, Optional
 
 from erirpg.spec import Spec
 from erirpg.agent.plan import Plan, Step, StepStatus
+from erirpg.hooks.active import refresh_active
 
 
 # ============================================================================
@@ -594,6 +595,7 @@ def save_run(project_path: str, run: RunState) -> str:
     Path(run_dir).mkdir(parents=True, exist_ok=True)
     path = os.path.join(run_dir, f"{run.id}.json")
     run.save(path)
+    refresh_active(project_path)
     return path
 
 
@@ -0,0 +1,145 @@
+"""
+Content-addressed blob store for EriRPG.
+
+Stores file contents captured by learning snapshots once, keyed by the
+SHA-256 of the content and zlib-compressed on disk. Learning versions only
+hold the hashes, so identical content snapshotted across many versions
+costs a single blob.
+
+Storage structure:
+    .eri-rpg/
+    └── blobs/
+        └── ab/
+            └── cdef0123...   # zlib(content), name = rest of sha256
+
+Usage:
+    blobs = BlobStore(project_path)
+    digest = blobs.put(content)
+    content = blobs.get(digest)
+    removed = blobs.gc(referenced_digests)
+"""
+
+import hashlib
+import os
+import time
+import zlib
+from typing import Iterable, Iterator, Optional
+
+# Unreferenced blobs younger than this are kept by gc: a writer may have
+# put() them and not yet saved the knowledge that references them.
+GC_GRACE_SECONDS = 300
+
+
+def content_digest(content: str) -> str:
+    """Get the full SHA-256 hex digest used as a blob key."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class BlobStore:
+    """Content-addressed, compressed blob storage under .eri-rpg/blobs/."""
+
+    def __init__(self, project_path: str):
+        self.project_path = project_path
+        self.blob_dir = os.path.join(project_path, ".eri-rpg", "blobs")
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], digest[2:])
+
+    def put(self, content: str) -> str:
+        """Store content and return its digest.
+
+        Writing is skipped when the blob already exists; its mtime is
+        refreshed instead so a concurrent gc treats it as new.
+        """
+        digest = content_digest(content)
+        path = self._path(digest)
+        if os.path.exists(path):
+            try:
+                os.utime(path)
+                return digest
+            except FileNotFoundError:
+                pass  # Collected meanwhile: write it again
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(zlib.compress(content.encode("utf-8"), 6))
+        os.replace(tmp, path)
+        return digest
+
+    def get(self, digest: str) -> Optional[str]:
+        """Read content for a digest, or None if missing or corrupt."""
+        path = self._path(digest)
+        try:
+            with open(path, "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, UnicodeDecodeError) as e:
+            import sys; print(f"[EriRPG] Bad blob {digest[:12]}: {e}", file=sys.stderr)
+            return None
+
+    def has(self, digest: str) -> bool:
+        """Check whether a blob exists."""
+        return os.path.exists(self._path(digest))
+
+    def iter_digests(self) -> Iterator[str]:
+        """Yield the digest of every stored blob."""
+        if not os.path.isdir(self.blob_dir):
+            return
+        for prefix in os.listdir(self.blob_dir):
+            sub = os.path.join(self.blob_dir, prefix)
+            if len(prefix) != 2 or not os.path.isdir(sub):
+                continue
+            for name in os.listdir(sub):
+                if not name.endswith(".tmp"):
+                    yield prefix + name
+
+    def gc(
+        self,
+        referenced: Iterable[str],
+        dry_run: bool = False,
+        grace: float = GC_GRACE_SECONDS,
+    ) -> dict:
+        """Remove blobs that are not referenced.
+
+        Unreferenced blobs modified within the last `grace` seconds are
+        kept, since their references may not be saved yet.
+
+        Args:
+            referenced: Digests still in use
+            dry_run: Only report what would be removed
+            grace: Minimum age in seconds of a blob to remove
+
+        Returns:
+            Dict with stats: {"kept": n, "removed": n, "bytes_freed": n}
+        """
+        keep = set(referenced)
+        stats = {"kept": 0, "removed": 0, "bytes_freed": 0}
+        cutoff = time.time() - grace
+
+        for digest in list(self.iter_digests()):
+            if digest in keep:
+                stats["kept"] += 1
+                continue
+            path = self._path(digest)
+            try:
+                st = os.stat(path)
+                if st.st_mtime > cutoff:
+                    stats["kept"] += 1
+                    continue
+                size = st.st_size
+                if not dry_run:
+                    os.remove(path)
+            except OSError:
+                continue
+            stats["removed"] += 1
+            stats["bytes_freed"] += size
+
+        if not dry_run and os.path.isdir(self.blob_dir):
+            for prefix in os.listdir(self.blob_dir):
+                sub = os.path.join(self.blob_dir, prefix)
+                if os.path.isdir(sub) and not os.listdir(sub):
+                    os.rmdir(sub)
+
+        return stats
@@ -33,7 +33,8 @@ Structure (27 modules, 92+ commands):
     ├── session.py       # session, handoff, gaps
     ├── analyze_cmd.py   # analyze, implement, transplant-feature, describe-feature
     ├── persona_cmd.py   # persona, workflow, ctx, commands
-    └── drift.py         # drift-status, enrich-learnings, sync-patterns, sync, drift-patterns, drift-impact
+    ├── drift.py         # drift-status, enrich-learnings, sync-patterns, sync, drift-patterns, drift-impact
+    └── hooks_cmd.py     # hooks (start, stop, status, serve, stats)
 
 Usage:
     from erirpg.cli_commands import register_all
@@ -96,6 +97,7 @@ def register_all(cli: "click.Group") -> None:
     from . import coder_cmds
     from . import review_cmd
     from . import plugin
+    from . import hooks_cmd
 
     setup.register(cli)
     mode.register(cli)
@@ -132,3 +134,4 @@ def register_all(cli: "click.Group") -> None:
     coder_cmds.register(cli)
     review_cmd.register(cli)
     plugin.register(cli)
+    hooks_cmd.register(cli)
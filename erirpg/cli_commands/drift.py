@@ -142,6 +142,9 @@ def register(cli):
         if stats['failed'] > 0:
             click.echo(f"❌ Failed: {stats['failed']}")
 
+        if stats['timed_out'] > 0:
+            click.echo(f"⏱️  Timed out (retry later): {stats['timed_out']}")
+
         click.echo("")
         click.echo("Learnings now have:")
         click.echo("  - drift_confidence: Pattern match confidence score")
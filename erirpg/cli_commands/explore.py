@@ -143,6 +143,7 @@ def register(cli):
         from erirpg.registry import Registry
         from erirpg.indexer import get_or_load_graph
         from erirpg.ops import find_modules
+        from erirpg.tfidf import get_module_index
 
         registry = Registry.get_instance()
         proj = registry.get(project)
@@ -157,7 +158,8 @@ def register(cli):
             click.echo(f"Error: {e}", err=True)
             sys.exit(1)
 
-        results = find_modules(graph, query, limit=limit)
+        index = get_module_index(graph, proj.graph_path)
+        results = find_modules(graph, query, limit=limit, index=index)
 
         if not results:
             click.echo(f"No modules match: {query}")
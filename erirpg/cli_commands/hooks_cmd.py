@@ -0,0 +1,113 @@
+"""
+Hook Commands - Hook daemon control and latency stats.
+
+Commands:
+- hooks start: Start the hook daemon in the background
+- hooks stop: Stop the hook daemon
+- hooks status: Show whether the hook daemon is running
+- hooks serve: Run the hook daemon in the foreground
+- hooks stats: Report hook latency percentiles by hook and phase
+"""
+
+import json
+import sys
+import click
+
+
+def register(cli):
+    """Register hook commands with CLI."""
+
+    @cli.group()
+    def hooks():
+        """Claude Code hook daemon commands.
+
+        The hook daemon keeps hook code and project state loaded and serves
+        pretooluse/posttooluse/persona_detect calls made through
+        erirpg/hooks/client.py. Without it, hooks run in-process as before.
+
+        \b
+            hooks start   - Start the daemon in the background
+            hooks stop    - Stop the daemon
+            hooks status  - Show daemon status
+            hooks serve   - Run the daemon in the foreground
+            hooks stats   - Hook latency p50/p95/p99 by phase
+        """
+        pass
+
+    @hooks.command("start")
+    def hooks_start():
+        """Start the hook daemon in the background."""
+        from erirpg.hooks.daemon import start_daemon
+        pid = start_daemon()
+        if pid is None:
+            click.echo("Error: hook daemon did not start", err=True)
+            sys.exit(1)
+        click.echo(f"Hook daemon running (pid {pid})")
+
+    @hooks.command("stop")
+    def hooks_stop():
+        """Stop the hook daemon."""
+        from erirpg.hooks.daemon import stop_daemon
+        if stop_daemon():
+            click.echo("Hook daemon stopped")
+        else:
+            click.echo("Hook daemon not running")
+
+    @hooks.command("status")
+    def hooks_status():
+        """Show whether the hook daemon is running."""
+        from erirpg.hooks.daemon import daemon_status
+        status = daemon_status()
+        if status is None:
+            click.echo("Hook daemon: not running (hooks run in-process)")
+        else:
+            click.echo(f"Hook daemon: running (pid {status['pid']}, socket {status['socket']})")
+
+    @hooks.command("serve")
+    @click.option("--idle-timeout", default=1800.0, help="Exit after this many idle seconds")
+    def hooks_serve(idle_timeout: float):
+        """Run the hook daemon in the foreground."""
+        from erirpg.hooks.daemon import serve
+        sys.exit(serve(idle_timeout=idle_timeout))
+
+    @hooks.command("stats")
+    @click.option("--hook", "hook_name", default=None, help="Only report this hook")
+    @click.option("--json", "as_json", is_flag=True, help="Output as JSON")
+    def hooks_stats(hook_name: str, as_json: bool):
+        """Report hook latency percentiles by hook and phase.
+
+        Timings are recorded by every hook invocation in
+        ~/.eri-rpg/hook-timings.jsonl (milliseconds).
+
+        Examples:
+            eri-rpg hooks stats
+            eri-rpg hooks stats --hook pretooluse
+        """
+        from erirpg.hooks.timing import HOOK_TIMEOUTS, PERCENTILES, load_records, summarize
+
+        summary = summarize(load_records())
+        if hook_name:
+            summary = {k: v for k, v in summary.items() if k == hook_name}
+
+        if as_json:
+            click.echo(json.dumps(summary, indent=2))
+            return
+        if not summary:
+            click.echo("No hook timings recorded yet.")
+            return
+
+        header = f"  {'phase':<10} {'n':>6}" + "".join(f" {'p' + str(p):>9}" for p in PERCENTILES)
+        for hook, phases in sorted(summary.items()):
+            timeout = HOOK_TIMEOUTS.get(hook)
+            click.echo(f"{hook}" + (f" (timeout {timeout}s)" if timeout else ""))
+            click.echo(header)
+            # Whole invocations first, then phases by p99
+            names = sorted(phases, key=lambda n: (n != "total", -phases[n]["p99"]))
+            for name in names:
+                stats = phases[name]
+                cols = "".join(f" {stats['p' + str(p)]:>9.2f}" for p in PERCENTILES)
+                click.echo(f"  {name:<10} {stats['n']:>6}{cols}")
+            if timeout:
+                worst = phases["total"]["p99"] if "total" in phases else 0.0
+                click.echo(f"  p99 uses {worst / (timeout * 1000):.1%} of the timeout")
+            click.echo("")
@@ -49,7 +49,7 @@ def register(cli):
         from erirpg.registry import Registry
         from erirpg.indexer import get_or_load_graph
         from erirpg.refs import CodeRef
-        from erirpg.memory import StoredLearning, load_knowledge, save_knowledge
+        from erirpg.memory import StoredLearning, flush_knowledge, load_knowledge
 
         registry = Registry.get_instance()
         proj = registry.get(project)
@@ -105,7 +105,7 @@ def register(cli):
         # Load existing knowledge store and add learning
         store = load_knowledge(proj.path, project)
         store.add_learning(learning)
-        save_knowledge(proj.path, store)
+        flush_knowledge(proj.path, store)
 
         click.echo(f"\n✓ Stored learning for {module_path}")
         click.echo(f"  Summary: {summary}")
@@ -333,7 +333,7 @@ def register(cli):
                     save_knowledge(proj.path, store)
                     click.echo(f"✓ Rolled back learning: v{old_version} -> v{target}")
 
-            elif version_obj.files_content:
+            elif version_obj.has_content():
                 # Use stored snapshot
                 result = learning.rollback_files(
                     project_path=proj.path,
@@ -368,7 +368,7 @@ def register(cli):
                 click.echo("To also restore file contents, use --code flag.")
 
                 # Show what's available
-                if version_obj.files_content:
+                if version_obj.has_content():
                     click.echo(f"\n  eri-rpg rollback {project} {module_path} -v {target} --code")
                 elif version_obj.commit_before:
                     click.echo(f"\n  eri-rpg rollback {project} {module_path} -v {target} --code --use-git")
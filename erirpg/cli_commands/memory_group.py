@@ -7,6 +7,7 @@ Commands (full tier):
 - memory stale: List stale learnings
 - memory refresh: Update stale learning
 - memory migrate: Migrate v1 knowledge to v2
+- memory gc: Garbage-collect snapshot blobs
 """
 
 import os
@@ -34,6 +35,7 @@ def register(cli):
             memory stale     - List stale learnings
             memory refresh   - Update stale learning
             memory migrate   - Migrate v1 knowledge to v2
+            memory gc        - Garbage-collect snapshot blobs
         """
         pass
 
@@ -86,9 +88,10 @@ def register(cli):
             click.echo(f"  Patterns: {stats['patterns']}")
             click.echo(f"  Runs tracked: {stats['runs']}")
 
-            # Staleness check
-            stale = store.get_stale_learnings(proj.path)
-            fresh = store.get_fresh_learnings(proj.path)
+            # Staleness check (one batch, hash cache reused across runs)
+            staleness = store.check_staleness(proj.path)
+            stale = [p for p, is_stale in staleness.items() if is_stale]
+            fresh = [p for p, is_stale in staleness.items() if not is_stale]
 
             click.echo("")
             click.echo("Staleness:")
@@ -150,8 +153,9 @@ def register(cli):
         click.echo(f"Search results for '{query}':")
         click.echo("")
 
+        staleness = store.check_staleness(proj.path, [r[0] for r in results])
         for path, learning, score in results:
-            is_stale = learning.is_stale(proj.path)
+            is_stale = staleness.get(path, False)
             stale_marker = " [STALE]" if is_stale else ""
             click.echo(f"  {path} (score: {score:.2f}){stale_marker}")
             click.echo(f"    {learning.summary}")
@@ -320,3 +324,32 @@ def register(cli):
         else:
             click.echo(f"Migration failed: {result['error']}", err=True)
             sys.exit(1)
+
+    @memory.command("gc")
+    @click.argument("project")
+    @click.option("--dry-run", is_flag=True, help="Report what would be removed")
+    def memory_gc(project: str, dry_run: bool):
+        """Garbage-collect snapshot blobs.
+
+        Moves any inline snapshot content into .eri-rpg/blobs/ and removes
+        blobs no learning version references anymore.
+        """
+        from erirpg.registry import Registry
+        from erirpg.memory import gc_blobs
+
+        registry = Registry.get_instance()
+        proj = registry.get(project)
+
+        if not proj:
+            click.echo(f"Error: Project '{project}' not found", err=True)
+            sys.exit(1)
+
+        stats = gc_blobs(proj.path, dry_run=dry_run)
+
+        verb = "Would remove" if dry_run else "Removed"
+        click.echo(f"Snapshot blobs for {project}:")
+        click.echo(f"  Kept: {stats['kept']}")
+        click.echo(f"  {verb}: {stats['removed']} ({stats['bytes_freed']} bytes)")
+        if stats['externalized']:
+            moved = "Would move" if dry_run else "Moved"
+            click.echo(f"  {moved} inline snapshots to blobs: {stats['externalized']}")
@@ -165,7 +165,7 @@ def register(cli):
                 --alternatives "SQLite,MySQL"
         """
         from erirpg.registry import Registry
-        from erirpg.memory import StoredDecision, load_knowledge, save_knowledge
+        from erirpg.memory import StoredDecision, flush_knowledge, load_knowledge
 
         registry = Registry.get_instance()
         proj = registry.get(project)
@@ -194,7 +194,7 @@ def register(cli):
         )
 
         store.add_decision(decision)
-        save_knowledge(proj.path, store)
+        flush_knowledge(proj.path, store)
 
         click.echo(f"✓ Recorded decision: {decision_id}")
         click.echo(f"  Title: {title}")
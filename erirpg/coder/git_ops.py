@@ -7,12 +7,16 @@ Commands:
 - compare: Branch management and comparison
 """
 
+import json
+import os
 import subprocess
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from datetime import datetime
 import re
 
+from erirpg.hooks.gitrefs import current_branch, git_common_dir
+
 from . import get_planning_dir, timestamp
 
 
@@ -40,8 +44,7 @@ def is_clean() -> bool:
 
 def get_current_branch() -> str:
     """Get current branch name."""
-    code, out, _ = run_git(["rev-parse", "--abbrev-ref", "HEAD"])
-    return out.strip() if code == 0 else "main"
+    return current_branch(str(Path.cwd())) or "main"
 
 
 def get_commit_hash(ref: str = "HEAD") -> str:
@@ -50,11 +53,151 @@ def get_commit_hash(ref: str = "HEAD") -> str:
     return out.strip() if code == 0 else ""
 
 
-def find_plan_commits(plan_id: str) -> List[Dict[str, str]]:
+# One record per commit: hash, author date, raw message; files follow
+LOG_FORMAT = "--format=%x1e%H%x1f%aI%x1f%B%x1f"
+
+# Persistent index of tagged commits, kept in the git directory (never committed)
+COMMIT_INDEX_FILE = "erirpg-commit-index.json"
+COMMIT_INDEX_VERSION = 2
+
+# git log arguments limiting the walk to commits that may carry a tag
+TAGGED_ONLY = ["--fixed-strings", "--grep=("]
+
+# Parenthesized tags in commit messages, e.g. "(02-03)"
+TAG_PATTERN = re.compile(r"\(([^()\s]+)\)")
+
+
+def _parse_record(record: str) -> Optional[Dict[str, Any]]:
+    parts = record.split("\x1f", 3)
+    if len(parts) < 4:
+        return None
+    full_hash, date, body, files_out = parts
+    # %s is the first paragraph of the message joined into one line
+    subject = " ".join(body.strip().split("\n\n", 1)[0].split("\n")).strip()
+    return {
+        "hash": full_hash[:7],
+        "full_hash": full_hash,
+        "message": subject,
+        "date": date,
+        "files": [f for f in files_out.split("\n") if f],
+        "tags": sorted(set(TAG_PATTERN.findall(body))),
+    }
+
+
+def iter_commits(args: List[str], cwd: Optional[Path] = None) -> Iterator[Dict[str, Any]]:
+    """Stream commits of `git log <args>` with the files each changed.
+
+    Runs one git process and parses its output as it arrives, instead of
+    one `git show` per commit.
+
+    Yields:
+        Commit dicts with hash, full_hash, message (subject), date,
+        files and tags (parenthesized tokens of the full message)
+    """
+    proc = subprocess.Popen(
+        ["git", "log", LOG_FORMAT, "--name-only"] + args,
+        cwd=cwd or Path.cwd(),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    record = None
+    try:
+        for line in proc.stdout:
+            if line.startswith("\x1e"):
+                if record is not None:
+                    commit = _parse_record(record)
+                    if commit:
+                        yield commit
+                record = line[1:]
+            elif record is not None:
+                record += line
+        if record is not None:
+            commit = _parse_record(record)
+            if commit:
+                yield commit
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        proc.stdout.close()
+        proc.wait()
+
+
+def _index_path(cwd: Optional[Path] = None) -> Optional[Path]:
+    common = git_common_dir(str(cwd or Path.cwd()))
+    return Path(common) / COMMIT_INDEX_FILE if common else None
+
+
+def load_commit_index(cwd: Optional[Path] = None) -> Optional[List[Dict[str, Any]]]:
+    """Tagged commits reachable from any ref, newest first, from the commit index.
+
+    Only commits whose message carries a parenthesized tag are indexed
+    (message, date, files, tags), so the index grows with planned work,
+    not with history. It is updated from the ref tips it was last built
+    at: only commits added since are read. If commits were dropped
+    (rebase, deleted branch), it is rebuilt.
+
+    Returns:
+        Commit dicts as yielded by iter_commits, or None if the index
+        can't be used (not a git repository, git failed)
+    """
+    path = _index_path(cwd)
+    if path is None:
+        return None
+
+    code, out, _ = run_git(["rev-parse", "--all"], cwd)
+    if code != 0:
+        return None
+    tips = sorted(set(out.split()))
+
+    try:
+        index = json.loads(path.read_text())
+        if index.get("version") != COMMIT_INDEX_VERSION:
+            index = None
+    except (OSError, ValueError):
+        index = None
+
+    if index is not None and index.get("tips") == tips:
+        return index["commits"]
+
+    commits = None
+    if index is not None and index.get("tips"):
+        # Commits reachable from the old tips but not from any ref now
+        code, out, _ = run_git(["rev-list", "--count"] + index["tips"] + ["--not", "--all"], cwd)
+        if code == 0 and out.strip() == "0":
+            new = iter_commits(TAGGED_ONLY + ["--all", "--not"] + index["tips"], cwd)
+            added = [c for c in new if c["tags"]]
+            commits = added + index["commits"]
+    if commits is None:
+        commits = [c for c in iter_commits(TAGGED_ONLY + ["--all"], cwd) if c["tags"]]
+
+    tmp = path.with_name(f"{COMMIT_INDEX_FILE}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps({"version": COMMIT_INDEX_VERSION, "tips": tips, "commits": commits}))
+        os.replace(tmp, path)
+    except OSError:
+        pass  # Index is an optimization only
+    return commits
+
+
+def _tagged_commits(matches, grep: str, use_index: bool) -> List[Dict[str, str]]:
+    """Commits with a tag accepted by matches (index, else one git log)."""
+    commits = load_commit_index() if use_index else None
+    if commits is None:
+        commits = iter_commits(["--all", f"--grep={grep}"])
+    return [
+        {k: c[k] for k in ("hash", "full_hash", "message", "files")}
+        for c in commits
+        if any(matches(tag) for tag in c["tags"])
+    ]
+
+
+def find_plan_commits(plan_id: str, use_index: bool = True) -> List[Dict[str, str]]:
     """Find commits for a specific plan.
 
     Args:
         plan_id: Plan identifier like "2-03" or "02-03"
+        use_index: Answer from the persistent commit index
 
     Returns:
         List of commit dicts with hash, message, files
@@ -62,69 +205,25 @@ def find_plan_commits(plan_id: str) -> List[Dict[str, str]]:
     # Normalize plan_id
     if "-" in plan_id:
         parts = plan_id.split("-")
-        pattern = f"({parts[0].zfill(2)}-{parts[1].zfill(2)})"
+        tag = f"{parts[0].zfill(2)}-{parts[1].zfill(2)}"
     else:
-        pattern = f"({plan_id})"
-
-    # Find commits matching pattern
-    code, out, _ = run_git([
-        "log", "--oneline", "--all",
-        f"--grep={pattern}",
-        "--format=%H|%s"
-    ])
+        tag = plan_id
 
-    if code != 0 or not out.strip():
-        return []
-
-    commits = []
-    for line in out.strip().split("\n"):
-        if "|" in line:
-            hash_val, msg = line.split("|", 1)
-            # Get files for this commit
-            _, files_out, _ = run_git(["show", "--name-only", "--format=", hash_val])
-            commits.append({
-                "hash": hash_val[:7],
-                "full_hash": hash_val,
-                "message": msg,
-                "files": [f for f in files_out.strip().split("\n") if f],
-            })
-
-    return commits
+    return _tagged_commits(lambda t: t == tag, f"({tag})", use_index)
 
 
-def find_phase_commits(phase_num: int) -> List[Dict[str, str]]:
+def find_phase_commits(phase_num: int, use_index: bool = True) -> List[Dict[str, str]]:
     """Find all commits for a phase.
 
     Args:
         phase_num: Phase number
+        use_index: Answer from the persistent commit index
 
     Returns:
         List of commit dicts
     """
-    pattern = f"({phase_num:02d}-"
-
-    code, out, _ = run_git([
-        "log", "--oneline", "--all",
-        f"--grep={pattern}",
-        "--format=%H|%s"
-    ])
-
-    if code != 0 or not out.strip():
-        return []
-
-    commits = []
-    for line in out.strip().split("\n"):
-        if "|" in line:
-            hash_val, msg = line.split("|", 1)
-            _, files_out, _ = run_git(["show", "--name-only", "--format=", hash_val])
-            commits.append({
-                "hash": hash_val[:7],
-                "full_hash": hash_val,
-                "message": msg,
-                "files": [f for f in files_out.strip().split("\n") if f],
-            })
-
-    return commits
+    prefix = f"{phase_num:02d}-"
+    return _tagged_commits(lambda t: t.startswith(prefix), f"({prefix}", use_index)
 
 
 def find_last_plan_commits() -> List[Dict[str, str]]:
@@ -175,44 +274,25 @@ def find_untracked_commits(since: Optional[str] = None) -> List[Dict[str, Any]]:
         - date: ISO date string
         - files: list of changed files
     """
-    args = ["log", "--oneline", "--no-merges", "-50", "--format=%H|%s|%aI"]
+    args = ["--no-merges", "-50"]
     if since:
         args.append(f"--since={since}")
 
-    code, out, _ = run_git(args)
-    if code != 0 or not out.strip():
-        return []
-
     # Plan commits match pattern like (02-03) in message
     plan_pattern = re.compile(r"\(\d+-\d+\)")
 
     results = []
-    for line in out.strip().split("\n"):
-        parts = line.split("|", 2)
-        if len(parts) < 3:
-            continue
-
-        full_hash, message, date = parts[0], parts[1], parts[2]
-
+    for commit in iter_commits(args):
         # Skip plan commits
-        if plan_pattern.search(message):
+        if plan_pattern.search(commit["message"]):
             continue
 
-        # Get files changed by this commit
-        _, files_out, _ = run_git(["show", "--name-only", "--format=", full_hash])
-        files = [f for f in files_out.strip().split("\n") if f]
-
         # Skip commits that only touch .planning/ files
+        files = commit["files"]
         if files and all(f.startswith(".planning/") for f in files):
             continue
 
-        results.append({
-            "hash": full_hash[:7],
-            "full_hash": full_hash,
-            "message": message,
-            "date": date,
-            "files": files,
-        })
+        results.append({k: commit[k] for k in ("hash", "full_hash", "message", "date", "files")})
 
     return results
 
@@ -25,8 +25,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 
-# Where PostToolUse hook stores modified files
-MODIFIED_FILES_STORE = "/tmp/erirpg-modified-files.json"
+from erirpg.hooks.modified_files import clear_modified, read_modified
+
+# Global store used by older PostToolUse hooks (read until it's cleared)
+LEGACY_MODIFIED_FILES_STORE = "/tmp/erirpg-modified-files.json"
 
 
 @dataclass
@@ -41,27 +43,40 @@ class CommitResult:
 
 
 def get_modified_files(project_path: str) -> List[str]:
-    """Get files modified in this project since last commit."""
+    """Get files modified in this project since last commit.
+
+    Merges the session logs of all Claude Code sessions (deduped).
+    """
+    files = {}
     try:
-        if os.path.exists(MODIFIED_FILES_STORE):
-            with open(MODIFIED_FILES_STORE, "r") as f:
+        if os.path.exists(LEGACY_MODIFIED_FILES_STORE):
+            with open(LEGACY_MODIFIED_FILES_STORE, "r") as f:
                 data = json.load(f)
                 if project_path in data:
-                    return data[project_path].get("files", [])
+                    files.update(dict.fromkeys(data[project_path].get("files", [])))
     except Exception:
         pass
-    return []
+    files.update(dict.fromkeys(read_modified(project_path)))
+    return list(files)
+
 
+def clear_modified_files(project_path: str, files: Optional[List[str]] = None) -> None:
+    """Clear tracked modified files after commit.
 
-def clear_modified_files(project_path: str) -> None:
-    """Clear tracked modified files after commit."""
+    Args:
+        project_path: Project directory
+        files: Committed files (absolute or relative to project_path);
+            files tracked since they were read are kept. None clears
+            everything.
+    """
+    clear_modified(project_path, files)
     try:
-        if os.path.exists(MODIFIED_FILES_STORE):
-            with open(MODIFIED_FILES_STORE, "r") as f:
+        if os.path.exists(LEGACY_MODIFIED_FILES_STORE):
+            with open(LEGACY_MODIFIED_FILES_STORE, "r") as f:
                 data = json.load(f)
             if project_path in data:
                 del data[project_path]
-                with open(MODIFIED_FILES_STORE, "w") as f:
+                with open(LEGACY_MODIFIED_FILES_STORE, "w") as f:
                     json.dump(data, f, indent=2)
     except Exception:
         pass
@@ -217,7 +232,7 @@ def verify_and_commit(
     if commit_hash:
         result.committed = True
         result.commit_hash = commit_hash
-        clear_modified_files(project_path)
+        clear_modified_files(project_path, files)
 
         # Sync status files after successful commit
         from erirpg.status_sync import sync_status_files
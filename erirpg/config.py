@@ -663,6 +663,11 @@ def get_mode(project_path: str) -> Mode:
         except (json.JSONDecodeError, KeyError):
             pass
 
+    # Learnings may only be journaled so far
+    journal_file = knowledge_file.with_name("knowledge.journal.jsonl")
+    if journal_file.exists() and journal_file.stat().st_size > 0:
+        return "maintain"
+
     # Default for new/empty projects
     return "bootstrap"
 
@@ -18,13 +18,21 @@ The v2 ref system enables:
 TOKEN BUDGET ENFORCEMENT:
 - Default budget: 6500 tokens (fits comfortably in context)
 - Uses tiktoken for ACCURATE token counting (not estimates)
-- Code is truncated to fit budget, summaries/learnings preserved
+- Exact counts also calibrate the fast estimator in erirpg.tokens, used
+  where approximate counts are enough
+- Code is packed into the budget by relevance, summaries/learnings preserved
 - Never exceeds max_tokens limit
 """
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
+import atexit
+import hashlib
+import json
 import os
+import re
+import threading
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -34,6 +42,9 @@ from erirpg.ops import Feature, TransplantPlan
 from erirpg.graph import Graph
 from erirpg.registry import Project
 from erirpg.memory import load_knowledge, get_knowledge_path
+from erirpg.packing import candidate_items, module_relevance, pack_items
+from erirpg.tfidf import get_module_index
+from erirpg.tokens import get_estimator
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -41,32 +52,105 @@ from erirpg.memory import load_knowledge, get_knowledge_path
 # ═══════════════════════════════════════════════════════════════════════════════
 
 # Lazy-loaded encoder (cl100k_base is used by Claude/GPT-4)
+ENCODING_NAME = "cl100k_base"
 _ENCODER: Optional[tiktoken.Encoding] = None
 
+# Token counts memoized by content hash: LRU in memory, table on disk.
+# Texts shorter than TOKEN_CACHE_MIN_CHARS are cheaper to encode than to hash.
+TOKEN_CACHE_SIZE = 8192
+TOKEN_CACHE_MIN_CHARS = 256
+TOKEN_CACHE_PATH = os.path.expanduser("~/.eri-rpg/token-cache.json")
+_token_cache: Optional["OrderedDict[str, int]"] = None
+_token_cache_dirty = False
+_token_cache_lock = threading.Lock()
+
 
 def get_encoder() -> tiktoken.Encoding:
     """Get the tiktoken encoder, lazily initialized."""
     global _ENCODER
     if _ENCODER is None:
-        _ENCODER = tiktoken.get_encoding("cl100k_base")
+        _ENCODER = tiktoken.get_encoding(ENCODING_NAME)
     return _ENCODER
 
 
+def _get_token_cache() -> "OrderedDict[str, int]":
+    """Get the token-count cache, loading the on-disk table on first use."""
+    global _token_cache
+    if _token_cache is None:
+        cache: "OrderedDict[str, int]" = OrderedDict()
+        try:
+            with open(TOKEN_CACHE_PATH, "r") as f:
+                data = json.load(f)
+            if data.get("encoding") == ENCODING_NAME:
+                cache.update(data.get("counts", {}))
+        except (OSError, ValueError, AttributeError):
+            pass
+        _token_cache = cache
+        atexit.register(save_token_cache)
+    return _token_cache
+
+
+def save_token_cache() -> None:
+    """Write the token-count table to disk if it changed.
+
+    Only the most recently used TOKEN_CACHE_SIZE entries are kept, and
+    nothing is written unless ~/.eri-rpg/ already exists.
+    """
+    global _token_cache_dirty
+    if not _token_cache_dirty or _token_cache is None:
+        return
+    cache_dir = os.path.dirname(TOKEN_CACHE_PATH)
+    if not os.path.isdir(cache_dir):
+        return
+
+    with _token_cache_lock:
+        data = {"encoding": ENCODING_NAME, "counts": dict(_token_cache)}
+        _token_cache_dirty = False
+    tmp = f"{TOKEN_CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, TOKEN_CACHE_PATH)
+    except OSError as e:
+        import sys; print(f"[EriRPG] Could not save token cache: {e}", file=sys.stderr)
+
+
 def count_tokens(text: str) -> int:
     """Count actual tokens in text using tiktoken.
 
     This is ACCURATE token counting, not estimation.
     Uses cl100k_base encoding (Claude/GPT-4 compatible).
 
+    Counts for longer texts are memoized by content hash, so the same
+    module source is only encoded once across calls and runs.
+
     Args:
         text: Text to count tokens for
 
     Returns:
         Actual token count
     """
+    global _token_cache_dirty
     if not text:
         return 0
-    return len(get_encoder().encode(text))
+    if len(text) < TOKEN_CACHE_MIN_CHARS:
+        return len(get_encoder().encode(text))
+
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+    cache = _get_token_cache()
+    with _token_cache_lock:
+        count = cache.get(key)
+        if count is not None:
+            cache.move_to_end(key)
+            return count
+
+    count = len(get_encoder().encode(text))
+    with _token_cache_lock:
+        cache[key] = count
+        while len(cache) > TOKEN_CACHE_SIZE:
+            cache.popitem(last=False)
+        _token_cache_dirty = True
+    return count
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -85,6 +169,7 @@ RESERVED_PLAN = 250           # Mappings, wiring, order
 RESERVED_INSTRUCTIONS = 180   # Instructions section
 RESERVED_INTERFACES = 120     # Per interface module
 RESERVED_PER_LEARNING = 180   # Per learning block
+RESERVED_PER_CODE_ITEM = 12   # Fence and budget note per packed code item
 
 
 @dataclass
@@ -193,10 +278,42 @@ def get_fence_language(file_path: str) -> str:
 # CODE TRUNCATION
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Lines that start a definition, kept by signature-preserving truncation
+SIGNATURE_RE = re.compile(
+    r'^\s*(?:(?:pub(?:\([^)]*\))?|export|default|async|static|public|private|protected)\s+)*'
+    r'(?:def|class|fn|func|function|struct|enum|trait|impl|interface|type)\b'
+)
+
+
+def line_token_offsets(lines: List[str]) -> List[int]:
+    """Cumulative token counts for the first k lines of a file.
+
+    Each line is encoded once (with its newline). offsets[k] is the
+    token count of lines[:k] joined by newlines, up to BPE merges across
+    line breaks, which are rare and only ever lower the real count.
+
+    Args:
+        lines: Source lines (without trailing newlines)
+
+    Returns:
+        List of len(lines) + 1 cumulative counts, starting at 0
+    """
+    encoder = get_encoder()
+    offsets = [0]
+    total = 0
+    last = len(lines) - 1
+    for i, line in enumerate(lines):
+        text = line if i == last else line + "\n"
+        total += len(encoder.encode(text)) if text else 0
+        offsets.append(total)
+    return offsets
+
+
 def truncate_code(
     code: str,
     max_tokens: int,
     file_path: str = "",
+    keep_signatures: bool = False,
 ) -> Tuple[str, int, bool]:
     """Truncate code to fit within token budget.
 
@@ -204,14 +321,18 @@ def truncate_code(
 
     Strategy:
     1. If fits, return as-is
-    2. Otherwise, binary search for optimal line count
+    2. Otherwise, encode each line once and pick the cut point from the
+       cumulative token offsets (binary search, no re-encoding)
     3. Keep at least MIN_CODE_LINES lines
     4. Add truncation marker
+    5. With keep_signatures, also list the definition lines (def, class,
+       fn, ...) of the truncated part, shrinking the kept head so they fit
 
     Args:
         code: Source code to truncate
         max_tokens: Maximum tokens allowed
         file_path: File path for context in truncation message
+        keep_signatures: Keep signatures of truncated definitions
 
     Returns:
         Tuple of (truncated_code, actual_tokens, was_truncated)
@@ -225,109 +346,70 @@ def truncate_code(
     if current_tokens <= max_tokens:
         return code, current_tokens, False
 
-    # Need to truncate - use binary search for optimal line count
+    # Need to truncate - one encoding pass over the lines
     lines = code.split('\n')
     total_lines = len(lines)
-
-    # Binary search for max lines that fit in budget
-    # Account for truncation marker (~15 tokens)
-    marker_budget = 15
+    offsets = line_token_offsets(lines)
+    line_tokens = [offsets[i + 1] - offsets[i] for i in range(total_lines)]
+
+    # Signature lines and the tokens of those at or after each line
+    signatures = set()
+    sig_suffix = [0] * (total_lines + 1)
+    if keep_signatures:
+        signatures = {i for i, line in enumerate(lines) if SIGNATURE_RE.match(line)}
+        for i in range(total_lines - 1, -1, -1):
+            sig_suffix[i] = sig_suffix[i + 1] + (line_tokens[i] if i in signatures else 0)
+
+    def build(head: int) -> str:
+        out = lines[:head]
+        out.append("")
+        out.append(f"# ... [{total_lines - head} lines truncated to fit token budget]")
+        kept = [lines[i] for i in range(head, total_lines) if i in signatures]
+        if kept:
+            out.append("# Signatures in truncated part:")
+            out.extend(kept)
+        if file_path:
+            out.append(f"# Full source: {file_path}")
+        return '\n'.join(out)
+
+    # Account for truncation marker (~15 tokens, more with signatures)
+    marker_budget = 15 + (10 if signatures else 0)
     target_tokens = max_tokens - marker_budget
+    floor = min(MIN_CODE_LINES, total_lines)
 
-    low = MIN_CODE_LINES
-    high = total_lines
-    best_lines = MIN_CODE_LINES
-
+    # Largest head whose tokens plus the remaining signatures fit. Both
+    # terms together never decrease as the head grows, so bisect works.
+    low, high = floor, total_lines
+    best_lines = floor
     while low <= high:
         mid = (low + high) // 2
-        test_code = '\n'.join(lines[:mid])
-        test_tokens = count_tokens(test_code)
-
-        if test_tokens <= target_tokens:
+        if offsets[mid] + sig_suffix[mid] <= target_tokens:
             best_lines = mid
             low = mid + 1
         else:
             high = mid - 1
 
-    # Build truncated output
-    truncated_lines = lines[:best_lines]
-    truncated_count = total_lines - best_lines
-
-    # Add truncation marker
-    truncated_lines.append("")
-    truncated_lines.append(f"# ... [{truncated_count} lines truncated to fit token budget]")
-    if file_path:
-        truncated_lines.append(f"# Full source: {file_path}")
-
-    truncated = '\n'.join(truncated_lines)
+    # Even the minimum head leaves no room for every signature: keep the
+    # ones that fit, in order
+    if offsets[best_lines] + sig_suffix[best_lines] > target_tokens:
+        room = target_tokens - offsets[best_lines]
+        fitting = set()
+        for i in sorted(signatures):
+            if i >= best_lines and line_tokens[i] <= room:
+                fitting.add(i)
+                room -= line_tokens[i]
+        signatures = fitting
+
+    truncated = build(best_lines)
     actual_tokens = count_tokens(truncated)
 
-    return truncated, actual_tokens, True
-
-
-def allocate_code_budgets(
-    components: List[str],
-    code_dict: Dict[str, str],
-    total_budget: int,
-    primary_module: str = "",
-) -> Dict[str, int]:
-    """Allocate token budgets to each code file.
-
-    Uses tiktoken for ACCURATE token measurement.
-
-    Strategy:
-    1. Primary module gets 40% of budget
-    2. Remaining modules share the rest proportionally by actual token count
-
-    Args:
-        components: List of component paths (in dependency order)
-        code_dict: Dict of path -> code content
-        total_budget: Total tokens available for code
-        primary_module: The primary module (gets priority)
-
-    Returns:
-        Dict of path -> allocated tokens
-    """
-    if not components or total_budget <= 0:
-        return {}
-
-    allocations = {}
-
-    # Calculate actual token counts for each component
-    token_counts = {c: count_tokens(code_dict.get(c, "")) for c in components}
-    total_tokens = sum(token_counts.values())
-
-    if total_tokens == 0:
-        # Equal distribution if no code
-        per_file = total_budget // len(components)
-        return {c: per_file for c in components}
-
-    # Primary module gets 40% (if it exists and has code)
-    remaining_budget = total_budget
-
-    if primary_module and primary_module in components:
-        primary_tokens = token_counts.get(primary_module, 0)
-        if primary_tokens > 0:
-            primary_budget = int(total_budget * 0.4)
-            # But don't allocate more than needed
-            primary_budget = min(primary_budget, primary_tokens)
-            allocations[primary_module] = primary_budget
-            remaining_budget -= primary_budget
-
-    # Distribute remaining budget proportionally by actual token count
-    other_components = [c for c in components if c != primary_module]
-    other_tokens = sum(token_counts.get(c, 0) for c in other_components)
-
-    for comp in other_components:
-        comp_tokens = token_counts.get(comp, 0)
-        if comp_tokens == 0 or other_tokens == 0:
-            allocations[comp] = 0
-        else:
-            # Proportional allocation by token count
-            proportion = comp_tokens / other_tokens
-            allocations[comp] = int(remaining_budget * proportion)
+    # Rarely, merges across the cut or in the marker overshoot: step back
+    while actual_tokens > max_tokens and best_lines > floor:
+        best_lines -= 1
+        truncated = build(best_lines)
+        actual_tokens = count_tokens(truncated)
 
-    return allocations
+    return truncated, actual_tokens, True
 
 
 def generate_context(
@@ -345,7 +427,8 @@ def generate_context(
 
     TOKEN BUDGET ENFORCEMENT:
     - If max_tokens is None, uses TOKEN_BUDGET (6500)
-    - Code is truncated to fit budget, learnings/summaries preserved
+    - Code is packed by relevance (full, truncated, signatures-only or
+      summary per module, see erirpg.packing), learnings preserved
     - Never exceeds the specified budget
 
     Args:
@@ -451,23 +534,46 @@ def generate_context(
     stale_learnings = []
     truncated_files = []
 
-    # Hydrate code from refs if source_path is available
+    # Hydrate code from refs (sliced to the symbols the feature uses)
     hydrated_code = {}
     if source_path and feature.code_refs:
-        hydrated_code = feature.hydrate_code(source_path)
+        hydrated_code = feature.hydrate_slices(source_path)
 
     # Merge with snapshots for complete code dict
     all_code = {}
     for comp_path in feature.components:
         all_code[comp_path] = hydrated_code.get(comp_path) or feature.code_snapshots.get(comp_path, "")
 
-    # Allocate code budgets per file
-    code_budgets = allocate_code_budgets(
-        components=code_components,
-        code_dict=all_code,
-        total_budget=budget.code_budget,
-        primary_module=feature.primary_module,
+    # Pack code renderings (full / truncated / signatures / summary) by
+    # relevance to the feature within the code budget
+    query_scores = {}
+    if source_graph is not None and source_project is not None:
+        index = get_module_index(source_graph, source_project.graph_path)
+        query_scores = {index.paths[i]: score for i, score in index.score(feature.name).items()}
+    relevance = module_relevance(
+        feature.components, source_graph, feature.primary_module, query_scores
     )
+    code_items = {}
+    for comp_path in code_components:
+        mod = source_graph.get_module(comp_path) if source_graph is not None else None
+        code_items[comp_path] = candidate_items(
+            comp_path,
+            all_code.get(comp_path, "").strip(),
+            count_tokens,
+            lambda c, t, p: truncate_code(c, t, p, keep_signatures=True),
+            SIGNATURE_RE,
+            summary=mod.summary if mod else "",
+        )
+    packed = pack_items(code_items, relevance, budget.code_budget, overhead=RESERVED_PER_CODE_ITEM)
+
+    # Calibrate the fast token estimator on the exact counts packing made
+    if source_path:
+        estimator = get_estimator(source_path)
+        for comp_path, items in code_items.items():
+            for item in items:
+                if item.kind == "full":
+                    estimator.observe(comp_path, item.text, item.tokens)
+        estimator.save()
 
     for comp_path in feature.components:
         # Check for v2 knowledge first, fall back to graph knowledge
@@ -531,34 +637,37 @@ def generate_context(
             # No learning - include source code with budget enforcement
             modules_without_learnings.append(comp_path)
 
-            # Get code and budget for this file
-            code = all_code.get(comp_path, "")
-            file_budget = code_budgets.get(comp_path, budget.code_budget // max(1, len(code_components)))
-
             lines.append("**No stored understanding yet.**")
             lines.append("")
 
-            if code:
-                # BUDGET ENFORCEMENT: Truncate code if over budget
-                truncated_code, actual_tokens, was_truncated = truncate_code(
-                    code=code.strip(),
-                    max_tokens=file_budget,
-                    file_path=comp_path,
-                )
-
-                if was_truncated:
+            # BUDGET ENFORCEMENT: render the packed item for this module
+            item = packed.get(comp_path)
+            if item is None and not all_code.get(comp_path):
+                lines.append("*Code not available - use `--snapshot` when extracting for offline use*")
+            elif item is None:
+                truncated_files.append(comp_path)
+                lines.append("**[OMITTED to fit token budget]**")
+                lines.append(f"Read with: `eri-rpg recall {feature.source_project} {comp_path} --source`")
+            elif item.kind == "summary":
+                truncated_files.append(comp_path)
+                lines.append(f"**[SUMMARY ONLY to fit token budget]** {item.text}")
+                budget.allocate(item.tokens, "code")
+            else:
+                if item.kind == "truncated":
+                    truncated_files.append(comp_path)
+                    lines.append(f"**[TRUNCATED to fit {item.tokens} token budget]**")
+                    lines.append("")
+                elif item.kind == "signatures":
                     truncated_files.append(comp_path)
-                    lines.append(f"**[TRUNCATED to fit {file_budget} token budget]**")
+                    lines.append("**[SIGNATURES ONLY to fit token budget]**")
                     lines.append("")
 
                 fence_lang = get_fence_language(comp_path)
                 lines.append(f"```{fence_lang}")
-                lines.append(truncated_code)
+                lines.append(item.text)
                 lines.append("```")
 
-                budget.allocate(actual_tokens, "code")
-            else:
-                lines.append("*Code not available - use `--snapshot` when extracting for offline use*")
+                budget.allocate(item.tokens, "code")
 
             lines.append("")
             lines.append(f"After understanding this, store it: `eri-rpg learn {feature.source_project} {comp_path}`")
@@ -715,7 +824,7 @@ def estimate_tokens(
     # Count code tokens - try to hydrate refs if source_project is available
     if source_project and feature.code_refs:
         try:
-            hydrated = feature.hydrate_code(source_project.path)
+            hydrated = feature.hydrate_slices(source_project.path)
             for code in hydrated.values():
                 total_tokens += count_tokens(code)
         except Exception as e:
@@ -2,21 +2,34 @@
 Bridge to Drift codebase intelligence.
 
 Provides a thin wrapper around Drift CLI commands with:
-- LRU caching for repeated queries
-- Async variants for GUI/watch mode
+- In-memory caching for repeated queries, validated against the scan
+  generation and file hash so long-lived processes see rescans and edits
+- Persistent on-disk cache shared across processes (see drift_cache)
+- Async variants for GUI/watch mode, and DriftScheduler to run many of
+  them with a concurrency cap and a shared time budget
 - Graceful degradation when Drift unavailable
 """
 import asyncio
 import json
 import subprocess
 from dataclasses import dataclass, field
-from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
 import logging
 
+from erirpg.drift_cache import DriftCache
+
 logger = logging.getLogger(__name__)
 
+# Max files per batched `drift file patterns` invocation (keeps argv small)
+FILE_BATCH_SIZE = 200
+
+# Default cap on concurrent drift processes for DriftScheduler
+DRIFT_CONCURRENCY = 4
+
+# Default per-call timeout in seconds for Drift CLI commands
+DRIFT_TIMEOUT = 30
+
 
 @dataclass
 class DriftPattern:
@@ -117,22 +130,28 @@ class DriftBridge:
             impact = bridge.impact_analysis("src/file.py")
     """
 
-    # Class-level cache for expensive operations
-    _pattern_cache: Dict[str, List[DriftPattern]] = {}
-    _file_pattern_cache: Dict[str, DriftFilePatterns] = {}
+    # Class-level caches for expensive operations. Entries hold the stamp
+    # they were computed for (scan generation, plus file key for files)
+    # and are only used while it still matches.
+    _pattern_cache: Dict[str, Tuple[str, List[DriftPattern]]] = {}
+    _file_pattern_cache: Dict[str, Tuple[str, DriftFilePatterns]] = {}
 
-    def __init__(self, project_path: str, timeout: int = 30):
+    def __init__(self, project_path: str, timeout: Optional[int] = None):
         """
         Initialize Drift bridge.
 
         Args:
             project_path: Path to project root (should contain .drift/)
             timeout: Timeout in seconds for Drift CLI commands
+                (default: DRIFT_TIMEOUT)
         """
         self.project_path = Path(project_path).resolve()
         self.drift_dir = self.project_path / ".drift"
-        self.timeout = timeout
+        self.timeout = DRIFT_TIMEOUT if timeout is None else timeout
         self._available: Optional[bool] = None
+        self.cache = DriftCache(str(self.project_path))
+        # Exit code of the last _run_drift call (None if drift didn't finish)
+        self.last_returncode: Optional[int] = None
 
     def _run_drift(
         self,
@@ -150,6 +169,7 @@ class DriftBridge:
             Parsed JSON output or None on failure
         """
         cmd = ["drift"] + args + ["--json"]
+        self.last_returncode = None
 
         try:
             result = subprocess.run(
@@ -160,6 +180,7 @@ class DriftBridge:
                 text=True,
                 timeout=self.timeout
             )
+            self.last_returncode = result.returncode
 
             if result.returncode != 0:
                 logger.debug(f"Drift command failed: {result.stderr}")
@@ -186,14 +207,38 @@ class DriftBridge:
     async def _run_drift_async(
         self,
         args: List[str],
-        input_data: Optional[str] = None
+        input_data: Optional[str] = None,
+        timeout: Optional[float] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Run a Drift CLI command asynchronously.
 
-        For GUI/watch mode where blocking is unacceptable.
+        For GUI/watch mode where blocking is unacceptable. The drift
+        process is killed if the call times out or is cancelled.
+
+        Args:
+            args: Command arguments (e.g., ["patterns", "list"])
+            input_data: Optional stdin input
+            timeout: Deadline in seconds (default: self.timeout)
+        """
+        data, _ = await self._exec_drift_async(args, input_data, timeout)
+        return data
+
+    async def _exec_drift_async(
+        self,
+        args: List[str],
+        input_data: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+        """
+        Like _run_drift_async, but also returns drift's exit code.
+
+        The exit code is None if drift didn't finish (timeout, not found).
+        Kept out of instance state since several calls may be in flight.
         """
         cmd = ["drift"] + args + ["--json"]
+        process = None
+        returncode: Optional[int] = None
 
         try:
             process = await asyncio.create_subprocess_exec(
@@ -206,31 +251,38 @@ class DriftBridge:
 
             stdout, stderr = await asyncio.wait_for(
                 process.communicate(input_data.encode() if input_data else None),
-                timeout=self.timeout
+                timeout=timeout if timeout is not None else self.timeout
             )
+            returncode = process.returncode
 
             if process.returncode != 0:
                 logger.debug(f"Drift command failed: {stderr.decode()}")
-                return None
+                return None, returncode
 
             output = stdout.decode()
             if not output.strip():
-                return {}
+                return {}, returncode
 
-            return json.loads(output)
+            return json.loads(output), returncode
 
         except asyncio.TimeoutError:
             logger.warning(f"Drift command timed out: {' '.join(cmd)}")
-            return None
+            return None, returncode
         except FileNotFoundError:
             logger.debug("Drift CLI not found")
-            return None
+            return None, returncode
         except json.JSONDecodeError as e:
             logger.warning(f"Failed to parse Drift output: {e}")
-            return None
+            return None, returncode
         except Exception as e:
             logger.warning(f"Drift command error: {e}")
-            return None
+            return None, returncode
+        finally:
+            if process is not None and process.returncode is None:
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
 
     def is_available(self) -> bool:
         """
@@ -241,22 +293,29 @@ class DriftBridge:
         if self._available is not None:
             return self._available
 
-        # Check if drift CLI exists
-        try:
-            result = subprocess.run(
-                ["drift", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            cli_available = result.returncode == 0
-        except (FileNotFoundError, subprocess.TimeoutExpired):
-            cli_available = False
-
         # Check if project has been scanned
         scanned = self.drift_dir.exists() and (self.drift_dir / "manifest.json").exists()
+        if not scanned:
+            self._available = False
+            return False
 
-        self._available = cli_available and scanned
+        # Check if drift CLI exists (remembered per scan generation)
+        cli_available = self.cache.get("meta", "cli")
+        if cli_available is None:
+            try:
+                result = subprocess.run(
+                    ["drift", "--version"],
+                    capture_output=True,
+                    text=True,
+                    timeout=5
+                )
+                cli_available = result.returncode == 0
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                cli_available = False
+            if cli_available:
+                self.cache.put("meta", "cli", True)
+
+        self._available = cli_available
         return self._available
 
     def scan(self, force: bool = False, incremental: bool = True) -> bool:
@@ -285,11 +344,28 @@ class DriftBridge:
         return False
 
     def clear_cache(self) -> None:
-        """Clear all cached data."""
+        """Clear all cached data, including the on-disk cache."""
         DriftBridge._pattern_cache.clear()
         DriftBridge._file_pattern_cache.clear()
+        self.cache.clear()
+
+    def _file_stamp(self, disk_key: Optional[str]) -> Optional[str]:
+        """Stamp a file's cached result is valid for (None: don't cache)."""
+        generation = self.cache.generation()
+        if generation is None or disk_key is None:
+            return None
+        return f"{generation}:{disk_key}"
+
+    def _remember_file(self, file_path: str, stamp: Optional[str], result: DriftFilePatterns) -> None:
+        if stamp is not None:
+            DriftBridge._file_pattern_cache[f"{self.project_path}:{file_path}"] = (stamp, result)
+
+    def _recall_file(self, file_path: str, stamp: Optional[str]) -> Optional[DriftFilePatterns]:
+        entry = DriftBridge._file_pattern_cache.get(f"{self.project_path}:{file_path}")
+        if entry is not None and stamp is not None and entry[0] == stamp:
+            return entry[1]
+        return None
 
-    @lru_cache(maxsize=32)
     def get_patterns(
         self,
         category: Optional[str] = None,
@@ -308,30 +384,35 @@ class DriftBridge:
         if not self.is_available():
             return []
 
-        # Check class-level cache
+        # Check class-level cache (valid for the current scan only)
         cache_key = f"{self.project_path}:{category}:{status}"
-        if cache_key in DriftBridge._pattern_cache:
-            return DriftBridge._pattern_cache[cache_key]
-
-        cmd = ["patterns", "list"]
-        if category:
-            cmd.extend(["--category", category])
-        if status:
-            cmd.extend(["--status", status])
-
-        data = self._run_drift(cmd)
-        if data is None:
-            return []
-
-        patterns = [
-            DriftPattern.from_dict(p)
-            for p in data.get("patterns", data.get("data", {}).get("patterns", []))
-        ]
-
-        DriftBridge._pattern_cache[cache_key] = patterns
+        generation = self.cache.generation()
+        entry = DriftBridge._pattern_cache.get(cache_key)
+        if entry is not None and generation is not None and entry[0] == generation:
+            return entry[1]
+
+        disk_key = f"{category}:{status}"
+        raw = self.cache.get("patterns", disk_key)
+        if raw is None:
+            cmd = ["patterns", "list"]
+            if category:
+                cmd.extend(["--category", category])
+            if status:
+                cmd.extend(["--status", status])
+
+            data = self._run_drift(cmd)
+            if data is None:
+                return []
+
+            raw = data.get("patterns", data.get("data", {}).get("patterns", []))
+            self.cache.put("patterns", disk_key, raw)
+
+        patterns = [DriftPattern.from_dict(p) for p in raw]
+
+        if generation is not None:
+            DriftBridge._pattern_cache[cache_key] = (generation, patterns)
         return patterns
 
-    @lru_cache(maxsize=128)
     def get_file_patterns(self, file_path: str) -> DriftFilePatterns:
         """
         Get patterns and outliers for a specific file.
@@ -344,24 +425,218 @@ class DriftBridge:
         """
         if not self.is_available():
             return DriftFilePatterns(file=file_path)
+        return self._fetch_file_patterns(file_path) or DriftFilePatterns(file=file_path)
 
-        # Check class-level cache
-        cache_key = f"{self.project_path}:{file_path}"
-        if cache_key in DriftBridge._file_pattern_cache:
-            return DriftBridge._file_pattern_cache[cache_key]
+    def _fetch_file_patterns(self, file_path: str) -> Optional[DriftFilePatterns]:
+        """Patterns for one file from the caches or Drift (None if Drift failed)."""
+        results, pending, disk_keys = self._lookup_file_patterns([file_path])
+        if not pending:
+            return results[file_path]
 
         data = self._run_drift(["file", "patterns", file_path])
         if data is None:
-            return DriftFilePatterns(file=file_path)
+            return None
+        return self._store_file_patterns(file_path, disk_keys[file_path], data.get("data", data))
 
-        result = DriftFilePatterns.from_dict(
-            file_path,
-            data.get("data", data)
-        )
+    async def _fetch_file_patterns_async(self, file_path: str) -> Optional[DriftFilePatterns]:
+        """Async variant of _fetch_file_patterns."""
+        results, pending, disk_keys = self._lookup_file_patterns([file_path])
+        if not pending:
+            return results[file_path]
+
+        data = await self._run_drift_async(["file", "patterns", file_path])
+        if data is None:
+            return None
+        return self._store_file_patterns(file_path, disk_keys[file_path], data.get("data", data))
 
-        DriftBridge._file_pattern_cache[cache_key] = result
+    def _lookup_file_patterns(
+        self,
+        file_paths: List[str]
+    ) -> Tuple[Dict[str, DriftFilePatterns], List[str], Dict[str, Optional[str]]]:
+        """
+        Serve files from the memory and disk caches.
+
+        Returns:
+            (cached results, paths still to ask Drift for, path -> disk key)
+        """
+        results: Dict[str, DriftFilePatterns] = {}
+        pending: List[str] = []
+        disk_keys: Dict[str, Optional[str]] = {}
+
+        for file_path in dict.fromkeys(file_paths):
+            disk_keys[file_path] = self.cache.file_key(file_path)
+            stamp = self._file_stamp(disk_keys[file_path])
+            cached = self._recall_file(file_path, stamp)
+            if cached is not None:
+                results[file_path] = cached
+                continue
+            raw = self.cache.get("files", disk_keys[file_path])
+            if raw is not None:
+                result = DriftFilePatterns.from_dict(file_path, raw)
+                self._remember_file(file_path, stamp, result)
+                results[file_path] = result
+            else:
+                pending.append(file_path)
+
+        return results, pending, disk_keys
+
+    def _store_file_patterns(
+        self,
+        file_path: str,
+        disk_key: Optional[str],
+        raw: Dict[str, Any]
+    ) -> DriftFilePatterns:
+        """Cache one file's Drift answer on disk and in memory."""
+        self.cache.put("files", disk_key, raw)
+        result = DriftFilePatterns.from_dict(file_path, raw)
+        self._remember_file(file_path, self._file_stamp(disk_key), result)
         return result
 
+    def get_file_patterns_batch(
+        self,
+        file_paths: List[str],
+        batch_size: int = FILE_BATCH_SIZE
+    ) -> Dict[str, DriftFilePatterns]:
+        """
+        Get patterns and outliers for many files with few Drift calls.
+
+        Cached files are served from memory or the disk cache. The rest
+        are passed to a single `drift file patterns` invocation per chunk
+        of batch_size files. If the installed Drift only answers for one
+        file at a time, this falls back to per-file calls and remembers
+        that for the current scan generation. A batch that times out or
+        fails while single files fail too is retried per file this time
+        only. Files a batch answer leaves out are not cached.
+
+        Args:
+            file_paths: Paths to files (relative to project root)
+            batch_size: Max files per Drift invocation
+
+        Returns:
+            Dict of file path -> DriftFilePatterns (one per input path)
+        """
+        if not self.is_available():
+            return {f: DriftFilePatterns(file=f) for f in file_paths}
+
+        results, pending, disk_keys = self._lookup_file_patterns(file_paths)
+
+        batched = self.cache.get("meta", "file-batch") is not False
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            data = None
+            exit_code = None
+            if batched or len(chunk) == 1:
+                data = self._run_drift(["file", "patterns"] + chunk)
+                exit_code = self.last_returncode
+            raw_by_file = self._answer_file_batch(data, chunk)
+            if raw_by_file is None:
+                answered = False
+                for file_path in chunk:
+                    result = self._fetch_file_patterns(file_path)
+                    answered = answered or result is not None
+                    results[file_path] = result or DriftFilePatterns(file=file_path)
+                # Output that isn't per-file means Drift takes one path; an
+                # error exit while single files answer means it rejects several
+                if batched and len(chunk) > 1 and (data is not None or (exit_code and answered)):
+                    batched = False
+                    self._disable_file_batch()
+                continue
+            self._store_file_batch(chunk, raw_by_file, disk_keys, results)
+
+        return {f: results[f] for f in file_paths}
+
+    async def get_file_patterns_batch_async(
+        self,
+        file_paths: List[str],
+        batch_size: int = FILE_BATCH_SIZE
+    ) -> Dict[str, DriftFilePatterns]:
+        """Async variant of get_file_patterns_batch, for DriftScheduler."""
+        if not self.is_available():
+            return {f: DriftFilePatterns(file=f) for f in file_paths}
+
+        results, pending, disk_keys = self._lookup_file_patterns(file_paths)
+
+        batched = self.cache.get("meta", "file-batch") is not False
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            data = None
+            exit_code = None
+            if batched or len(chunk) == 1:
+                data, exit_code = await self._exec_drift_async(["file", "patterns"] + chunk)
+            raw_by_file = self._answer_file_batch(data, chunk)
+            if raw_by_file is None:
+                answered = False
+                for file_path in chunk:
+                    result = await self._fetch_file_patterns_async(file_path)
+                    answered = answered or result is not None
+                    results[file_path] = result or DriftFilePatterns(file=file_path)
+                # Output that isn't per-file means Drift takes one path; an
+                # error exit while single files answer means it rejects several
+                if batched and len(chunk) > 1 and (data is not None or (exit_code and answered)):
+                    batched = False
+                    self._disable_file_batch()
+                continue
+            self._store_file_batch(chunk, raw_by_file, disk_keys, results)
+
+        return {f: results[f] for f in file_paths}
+
+    def _answer_file_batch(
+        self,
+        data: Optional[Dict[str, Any]],
+        chunk: List[str]
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Per-file data from a batch call, or None to fall back to single files."""
+        if data is None:
+            return None
+        return self._split_file_batch(data.get("data", data), chunk)
+
+    def _disable_file_batch(self) -> None:
+        """Remember that Drift answers one file per call (per generation)."""
+        self.cache.put("meta", "file-batch", False)
+
+    def _store_file_batch(
+        self,
+        chunk: List[str],
+        raw_by_file: Dict[str, Dict[str, Any]],
+        disk_keys: Dict[str, Optional[str]],
+        results: Dict[str, DriftFilePatterns]
+    ) -> None:
+        """Fan a batch answer out to results and the caches."""
+        for file_path in chunk:
+            raw = raw_by_file.get(file_path)
+            if raw is None:
+                # Left out of the answer: don't cache an empty result
+                results[file_path] = DriftFilePatterns(file=file_path)
+                continue
+            results[file_path] = self._store_file_patterns(file_path, disk_keys[file_path], raw)
+
+    @staticmethod
+    def _split_file_batch(
+        payload: Dict[str, Any],
+        chunk: List[str]
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Split a `drift file patterns` result into per-file data.
+
+        Accepts {"files": {path: data}} or {"files": [{"file": path, ...}]}.
+        A plain single-file result is only valid for a one-file chunk.
+
+        Returns:
+            Dict of path -> data, or None if the output isn't per-file
+        """
+        files = payload.get("files")
+        if isinstance(files, dict):
+            return files
+        if isinstance(files, list):
+            return {
+                entry.get("file", entry.get("path", "")): entry
+                for entry in files
+                if isinstance(entry, dict)
+            }
+        if len(chunk) == 1:
+            return {chunk[0]: payload}
+        return None
+
     def impact_analysis(self, file_path: str) -> DriftImpact:
         """
         Analyze impact of changing a file.
@@ -411,15 +686,20 @@ class DriftBridge:
         if not self.is_available():
             return []
 
-        cmd = ["check"]
-        if file_path:
-            cmd.append(file_path)
+        disk_key = self.cache.file_key(file_path) if file_path else "*"
+        outliers_data = self.cache.get("outliers", disk_key)
+        if outliers_data is None:
+            cmd = ["check"]
+            if file_path:
+                cmd.append(file_path)
 
-        data = self._run_drift(cmd)
-        if data is None:
-            return []
+            data = self._run_drift(cmd)
+            if data is None:
+                return []
+
+            outliers_data = data.get("outliers", data.get("data", {}).get("outliers", []))
+            self.cache.put("outliers", disk_key, outliers_data)
 
-        outliers_data = data.get("outliers", data.get("data", {}).get("outliers", []))
         return [DriftOutlier.from_dict(o) for o in outliers_data]
 
     async def find_outliers_async(
@@ -430,15 +710,20 @@ class DriftBridge:
         if not self.is_available():
             return []
 
-        cmd = ["check"]
-        if file_path:
-            cmd.append(file_path)
+        disk_key = self.cache.file_key(file_path) if file_path else "*"
+        outliers_data = self.cache.get("outliers", disk_key)
+        if outliers_data is None:
+            cmd = ["check"]
+            if file_path:
+                cmd.append(file_path)
 
-        data = await self._run_drift_async(cmd)
-        if data is None:
-            return []
+            data = await self._run_drift_async(cmd)
+            if data is None:
+                return []
+
+            outliers_data = data.get("outliers", data.get("data", {}).get("outliers", []))
+            self.cache.put("outliers", disk_key, outliers_data)
 
-        outliers_data = data.get("outliers", data.get("data", {}).get("outliers", []))
         return [DriftOutlier.from_dict(o) for o in outliers_data]
 
     def validate_change(
@@ -589,6 +874,89 @@ class DriftBridge:
         return status
 
 
+class DriftScheduler:
+    """
+    Runs many async Drift calls within a fixed latency budget.
+
+    At most max_concurrency calls run at once. When the budget runs out,
+    calls still queued or running are cancelled (killing their drift
+    processes) and reported as missing, so callers degrade to partial
+    Drift context instead of blocking.
+
+    Usage:
+        scheduler = DriftScheduler(max_concurrency=4, budget=5.0)
+        results = scheduler.run({
+            path: (lambda p=path: bridge.impact_analysis_async(p))
+            for path in paths
+        })
+        # results[path] is None for calls that didn't finish in time
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DRIFT_CONCURRENCY,
+        budget: Optional[float] = None
+    ):
+        """
+        Args:
+            max_concurrency: Max drift calls in flight at once
+            budget: Total seconds for all calls (None = no limit;
+                each call still has the bridge's per-call timeout)
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.budget = budget
+        self.timed_out: List[Hashable] = []
+
+    async def run_async(
+        self,
+        calls: Dict[Hashable, Callable[[], Awaitable[Any]]]
+    ) -> Dict[Hashable, Any]:
+        """
+        Run calls concurrently and collect their results.
+
+        Args:
+            calls: key -> zero-argument coroutine function
+
+        Returns:
+            key -> result, or None if the call failed or ran out of budget
+        """
+        self.timed_out = []
+        if not calls:
+            return {}
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(factory: Callable[[], Awaitable[Any]]) -> Any:
+            async with semaphore:
+                return await factory()
+
+        tasks = {key: asyncio.ensure_future(bounded(f)) for key, f in calls.items()}
+        _, pending = await asyncio.wait(tasks.values(), timeout=self.budget)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        results: Dict[Hashable, Any] = {}
+        for key, task in tasks.items():
+            if task in pending:
+                self.timed_out.append(key)
+                results[key] = None
+            elif task.exception() is not None:
+                logger.warning(f"Drift call {key!r} failed: {task.exception()}")
+                results[key] = None
+            else:
+                results[key] = task.result()
+        return results
+
+    def run(
+        self,
+        calls: Dict[Hashable, Callable[[], Awaitable[Any]]]
+    ) -> Dict[Hashable, Any]:
+        """Blocking variant of run_async (must not be called from a running loop)."""
+        return asyncio.run(self.run_async(calls))
+
+
 # Convenience function for quick checks
 def drift_available(project_path: str) -> bool:
     """Quick check if Drift is available for a project."""
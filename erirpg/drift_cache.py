@@ -0,0 +1,146 @@
+"""
+Persistent cache for Drift CLI results.
+
+Every `drift` invocation is a subprocess, and DriftBridge's in-memory
+caches die with the process, so each hook or CLI run used to pay for
+them again. This cache keeps results on disk across processes:
+
+- Results are grouped by scan generation, a fingerprint of every entry
+  under .drift/, nested ones included (relative path, size, mtime). Any
+  rescan changes it, and old generations are dropped the next time a
+  result is stored. The fingerprint is reused for GENERATION_TTL seconds
+  so a batch of lookups walks .drift/ once.
+- Per-file results are keyed by the file's path and content hash, so an
+  edited file misses even within the same generation.
+
+Storage structure:
+    .eri-rpg/
+    └── drift-cache/
+        └── <generation>/
+            ├── meta.json          # CLI availability for this generation
+            ├── patterns/<key>.json
+            ├── files/<key>.json
+            └── outliers/<key>.json
+
+Nothing is written unless .eri-rpg/ already exists.
+
+Usage:
+    cache = DriftCache(project_path)
+    key = cache.file_key("src/app.py")
+    data = cache.get("files", key)
+    if data is None:
+        data = run_drift(...)
+        cache.put("files", key, data)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+# Seconds a computed scan generation is reused before .drift/ is walked again
+GENERATION_TTL = 1.0
+
+
+class DriftCache:
+    """Disk-backed cache of Drift results for one project."""
+
+    def __init__(self, project_path: str):
+        self.project_path = Path(project_path)
+        self.drift_dir = self.project_path / ".drift"
+        self.root = self.project_path / ".eri-rpg" / "drift-cache"
+        self._pruned_for: Optional[str] = None
+        # (monotonic time computed, generation)
+        self._generation: Optional[Tuple[float, Optional[str]]] = None
+
+    def generation(self) -> Optional[str]:
+        """Fingerprint of the current .drift/ scan, or None if not scanned."""
+        now = time.monotonic()
+        if self._generation is not None and now - self._generation[0] < GENERATION_TTL:
+            return self._generation[1]
+
+        parts = []
+        for dirpath, dirnames, filenames in os.walk(self.drift_dir):
+            dirnames.sort()
+            rel = os.path.relpath(dirpath, self.drift_dir)
+            for name in sorted(filenames):
+                try:
+                    st = os.stat(os.path.join(dirpath, name))
+                except OSError:
+                    continue
+                parts.append(f"{os.path.join(rel, name)}:{st.st_size}:{st.st_mtime_ns}")
+
+        generation = None
+        if parts:
+            generation = format(zlib.crc32("|".join(parts).encode("utf-8")), "08x")
+        self._generation = (now, generation)
+        return generation
+
+    def file_key(self, rel_path: str) -> Optional[str]:
+        """Cache key for a file: its path plus current content hash.
+
+        Returns None if the file can't be read (such results aren't cached).
+        """
+        from erirpg.staleness import get_staleness_service
+
+        digest = get_staleness_service(str(self.project_path)).current_hash(rel_path)
+        if digest is None:
+            return None
+        return f"{rel_path}@{digest}"
+
+    def _entry_path(self, generation: str, kind: str, key: str) -> Path:
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.root / generation / kind / f"{name}.json"
+
+    def get(self, kind: str, key: Optional[str]) -> Optional[Any]:
+        """Read a cached value for the current generation, or None."""
+        generation = self.generation()
+        if generation is None or key is None:
+            return None
+        try:
+            with open(self._entry_path(generation, kind, key), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Guard against (unlikely) name collisions
+        if entry.get("key") != key:
+            return None
+        return entry.get("value")
+
+    def put(self, kind: str, key: Optional[str], value: Any) -> None:
+        """Store a value for the current generation."""
+        generation = self.generation()
+        if generation is None or key is None or not self.root.parent.is_dir():
+            return
+
+        if self._pruned_for != generation:
+            self._prune(keep=generation)
+
+        path = self._entry_path(generation, kind, key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w") as f:
+                json.dump({"key": key, "value": value}, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            import sys; print(f"[EriRPG] Could not write drift cache: {e}", file=sys.stderr)
+
+    def _prune(self, keep: str) -> None:
+        """Remove cache directories of older scan generations."""
+        self._pruned_for = keep
+        if not self.root.is_dir():
+            return
+        for child in self.root.iterdir():
+            if child.name != keep and child.is_dir():
+                shutil.rmtree(child, ignore_errors=True)
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        self._pruned_for = None
+        if self.root.is_dir():
+            shutil.rmtree(self.root, ignore_errors=True)
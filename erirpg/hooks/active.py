@@ -0,0 +1,285 @@
+"""
+Active-state pointer for the pretooluse hook.
+
+Deciding whether an Edit/Write may proceed needs the project mode,
+enforcement config, quick-fix state, active run and preflight targets.
+Reading them means globbing every run file and parsing several JSON
+files on every tool call. The pointer file condenses the decision
+inputs into one small JSON document:
+
+    .eri-rpg/active.json
+    {
+      "version": 1,
+      "mode": "maintain",
+      "enforcement": {"fail_closed": false, "block_bash_writes": false},
+      "quick_fix": {"quick_fix_active": true, "target_file": "..."} | null,
+      "run": {"id": "..."} | null,
+      "preflight": {"ready": true, "target_files": [...]} | null,
+      "sources": {"runs": [mtime_ns, size], "config.json": [...], ...}
+    }
+
+The run lifecycle (save_run, preflight, quick fix) refreshes the pointer
+atomically after each change. "sources" records the stat of every file
+the pointer was built from (the runs directory and the latest run file
+included), so a change made any other way, such as a manual edit or an
+older writer, is detected with a few stats and the pointer is rebuilt
+on the spot.
+
+Standard library only, so hooks can use it without importing erirpg.
+
+Usage:
+    state = active_state(project_path)   # validated pointer or rebuilt
+    refresh_active(project_path)         # after changing run state
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+POINTER_FILE = "active.json"
+POINTER_VERSION = 1
+
+
+# Parsed state files: path -> (mtime_ns, size, data). Pays off when the
+# hooks are served by the resident daemon (erirpg/hooks/daemon.py), which
+# keeps this module loaded between calls. Callers must not mutate data.
+_json_cache = {}
+
+
+def read_json_cached(path) -> dict:
+    """Load a JSON file, reusing the parsed data while its stat is unchanged.
+
+    Raises:
+        OSError: If the file can't be read
+        json.JSONDecodeError: If the file isn't valid JSON
+    """
+    st = os.stat(path)
+    key = str(path)
+    cached = _json_cache.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    with open(path) as f:
+        data = json.load(f)
+    _json_cache[key] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+
+def _latest_run_file(project_path: str) -> Optional[Path]:
+    """Most recently written run file (by mtime), or None."""
+    run_dir = Path(project_path) / ".eri-rpg" / "runs"
+    if not run_dir.exists():
+        return None
+
+    # Find most recent run
+    runs = list(run_dir.glob("*.json"))
+    if not runs:
+        return None
+
+    # Get latest by mtime
+    return max(runs, key=lambda p: p.stat().st_mtime)
+
+
+def get_active_run_state(project_path: str) -> dict:
+    """Check for active EriRPG run in project."""
+    latest = _latest_run_file(project_path)
+    if latest is None:
+        return None
+
+    try:
+        run_state = read_json_cached(latest)
+
+        # Check if run is still in progress
+        if run_state.get("completed_at") is None:
+            return run_state
+    except Exception as e:
+        import sys; print(f"[EriRPG] {e}", file=sys.stderr)
+
+    return None
+
+
+def get_preflight_state(project_path: str) -> dict:
+    """Check for active preflight state."""
+    preflight_file = Path(project_path) / ".eri-rpg" / "preflight_state.json"
+    if not preflight_file.exists():
+        return None
+
+    try:
+        return read_json_cached(preflight_file)
+    except Exception as e:
+        import sys; print(f"[EriRPG] {e}", file=sys.stderr); return None
+
+
+def get_quick_fix_state(project_path: str) -> dict:
+    """Check for active quick fix state."""
+    quick_fix_file = Path(project_path) / ".eri-rpg" / "quick_fix_state.json"
+    if not quick_fix_file.exists():
+        return None
+
+    try:
+        return read_json_cached(quick_fix_file)
+    except Exception as e:
+        import sys; print(f"[EriRPG] {e}", file=sys.stderr); return None
+
+
+def get_project_mode(project_path: str) -> str:
+    """Get the operational mode for a project.
+
+    Returns "bootstrap" (no enforcement) or "maintain" (full enforcement).
+    Handles migration: projects with learnings default to maintain.
+    """
+    config_file = Path(project_path) / ".eri-rpg" / "config.json"
+
+    if config_file.exists():
+        try:
+            data = read_json_cached(config_file)
+
+            # If mode is explicitly set, use it
+            if "mode" in data:
+                return data["mode"]
+
+        except (json.JSONDecodeError, KeyError):
+            pass
+
+    # Migration: check if project has learnings
+    knowledge_file = Path(project_path) / ".eri-rpg" / "knowledge.json"
+    if knowledge_file.exists():
+        try:
+            knowledge = read_json_cached(knowledge_file)
+
+            # Has learnings → assume stable project → maintain
+            if knowledge.get("learnings"):
+                return "maintain"
+        except (json.JSONDecodeError, KeyError):
+            pass
+
+    # Learnings may only be journaled so far
+    journal_file = knowledge_file.with_name("knowledge.journal.jsonl")
+    if journal_file.exists() and journal_file.stat().st_size > 0:
+        return "maintain"
+
+    # Default for new/empty projects
+    return "bootstrap"
+
+
+def get_enforcement_config(project_path: str) -> dict:
+    """Get enforcement configuration for a project.
+
+    Returns dict with:
+    - fail_closed: bool - Block on errors instead of allowing (safer but stricter)
+    - block_bash_writes: bool - Block all Bash file writes
+
+    Defaults to fail-open and allowing Bash writes for backwards compatibility.
+    """
+    defaults = {"fail_closed": False, "block_bash_writes": False}
+
+    config_file = Path(project_path) / ".eri-rpg" / "config.json"
+
+    if config_file.exists():
+        try:
+            data = read_json_cached(config_file)
+
+            enforcement = data.get("enforcement", {})
+            return {
+                "fail_closed": enforcement.get("fail_closed", False),
+                "block_bash_writes": enforcement.get("block_bash_writes", False),
+            }
+        except (json.JSONDecodeError, KeyError):
+            pass
+
+    return defaults
+
+
+
+
+def _source_names(latest_run: Optional[Path]) -> List[str]:
+    """Files (relative to .eri-rpg/) the decision inputs come from."""
+    names = [
+        "runs",
+        "config.json",
+        "knowledge.json",
+        "knowledge.journal.jsonl",
+        "quick_fix_state.json",
+        "preflight_state.json",
+    ]
+    if latest_run is not None:
+        names.append(f"runs/{latest_run.name}")
+    return names
+
+
+def _stamp(eri_dir: Path, names: List[str]) -> Dict[str, Optional[List[int]]]:
+    stamps = {}
+    for name in names:
+        try:
+            st = os.stat(eri_dir / name)
+            stamps[name] = [st.st_mtime_ns, st.st_size]
+        except OSError:
+            stamps[name] = None
+    return stamps
+
+
+def build_active(project_path: str) -> dict:
+    """Compute the pointer from the underlying state files."""
+    eri_dir = Path(project_path) / ".eri-rpg"
+    latest = _latest_run_file(project_path)
+    # Stat before reading, so a concurrent change invalidates the pointer
+    sources = _stamp(eri_dir, _source_names(latest))
+
+    quick_fix = get_quick_fix_state(project_path)
+    run = get_active_run_state(project_path)
+    preflight = get_preflight_state(project_path)
+    return {
+        "version": POINTER_VERSION,
+        "mode": get_project_mode(project_path),
+        "enforcement": get_enforcement_config(project_path),
+        "quick_fix": {
+            "quick_fix_active": quick_fix.get("quick_fix_active", False),
+            "target_file": quick_fix.get("target_file", ""),
+        } if quick_fix else None,
+        "run": {"id": run.get("id")} if run else None,
+        "preflight": {
+            "ready": preflight.get("ready", False),
+            "target_files": preflight.get("target_files", []),
+        } if preflight else None,
+        "sources": sources,
+    }
+
+
+def load_active(project_path: str) -> Optional[dict]:
+    """The pointer, if it exists and its sources are unchanged."""
+    eri_dir = Path(project_path) / ".eri-rpg"
+    try:
+        pointer = read_json_cached(eri_dir / POINTER_FILE)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(pointer, dict) or pointer.get("version") != POINTER_VERSION:
+        return None
+    sources = pointer.get("sources", {})
+    if _stamp(eri_dir, list(sources)) != sources:
+        return None
+    return pointer
+
+
+def refresh_active(project_path: str) -> Optional[dict]:
+    """Rebuild the pointer and write it atomically.
+
+    Returns:
+        The pointer, or None if the project has no .eri-rpg/ directory
+    """
+    eri_dir = Path(project_path) / ".eri-rpg"
+    if not eri_dir.is_dir():
+        return None
+    pointer = build_active(project_path)
+    tmp = eri_dir / f"{POINTER_FILE}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump(pointer, f)
+        os.replace(tmp, eri_dir / POINTER_FILE)
+    except OSError as e:
+        import sys; print(f"[EriRPG] Could not write {POINTER_FILE}: {e}", file=sys.stderr)
+    return pointer
+
+
+def active_state(project_path: str) -> dict:
+    """Decision inputs for a project: the pointer, rebuilt if stale."""
+    return load_active(project_path) or refresh_active(project_path) or build_active(project_path)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+EriRPG hook client - thin entry point for per-tool-call hooks.
+
+Claude Code starts a fresh interpreter for every hook call. This shim
+keeps that start as cheap as possible: it imports only the standard
+library, forwards the hook input to the resident hook daemon
+(erirpg.hooks.daemon) over its Unix socket, and prints the daemon's
+answer. If no daemon is running (it is opt-in, see `eri-rpg hooks
+start`) or the exchange fails, the hook runs in-process exactly as
+before.
+
+Usage (in ~/.claude/settings.json):
+    "command": "python3 /path/to/erirpg/hooks/client.py pretooluse"
+
+Hooks served this way: pretooluse, posttooluse, persona_detect.
+"""
+
+import importlib
+import io
+import json
+import os
+import socket
+import sys
+
+# Hooks the daemon can serve
+DAEMON_HOOKS = ("pretooluse", "posttooluse", "persona_detect")
+
+# Seconds to wait for the daemon to accept a connection
+CONNECT_TIMEOUT = 0.2
+# Seconds to wait for the daemon's answer
+RESPONSE_TIMEOUT = 30.0
+
+
+def get_socket_path() -> str:
+    """Path of the hook daemon's socket (ERIRPG_HOOKD_SOCKET overrides)."""
+    return os.environ.get("ERIRPG_HOOKD_SOCKET") or os.path.join(
+        os.path.expanduser("~"), ".eri-rpg", "hookd.sock"
+    )
+
+
+def hook_env() -> dict:
+    """EriRPG environment variables the hooks may read."""
+    return {
+        k: v for k, v in os.environ.items()
+        if k.startswith("ERIRPG_") and k != "ERIRPG_HOOKD_SOCKET"
+    }
+
+
+def request(message: dict, socket_path: str = None, timeout: float = RESPONSE_TIMEOUT) -> dict:
+    """Send one request to the daemon and return its reply.
+
+    Raises:
+        OSError: If the daemon can't be reached or the reply is invalid
+    """
+    socket_path = socket_path or get_socket_path()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(socket_path)
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b"\n"):
+                break
+    finally:
+        sock.close()
+    try:
+        return json.loads(b"".join(chunks))
+    except ValueError as e:
+        raise OSError(f"invalid daemon reply: {e}")
+
+
+def forward(hook: str, raw_input: str, socket_path: str = None):
+    """Run a hook through the daemon.
+
+    Returns:
+        The daemon's reply ({"stdout", "stderr", "exit"}), or None if
+        the hook has to run in-process
+    """
+    socket_path = socket_path or get_socket_path()
+    if hook not in DAEMON_HOOKS or not os.path.exists(socket_path):
+        return None
+    try:
+        reply = request({
+            "hook": hook,
+            "stdin": raw_input,
+            "cwd": os.getcwd(),
+            "env": hook_env(),
+        }, socket_path)
+    except OSError:
+        return None
+    if reply.get("fallback"):
+        return None
+    return reply
+
+
+def run_in_process(hook: str, raw_input: str) -> None:
+    """Run a hook's main() in this process with raw_input as stdin."""
+    if __package__:
+        module = importlib.import_module(f"{__package__}.{hook}")
+    else:
+        # Run as a script: the hooks directory is on sys.path
+        module = importlib.import_module(hook)
+    sys.stdin = io.StringIO(raw_input)
+    module.main()
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in DAEMON_HOOKS:
+        print(f"Usage: client.py {{{'|'.join(DAEMON_HOOKS)}}}", file=sys.stderr)
+        sys.exit(2)
+
+    hook = sys.argv[1]
+    raw_input = sys.stdin.read()
+    reply = forward(hook, raw_input)
+    if reply is None:
+        run_in_process(hook, raw_input)
+        return
+
+    sys.stdout.write(reply.get("stdout", ""))
+    sys.stderr.write(reply.get("stderr", ""))
+    sys.exit(reply.get("exit", 0))
+
+
+if __name__ == "__main__":
+    main()
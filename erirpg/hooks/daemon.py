@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+EriRPG hook daemon - serves per-tool-call hooks from a resident process.
+
+Hooks run hundreds of times per session, and each call used to start a
+new interpreter, import the hook and re-read the project's run, config
+and knowledge JSON. The daemon keeps hook modules imported (and the JSON
+they cache by stat) warm in one process, and answers the thin client
+(erirpg.hooks.client) over a Unix socket.
+
+The daemon is opt-in:
+    eri-rpg hooks start     # spawn in the background
+    eri-rpg hooks status
+    eri-rpg hooks stop
+
+It exits by itself after IDLE_TIMEOUT seconds without requests, reloads
+a hook module when its source file changes, and asks the client to run
+the hook in-process when the client's ERIRPG_* environment differs from
+its own (so e.g. ERIRPG_HOOKS_DISABLED keeps working).
+
+Protocol (one JSON line each way):
+    -> {"hook": "pretooluse", "stdin": "...", "cwd": "...", "env": {...}}
+    <- {"stdout": "...", "stderr": "...", "exit": 0}
+    -> {"ping": true}   <- {"pong": true, "pid": 123}
+    -> {"stop": true}   <- {"stopping": true}
+"""
+
+import importlib
+import io
+import json
+import os
+import signal
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+
+from erirpg.hooks.client import DAEMON_HOOKS, get_socket_path, hook_env, request
+
+# Seconds without requests before the daemon exits
+IDLE_TIMEOUT = 1800.0
+
+# Seconds to wait for a spawned daemon to answer
+START_TIMEOUT = 5.0
+
+
+class _ThreadStream:
+    """Stand-in for sys.stdin/stdout/stderr that is redirectable per thread."""
+
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+
+    def redirect(self, stream) -> None:
+        self._local.stream = stream
+
+    def _target(self):
+        return getattr(self._local, "stream", None) or self._default
+
+    def write(self, s):
+        return self._target().write(s)
+
+    def read(self, size=-1):
+        return self._target().read(size)
+
+    def readline(self, size=-1):
+        return self._target().readline(size)
+
+    def flush(self):
+        return self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+
+_streams_lock = threading.Lock()
+
+
+def _install_streams() -> None:
+    """Replace the process streams with per-thread redirectable ones."""
+    with _streams_lock:
+        for name in ("stdin", "stdout", "stderr"):
+            if not isinstance(getattr(sys, name), _ThreadStream):
+                setattr(sys, name, _ThreadStream(getattr(sys, name)))
+
+
+class HookHost:
+    """Imports hook modules once and runs their main() per request."""
+
+    def __init__(self):
+        self._modules: Dict[str, tuple] = {}  # hook -> (module, source mtime)
+        self._lock = threading.Lock()
+
+    def module(self, hook: str):
+        """The hook's module, reloaded if its source changed."""
+        with self._lock:
+            entry = self._modules.get(hook)
+            if entry is None:
+                module = importlib.import_module(f"erirpg.hooks.{hook}")
+            else:
+                module = entry[0]
+                if _mtime(module.__file__) != entry[1]:
+                    module = importlib.reload(module)
+            self._modules[hook] = (module, _mtime(module.__file__))
+            return module
+
+    def run(self, hook: str, raw_input: str) -> dict:
+        """Run a hook with raw_input as stdin, capturing its output."""
+        _install_streams()
+        module = self.module(hook)
+        out, err = io.StringIO(), io.StringIO()
+        sys.stdin.redirect(io.StringIO(raw_input))
+        sys.stdout.redirect(out)
+        sys.stderr.redirect(err)
+        code = 0
+        try:
+            module.main()
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            err.write(traceback.format_exc())
+            code = 1
+        finally:
+            sys.stdin.redirect(None)
+            sys.stdout.redirect(None)
+            sys.stderr.redirect(None)
+        return {"stdout": out.getvalue(), "stderr": err.getvalue(), "exit": code}
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _with_cwd(raw_input: str, cwd: Optional[str]) -> str:
+    """Add the client's cwd to the hook input if the input lacks one."""
+    if not cwd:
+        return raw_input
+    try:
+        data = json.loads(raw_input)
+    except ValueError:
+        return raw_input
+    if not isinstance(data, dict) or "cwd" in data:
+        return raw_input
+    data["cwd"] = cwd
+    return json.dumps(data)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        server.last_request = time.monotonic()
+        try:
+            message = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+
+        if message.get("ping"):
+            reply = {"pong": True, "pid": os.getpid()}
+        elif message.get("stop"):
+            reply = {"stopping": True}
+            threading.Thread(target=server.shutdown, daemon=True).start()
+        elif message.get("hook") not in DAEMON_HOOKS or message.get("env", {}) != hook_env():
+            reply = {"fallback": True}
+        else:
+            reply = server.host.run(
+                message["hook"], _with_cwd(message.get("stdin", ""), message.get("cwd"))
+            )
+
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+        server.last_request = time.monotonic()
+
+
+class HookServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server running hooks in a HookHost."""
+    daemon_threads = True
+
+    def __init__(self, socket_path: str):
+        self.host = HookHost()
+        self.last_request = time.monotonic()
+        old_umask = os.umask(0o077)  # socket readable by this user only
+        try:
+            super().__init__(socket_path, _Handler)
+        finally:
+            os.umask(old_umask)
+
+
+def _pid_path(socket_path: str) -> str:
+    return os.path.splitext(socket_path)[0] + ".pid"
+
+
+def serve(socket_path: Optional[str] = None, idle_timeout: float = IDLE_TIMEOUT) -> int:
+    """Run the daemon in the foreground until stopped or idle.
+
+    Returns:
+        Exit code (1 if another daemon already serves the socket)
+    """
+    socket_path = socket_path or get_socket_path()
+    if daemon_status(socket_path) is not None:
+        print(f"[EriRPG] Hook daemon already running on {socket_path}", file=sys.stderr)
+        return 1
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)  # left behind by a dead daemon
+
+    server = HookServer(socket_path)
+    with open(_pid_path(socket_path), "w") as f:
+        f.write(str(os.getpid()))
+
+    def watch_idle():
+        while True:
+            time.sleep(min(60.0, idle_timeout / 4))
+            if time.monotonic() - server.last_request > idle_timeout:
+                server.shutdown()
+                return
+
+    threading.Thread(target=watch_idle, daemon=True).start()
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(
+            signal.SIGTERM,
+            lambda *_: threading.Thread(target=server.shutdown, daemon=True).start(),
+        )
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        for path in (socket_path, _pid_path(socket_path)):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+    return 0
+
+
+def daemon_status(socket_path: Optional[str] = None) -> Optional[dict]:
+    """Ping the daemon; returns {"pid": ...} or None if not running."""
+    socket_path = socket_path or get_socket_path()
+    if not os.path.exists(socket_path):
+        return None
+    try:
+        reply = request({"ping": True}, socket_path, timeout=2.0)
+    except OSError:
+        return None
+    return {"pid": reply.get("pid"), "socket": socket_path} if reply.get("pong") else None
+
+
+def start_daemon(socket_path: Optional[str] = None) -> Optional[int]:
+    """Spawn the daemon in the background.
+
+    Returns:
+        Daemon pid, or None if it didn't come up in time
+    """
+    socket_path = socket_path or get_socket_path()
+    status = daemon_status(socket_path)
+    if status is not None:
+        return status["pid"]
+
+    env = dict(os.environ, ERIRPG_HOOKD_SOCKET=socket_path)
+    subprocess.Popen(
+        [sys.executable, "-m", "erirpg.hooks.daemon"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+        env=env,
+    )
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        status = daemon_status(socket_path)
+        if status is not None:
+            return status["pid"]
+        time.sleep(0.05)
+    return None
+
+
+def stop_daemon(socket_path: Optional[str] = None) -> bool:
+    """Ask the daemon to exit. Returns False if it wasn't running."""
+    socket_path = socket_path or get_socket_path()
+    if not os.path.exists(socket_path):
+        return False
+    try:
+        request({"stop": True}, socket_path, timeout=2.0)
+    except OSError:
+        return False
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(serve())
@@ -0,0 +1,180 @@
+"""
+Lightweight git facade: branch and HEAD read straight from .git.
+
+Hooks, the status line and snapshots ask git for the branch or the HEAD
+commit many times per session, and each `git rev-parse` is a process
+spawn. This module answers those questions by reading .git/HEAD, loose
+refs and packed-refs directly, memoizing each file per process keyed on
+its stat (mtime, size), so repeated lookups in a resident process cost a
+few stats. Worktrees and submodules (a ".git" file pointing elsewhere)
+are followed, including their shared "commondir".
+
+Porcelain operations (status, diff, log, commit) still run git through
+run_git(), as do ref lookups in repositories using the reftable format.
+
+Standard library only, so hooks can use it without importing erirpg.
+
+Usage:
+    branch = current_branch(project_path)   # "main", or "HEAD" if detached
+    sha = head_commit(project_path)         # full hash, None if unborn
+    code, out, err = run_git(["status", "--porcelain"], project_path)
+"""
+
+import os
+import subprocess
+from typing import List, Optional, Tuple
+
+GIT_TIMEOUT = 5
+
+# path -> ((mtime_ns, size), content)
+_files = {}
+
+
+def _read(path: str) -> Optional[str]:
+    """File content, memoized until its stat changes (None if missing)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        _files.pop(path, None)
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _files.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            content = f.read()
+    except OSError:
+        return None
+    _files[path] = (key, content)
+    return content
+
+
+def find_git_dir(path: str) -> Optional[str]:
+    """The git directory of the repository containing path."""
+    current = os.path.abspath(path)
+    while True:
+        dot_git = os.path.join(current, ".git")
+        if os.path.isdir(dot_git):
+            return dot_git
+        if os.path.isfile(dot_git):
+            # Worktree or submodule: ".git" names the real git dir
+            content = (_read(dot_git) or "").strip()
+            if not content.startswith("gitdir:"):
+                return None
+            return os.path.normpath(os.path.join(current, content[len("gitdir:"):].strip()))
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
+
+
+def head_path(path: str) -> Optional[str]:
+    """Path of the HEAD file for the repository containing path."""
+    git_dir = find_git_dir(path)
+    return os.path.join(git_dir, "HEAD") if git_dir else None
+
+
+def _common_dir(git_dir: str) -> str:
+    """Directory holding refs shared by all worktrees."""
+    common = _read(os.path.join(git_dir, "commondir"))
+    if common and common.strip():
+        return os.path.normpath(os.path.join(git_dir, common.strip()))
+    return git_dir
+
+
+def git_common_dir(path: str) -> Optional[str]:
+    """Git directory shared by all worktrees of the repository containing path."""
+    git_dir = find_git_dir(path)
+    return _common_dir(git_dir) if git_dir else None
+
+
+def _uses_reftable(git_dir: str) -> bool:
+    return os.path.isdir(os.path.join(_common_dir(git_dir), "reftable"))
+
+
+def head_ref(path: str) -> Optional[str]:
+    """Symbolic ref HEAD points to (e.g. "refs/heads/main"), None if detached."""
+    git_dir = find_git_dir(path)
+    if git_dir is None:
+        return None
+    content = (_read(os.path.join(git_dir, "HEAD")) or "").strip()
+    if content.startswith("ref:"):
+        return content[len("ref:"):].strip()
+    return None
+
+
+def current_branch(path: str) -> Optional[str]:
+    """Current branch name, "HEAD" if detached, None outside a repository."""
+    git_dir = find_git_dir(path)
+    if git_dir is None:
+        return None
+    if _uses_reftable(git_dir):
+        code, out, _ = run_git(["rev-parse", "--abbrev-ref", "HEAD"], path)
+        return out.strip() if code == 0 else None
+    content = (_read(os.path.join(git_dir, "HEAD")) or "").strip()
+    if content.startswith("ref:"):
+        ref = content[len("ref:"):].strip()
+        return ref[len("refs/heads/"):] if ref.startswith("refs/heads/") else ref
+    return "HEAD" if content else None
+
+
+def resolve_ref(git_dir: str, ref: str) -> Optional[str]:
+    """Commit hash of a full ref name, from loose refs or packed-refs."""
+    seen = set()
+    while ref not in seen:
+        seen.add(ref)
+        # Per-worktree refs live in git_dir, shared ones in the common dir
+        for base in (git_dir, _common_dir(git_dir)):
+            content = _read(os.path.join(base, ref))
+            if content is not None:
+                break
+        else:
+            return _packed_ref(_common_dir(git_dir), ref)
+        content = content.strip()
+        if not content.startswith("ref:"):
+            return content or None
+        ref = content[len("ref:"):].strip()
+    return None  # Symbolic ref loop
+
+
+def _packed_ref(common_dir: str, ref: str) -> Optional[str]:
+    packed = _read(os.path.join(common_dir, "packed-refs"))
+    if not packed:
+        return None
+    suffix = " " + ref
+    for line in packed.splitlines():
+        if line.endswith(suffix) and not line.startswith(("#", "^")):
+            return line[:-len(suffix)]
+    return None
+
+
+def head_commit(path: str) -> Optional[str]:
+    """Full hash of the HEAD commit, None outside a repository or if unborn."""
+    git_dir = find_git_dir(path)
+    if git_dir is None:
+        return None
+    if _uses_reftable(git_dir):
+        code, out, _ = run_git(["rev-parse", "HEAD"], path)
+        return out.strip() if code == 0 else None
+    return resolve_ref(git_dir, "HEAD")
+
+
+def run_git(args: List[str], cwd: Optional[str] = None, timeout: Optional[float] = GIT_TIMEOUT) -> Tuple[int, str, str]:
+    """Run a git command (for porcelain operations).
+
+    Returns:
+        Tuple of (return_code, stdout, stderr); (-1, "", error) if git
+        couldn't be run or timed out
+    """
+    try:
+        result = subprocess.run(
+            ["git"] + args,
+            cwd=cwd or os.getcwd(),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return -1, "", str(e)
+    return result.returncode, result.stdout, result.stderr
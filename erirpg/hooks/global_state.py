@@ -0,0 +1,212 @@
+"""
+Locked, change-only updates of the global ~/.eri-rpg/state.json from hooks.
+
+Hooks update a few fields of the global state (persona, actively edited
+project) on every tool call, while the CLI saves the same file through
+erirpg.state.State. Updates here take the same sidecar lock as
+erirpg.locking.file_lock ("state.json.lock"), merge into the current
+file instead of overwriting it, replace it atomically, and skip the
+write entirely when the fields already hold the given values.
+
+Reads are cached by stat, so a resident hook daemon parses the file
+only after it changed.
+
+Debounced writers can defer an update instead of dropping it:
+defer_update() parks the fields in "state.json.pending" with a due time,
+and flush_pending() (called by hooks and the status line) merges them
+once due, so the last change inside a debounce window still lands. The
+pending file is read, written and removed under the state lock too, so
+a flush can't drop an update parked while it runs or apply one twice.
+
+Standard library only, so hooks can use it without importing erirpg.
+
+Usage:
+    state = read_state()
+    update_state({"persona": "backend"})
+    defer_update({"persona": "qa"}, due=time.time() + 5)
+    flush_pending()
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+STATE_FILE = os.path.join(os.path.expanduser("~"), ".eri-rpg", "state.json")
+
+# Seconds a hook waits for the state lock before skipping the update
+LOCK_TIMEOUT = 1.0
+
+# path -> ((mtime_ns, size), state)
+_cache = {}
+
+
+def read_state(path: Optional[str] = None) -> dict:
+    """Current global state ({} if missing or unreadable)."""
+    path = path or STATE_FILE
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {}
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _cache.get(path)
+    if cached and cached[0] == key:
+        return dict(cached[1])
+    try:
+        with open(path, "r") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(state, dict):
+        return {}
+    _cache[path] = (key, state)
+    return dict(state)
+
+
+def _lock(fd: int, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+
+
+@contextmanager
+def _state_lock(path: str, timeout: float) -> Iterator[bool]:
+    """Hold the state's sidecar lock; yields False if it timed out."""
+    fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        yield fcntl is None or _lock(fd, timeout)
+    finally:
+        os.close(fd)  # Closing releases the flock
+
+
+def _merge(fields: dict, path: str) -> bool:
+    """Merge fields into the state file (caller holds the lock)."""
+    state = read_state(path)
+    if all(state.get(k) == v for k, v in fields.items()):
+        return False
+    state.update(fields)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+    return True
+
+
+def update_state(fields: dict, path: Optional[str] = None, timeout: float = LOCK_TIMEOUT) -> bool:
+    """Merge fields into the global state under its lock.
+
+    Returns:
+        True if the file was written, False if the fields were already
+        current, the directory doesn't exist or the lock timed out
+    """
+    path = path or STATE_FILE
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        return False
+
+    with _state_lock(path, timeout) as locked:
+        return locked and _merge(fields, path)
+
+
+def _pending_path(path: Optional[str]) -> str:
+    return (path or STATE_FILE) + ".pending"
+
+
+def defer_update(
+    fields: dict,
+    due: float,
+    path: Optional[str] = None,
+    timeout: float = LOCK_TIMEOUT,
+) -> bool:
+    """Park fields to be merged into the state at time due (epoch seconds).
+
+    Replaces any update parked earlier. Parking the same fields again
+    keeps the original due time.
+
+    Returns:
+        True if the pending file was written
+    """
+    path = path or STATE_FILE
+    pending_path = _pending_path(path)
+    if not os.path.isdir(os.path.dirname(pending_path)):
+        return False
+    with _state_lock(path, timeout) as locked:
+        if not locked:
+            return False
+        try:
+            with open(pending_path, "r") as f:
+                if json.load(f).get("fields") == fields:
+                    return False
+        except (OSError, ValueError, AttributeError):
+            pass
+        tmp = f"{pending_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"due": due, "fields": fields}, f)
+            os.replace(tmp, pending_path)
+        except OSError:
+            return False
+        return True
+
+
+def cancel_pending(path: Optional[str] = None, timeout: float = LOCK_TIMEOUT) -> None:
+    """Drop a parked update (superseded by a newer write or detection)."""
+    path = path or STATE_FILE
+    pending_path = _pending_path(path)
+    if not os.path.exists(pending_path):
+        return
+    # Removed even if the lock times out: a stale update must not land later
+    with _state_lock(path, timeout):
+        try:
+            os.unlink(pending_path)
+        except OSError:
+            pass
+
+
+def flush_pending(
+    path: Optional[str] = None,
+    now: Optional[float] = None,
+    timeout: float = LOCK_TIMEOUT,
+) -> bool:
+    """Merge a parked update into the state if it is due.
+
+    Returns:
+        True if the state was written
+    """
+    path = path or STATE_FILE
+    pending_path = _pending_path(path)
+    if not os.path.exists(pending_path):
+        return False
+    with _state_lock(path, timeout) as locked:
+        if not locked:
+            return False
+        try:
+            with open(pending_path, "r") as f:
+                pending = json.load(f)
+            due = float(pending["due"])
+            fields = dict(pending["fields"])
+        except FileNotFoundError:
+            return False  # Flushed or cancelled while we waited
+        except (OSError, ValueError, TypeError, KeyError):
+            due, fields = None, None
+        if due is not None and (time.time() if now is None else now) < due:
+            return False
+        written = fields is not None and _merge(fields, path)
+        try:
+            os.unlink(pending_path)
+        except OSError:
+            pass
+        return written
@@ -0,0 +1,166 @@
+"""
+Per-project, per-session log of files modified through Claude Code.
+
+The PostToolUse hook appends one path per line to its session's log, so
+tracking an edit is a single O_APPEND write with no shared file to read
+and rewrite. Readers merge all session logs of a project and dedup.
+Logs of old sessions rotate out when a new session starts logging.
+Appends and clear_modified() lock the log (flock on the log itself), and
+clearing rewrites a log in place, so an append racing a clear is never
+lost.
+
+Standard library only, so hooks can use it without importing erirpg.
+
+Storage structure:
+    .eri-rpg/                  (or .planning/ for coder-only projects)
+    └── modified/
+        ├── <session_id>.log   # absolute paths, one per line, append-only
+        └── ...
+
+Usage:
+    append_modified(project_path, session_id, file_path)
+    files = read_modified(project_path)
+    clear_modified(project_path, files)
+"""
+
+import os
+import re
+import time
+from typing import Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks
+    fcntl = None
+
+# Session logs older than this are removed (seconds)
+MAX_SESSION_AGE = 7 * 24 * 3600
+# At most this many session logs are kept per project
+MAX_SESSIONS = 20
+
+DEFAULT_SESSION = "default"
+_SESSION_RE = re.compile(r"[^A-Za-z0-9_-]")
+
+
+def log_dir(project_path: str) -> Optional[str]:
+    """Directory holding a project's session logs (None if untracked)."""
+    for state_dir in (".eri-rpg", ".planning"):
+        base = os.path.join(project_path, state_dir)
+        if os.path.isdir(base):
+            return os.path.join(base, "modified")
+    return None
+
+
+def _session_file(directory: str, session_id: Optional[str]) -> str:
+    name = _SESSION_RE.sub("", session_id or "")[:64] or DEFAULT_SESSION
+    return os.path.join(directory, f"{name}.log")
+
+
+def _session_logs(directory: str) -> List[str]:
+    """Session log paths, oldest first."""
+    try:
+        entries = [e for e in os.scandir(directory) if e.name.endswith(".log")]
+    except OSError:
+        return []
+    logs = []
+    for entry in entries:
+        try:
+            logs.append((entry.stat().st_mtime, entry.path))
+        except OSError:
+            continue  # Removed by a concurrent rotation
+    return [path for _, path in sorted(logs)]
+
+
+def _lock(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+
+def rotate(directory: str, keep: Optional[str] = None) -> None:
+    """Drop session logs that are too old or beyond MAX_SESSIONS."""
+    logs = [p for p in _session_logs(directory) if p != keep]
+    cutoff = time.time() - MAX_SESSION_AGE
+    excess = len(logs) + (1 if keep else 0) - MAX_SESSIONS
+    for i, path in enumerate(logs):
+        try:
+            if i < excess or os.path.getmtime(path) < cutoff:
+                os.unlink(path)
+        except OSError:
+            pass
+
+
+def append_modified(project_path: str, session_id: Optional[str], file_path: str) -> None:
+    """Record a modified file in the session's log."""
+    directory = log_dir(project_path)
+    if directory is None:
+        return
+    path = _session_file(directory, session_id)
+    is_new = not os.path.exists(path)
+    if is_new:
+        os.makedirs(directory, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        _lock(fd)
+        os.write(fd, (file_path + "\n").encode("utf-8"))
+    finally:
+        os.close(fd)
+    if is_new:
+        rotate(directory, keep=path)
+
+
+def read_modified(project_path: str) -> List[str]:
+    """All files modified in the project across session logs, deduped."""
+    directory = log_dir(project_path)
+    if directory is None:
+        return []
+    seen = {}
+    for path in _session_logs(directory):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.rstrip("\n")
+                    if line:
+                        seen[line] = None
+        except OSError:
+            continue
+    return list(seen)
+
+
+def clear_modified(project_path: str, files: Optional[Iterable[str]] = None) -> None:
+    """Forget committed files (all files if None).
+
+    Relative paths in files are taken relative to project_path. Entries
+    appended after the caller read the logs are kept unless they are
+    among files. Each log is rewritten in place under its lock (emptied
+    logs stay until rotated), so appenders never write to a replaced or
+    unlinked file.
+    """
+    directory = log_dir(project_path)
+    if directory is None:
+        return
+    done = None
+    if files is not None:
+        root = os.path.abspath(project_path)
+        done = {os.path.normpath(os.path.join(root, f)) for f in files}
+    for path in _session_logs(directory):
+        try:
+            fd = os.open(path, os.O_RDWR)
+        except OSError:
+            continue  # Removed by a concurrent rotation
+        try:
+            _lock(fd)
+            with os.fdopen(os.dup(fd), "r+", encoding="utf-8") as f:
+                if done is None:
+                    remaining = []
+                else:
+                    remaining = [
+                        line for line in f
+                        if os.path.normpath(line.rstrip("\n")) not in done
+                    ]
+                f.seek(0)
+                f.truncate()
+                f.writelines(remaining)
+        except OSError:
+            continue
+        finally:
+            os.close(fd)
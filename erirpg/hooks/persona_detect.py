@@ -8,6 +8,15 @@ and automatically update the persona in state.json.
 This is a lightweight, non-blocking hook - it never blocks operations,
 just updates persona state for the status line.
 
+state.json is written only on a persona transition, and rapid
+transitions are coalesced: after a write, further changes wait until
+PERSONA_DEBOUNCE seconds have passed. A transition inside the window is
+parked with global_state.defer_update() and written when the window
+ends (by the next hook run or status line render), unless a later
+detection supersedes it, so the last persona of a burst is never lost.
+Writes go through global_state.py (locked, merged, atomic), so they
+don't race the CLI's own saves.
+
 Detection rules:
 - Read/Grep/Glob on code → analyzer
 - Edit/Write on .py/.js/.ts/.go/.rs → backend
@@ -37,17 +46,32 @@ Install in ~/.claude/settings.json:
 }
 """
 
+import time
+_LOADED_AT = time.perf_counter()
+
 import json
 import os
 import re
 import sys
+from functools import lru_cache
 from pathlib import Path
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+if __package__:
+    from erirpg.hooks.global_state import (
+        cancel_pending, defer_update, flush_pending, read_state, update_state,
+    )
+    from erirpg.hooks.timing import HookTimer
+else:
+    from global_state import cancel_pending, defer_update, flush_pending, read_state, update_state
+    from timing import HookTimer
 
-STATE_FILE = Path.home() / ".eri-rpg" / "state.json"
 LOG_FILE = Path("/tmp/erirpg-persona.log")
 
+# Minimum seconds between two persona writes
+PERSONA_DEBOUNCE = 5.0
+
 # File extension to persona mapping
 BACKEND_EXTENSIONS = {'.py', '.js', '.ts', '.go', '.rs', '.java', '.rb', '.php', '.c', '.cpp', '.h'}
 FRONTEND_EXTENSIONS = {'.jsx', '.tsx', '.vue', '.svelte', '.css', '.scss', '.sass', '.less', '.html'}
@@ -56,6 +80,23 @@ DOC_EXTENSIONS = {'.md', '.rst', '.txt', '.adoc'}
 # Security-related patterns in file paths
 SECURITY_PATTERNS = ['auth', 'security', 'crypto', 'password', 'token', 'secret', 'permission', 'acl']
 
+# Bash command patterns, in priority order
+TEST_COMMANDS = ["pytest", "jest", "npm test", "yarn test", "cargo test", "go test", "rspec", "unittest"]
+DEVOPS_COMMANDS = ["docker", "kubectl", "terraform", "ansible", "deploy", "build"]
+LINT_COMMANDS = ["ruff", "eslint", "prettier", "black", "mypy", "tsc"]
+
+
+def _any_of(words) -> "re.Pattern":
+    return re.compile("|".join(re.escape(w) for w in words))
+
+
+# Compiled once per process (a resident hook daemon keeps them warm)
+SECURITY_RE = _any_of(SECURITY_PATTERNS)
+TEST_RE = _any_of(TEST_COMMANDS)
+GIT_RE = re.compile(r"git ")
+DEVOPS_RE = _any_of(DEVOPS_COMMANDS)
+LINT_RE = _any_of(LINT_COMMANDS)
+
 
 def log(msg: str):
     """Log for debugging (disabled by default)."""
@@ -67,37 +108,24 @@ def log(msg: str):
             pass
 
 
-def load_state() -> dict:
-    """Load current state."""
-    if STATE_FILE.exists():
-        try:
-            return json.loads(STATE_FILE.read_text())
-        except:
-            pass
-    return {}
-
-
-def save_state(state: dict):
-    """Save state."""
-    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    STATE_FILE.write_text(json.dumps(state, indent=2))
-
-
 def detect_persona(tool_name: str, tool_input: dict) -> Optional[str]:
     """Detect persona based on tool usage. Returns None if no change needed."""
 
     file_path = tool_input.get("file_path", "") or tool_input.get("path", "") or ""
     command = tool_input.get("command", "")
-    pattern = tool_input.get("pattern", "")
 
+    log(f"Detecting: tool={tool_name}, file={file_path}, cmd={command[:50]}")
+    return _detect(tool_name, file_path, command if tool_name == "Bash" else "")
+
+
+@lru_cache(maxsize=512)
+def _detect(tool_name: str, file_path: str, command: str) -> Optional[str]:
     # Normalize file path
     file_lower = file_path.lower()
     ext = Path(file_path).suffix.lower() if file_path else ""
 
-    log(f"Detecting: tool={tool_name}, file={file_path}, ext={ext}, cmd={command[:50]}")
-
     # Security detection (highest priority)
-    if any(sec in file_lower for sec in SECURITY_PATTERNS):
+    if SECURITY_RE.search(file_lower):
         return "security"
 
     # Tool-specific detection
@@ -129,19 +157,19 @@ def detect_persona(tool_name: str, tool_input: dict) -> Optional[str]:
         cmd_lower = command.lower()
 
         # Test commands
-        if any(t in cmd_lower for t in ["pytest", "jest", "npm test", "yarn test", "cargo test", "go test", "rspec", "unittest"]):
+        if TEST_RE.search(cmd_lower):
             return "qa"
 
         # Git commands
-        if cmd_lower.startswith("git ") or "git " in cmd_lower:
+        if GIT_RE.search(cmd_lower):
             return "devops"
 
         # Build/deploy commands
-        if any(t in cmd_lower for t in ["docker", "kubectl", "terraform", "ansible", "deploy", "build"]):
+        if DEVOPS_RE.search(cmd_lower):
             return "devops"
 
         # Lint/format (quality)
-        if any(t in cmd_lower for t in ["ruff", "eslint", "prettier", "black", "mypy", "tsc"]):
+        if LINT_RE.search(cmd_lower):
             return "refactorer"
 
     if tool_name == "Task":
@@ -156,10 +184,57 @@ def detect_persona(tool_name: str, tool_input: dict) -> Optional[str]:
     return None
 
 
+def persona_update(state: dict, detected: str, now: datetime) -> Optional[dict]:
+    """State fields to write for a detection, or None to skip the write.
+
+    Skips when the persona is unchanged, and coalesces transitions that
+    come within PERSONA_DEBOUNCE seconds of the previous write.
+    """
+    if state.get("persona") == detected:
+        return None
+    updated = state.get("persona_updated")
+    if updated and state.get("persona_auto"):
+        try:
+            elapsed = (now - datetime.fromisoformat(updated)).total_seconds()
+        except (TypeError, ValueError):
+            elapsed = PERSONA_DEBOUNCE
+        if 0 <= elapsed < PERSONA_DEBOUNCE:
+            return None
+    return {
+        "persona": detected,
+        "persona_auto": True,  # Mark as auto-detected
+        "persona_updated": now.isoformat(),
+    }
+
+
+def persona_deferred(state: dict, detected: str) -> Optional[Tuple[dict, datetime]]:
+    """Fields and due time for a transition persona_update debounced.
+
+    Returns None if there is no window to wait out (nothing to defer).
+    """
+    if state.get("persona") == detected or not state.get("persona_auto"):
+        return None
+    try:
+        due = datetime.fromisoformat(state["persona_updated"]) + timedelta(seconds=PERSONA_DEBOUNCE)
+    except (KeyError, TypeError, ValueError):
+        return None
+    return {"persona": detected, "persona_auto": True, "persona_updated": due.isoformat()}, due
+
+
 def main():
     """Main hook entry point."""
+    timer = HookTimer("persona_detect", _LOADED_AT)
+    try:
+        _run(timer)
+    finally:
+        timer.finish()
+
+
+def _run(timer: HookTimer):
+    """Detect the persona for one tool call, timing each phase."""
     try:
         # Read input
+        timer.phase("input")
         raw_input = sys.stdin.read()
         if not raw_input.strip():
             print(json.dumps({}))
@@ -169,6 +244,7 @@ def main():
         cwd = input_data.get("cwd", os.getcwd())
 
         # Project detection - early exit if not an eri-rpg project
+        timer.phase("project")
         project_root = None
         check = cwd
         while check != '/':
@@ -188,19 +264,28 @@ def main():
         log(f"Hook called: {tool_name}")
 
         # Detect persona
+        timer.phase("decision")
         detected = detect_persona(tool_name, tool_input)
 
+        timer.phase("state")
+        flush_pending()
         if detected:
-            state = load_state()
-            current = state.get("persona")
-
-            # Only update if different (avoid excessive writes)
-            if current != detected:
-                log(f"Updating persona: {current} -> {detected}")
-                state["persona"] = detected
-                state["persona_auto"] = True  # Mark as auto-detected
-                state["persona_updated"] = datetime.now().isoformat()
-                save_state(state)
+            state = read_state()
+
+            # Only write on (debounced) transitions
+            fields = persona_update(state, detected, datetime.now())
+            if fields:
+                log(f"Updating persona: {state.get('persona')} -> {detected}")
+                timer.phase("write")
+                update_state(fields)
+                cancel_pending()
+            else:
+                deferred = persona_deferred(state, detected)
+                if deferred:
+                    # Inside the window: write it when the window ends
+                    defer_update(deferred[0], deferred[1].timestamp())
+                else:
+                    cancel_pending()  # Back to the current persona
 
         # Never block - always return empty
         print(json.dumps({}))
@@ -12,10 +12,12 @@ The actual commit happens via:
 - verify_and_commit() function (standalone verification + commit)
 - /eri:done command (runs verification then commits)
 
-This hook just tracks modified files so we know what to commit.
+This hook just tracks modified files so we know what to commit, in an
+append-only per-session log under the project (see modified_files.py).
 
 Input (JSON on stdin):
 {
+  "session_id": "abc123",
   "tool_name": "Edit",
   "tool_input": {"file_path": "/path/to/file.py", ...},
   "cwd": "/current/working/directory"
@@ -27,18 +29,27 @@ Output (JSON to stdout):
 }
 """
 
+import time
+_LOADED_AT = time.perf_counter()
+
 import json
 import os
 import sys
 from datetime import datetime
 from pathlib import Path
 
+if __package__:
+    from erirpg.hooks.global_state import update_state
+    from erirpg.hooks.modified_files import append_modified
+    from erirpg.hooks.timing import HookTimer
+else:
+    from global_state import update_state
+    from modified_files import append_modified
+    from timing import HookTimer
+
 # Log file for debugging
 LOG_FILE = "/tmp/erirpg-posttooluse.log"
 
-# Track modified files per project
-MODIFIED_FILES_STORE = "/tmp/erirpg-modified-files.json"
-
 
 def log(msg: str) -> None:
     """Append to log file."""
@@ -72,42 +83,20 @@ def find_project_root(file_path: str) -> str | None:
     return None
 
 
-def load_modified_files() -> dict:
-    """Load tracked modified files."""
-    try:
-        if os.path.exists(MODIFIED_FILES_STORE):
-            with open(MODIFIED_FILES_STORE, "r") as f:
-                return json.load(f)
-    except Exception:
-        pass
-    return {}
-
-
-def save_modified_files(data: dict) -> None:
-    """Save tracked modified files."""
-    try:
-        with open(MODIFIED_FILES_STORE, "w") as f:
-            json.dump(data, f, indent=2)
-    except Exception as e:
-        log(f"Failed to save modified files: {e}")
-
-
-def track_modified_file(file_path: str, project_path: str) -> None:
+def track_modified_file(
+    file_path: str,
+    project_path: str,
+    session_id: str = None,
+    timer: HookTimer = None,
+) -> None:
     """Track a file as modified for later commit."""
-    data = load_modified_files()
-
-    if project_path not in data:
-        data[project_path] = {
-            "files": [],
-            "started": datetime.now().isoformat(),
-        }
-
-    if file_path not in data[project_path]["files"]:
-        data[project_path]["files"].append(file_path)
-        data[project_path]["last_modified"] = datetime.now().isoformat()
+    if timer:
+        timer.phase("write")
+    try:
+        append_modified(project_path, session_id, file_path)
         log(f"Tracked: {file_path} in {project_path}")
-
-    save_modified_files(data)
+    except OSError as e:
+        log(f"Failed to track modified file: {e}")
 
     # Update active edited project in global state for statusline
     update_active_edited_project(project_path)
@@ -124,28 +113,21 @@ def update_active_edited_project(project_path: str) -> None:
     by the user switching projects. This prevents editing eri-rpg code from
     losing track of the real project (e.g., serenity_ui).
     """
-    state_path = Path.home() / ".eri-rpg" / "state.json"
     project_name = Path(project_path).name
 
     try:
-        state = {}
-        if state_path.exists():
-            state = json.loads(state_path.read_text())
-
-        # Always track what was just edited (for statusline)
-        state["active_edited_project"] = project_name
-        state["active_edited_at"] = datetime.now().isoformat()
-
-        # Always update target_project to the project being edited
-        # This ensures /clear recovery finds the right project
-        state["target_project"] = project_name
-        state["target_project_path"] = project_path
-
-        # Legacy fields for backwards compat (same as target now)
-        state["active_project"] = project_name
-        state["active_project_path"] = project_path
-
-        state_path.write_text(json.dumps(state, indent=2))
+        update_state({
+            # Always track what was just edited (for statusline)
+            "active_edited_project": project_name,
+            "active_edited_at": datetime.now().isoformat(),
+            # Always update target_project to the project being edited
+            # This ensures /clear recovery finds the right project
+            "target_project": project_name,
+            "target_project_path": project_path,
+            # Legacy fields for backwards compat (same as target now)
+            "active_project": project_name,
+            "active_project_path": project_path,
+        })
     except Exception as e:
         log(f"Failed to update active edited project: {e}")
 
@@ -209,7 +191,17 @@ def _auto_commit_no_verify(project_path: str) -> None:
 
 def main():
     """Process PostToolUse hook - track modified files."""
+    timer = HookTimer("posttooluse", _LOADED_AT)
+    try:
+        _run(timer)
+    finally:
+        timer.finish()
+
+
+def _run(timer: HookTimer):
+    """Track one tool call, timing each phase."""
     try:
+        timer.phase("input")
         input_data = json.loads(sys.stdin.read())
 
         tool_name = input_data.get("tool_name", "")
@@ -218,6 +210,7 @@ def main():
 
         # Project detection - early exit if not a tracked project
         # Tracks both EriRPG (.eri-rpg/) and coder workflow (.planning/) projects
+        timer.phase("project")
         project_root = None
         check = cwd
         while check != '/':
@@ -254,10 +247,12 @@ def main():
             return
 
         # Track the file
-        track_modified_file(file_path, project_path)
+        track_modified_file(file_path, project_path, input_data.get("session_id"), timer)
 
         # Run verification and auto-commit if passes
+        timer.phase("verify")
         run_verification_and_commit(project_path)
+        timer.phase(None)
 
         print(json.dumps({"continue": True}))
 
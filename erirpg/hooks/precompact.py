@@ -11,19 +11,34 @@ Additionally captures session context to SQLite for cross-session continuity:
 - Decisions made (from conversation)
 - Blockers encountered
 - Next actions queue
-- Files modified (from git)
+- Files modified (from the PostToolUse file-change log, git as fallback)
+
+Snapshots are incremental: .eri-rpg/precompact.json records what the
+last snapshot saved, the session row is saved in one SQLite transaction,
+and CONTEXT.md and the status files are regenerated only when the
+snapshot changed. The summary reports the delta since the last snapshot
+(changed files, new decisions, run progress).
 
 Outputs a summary that will be included in the compacted context.
 """
 
 import json
 import os
-import subprocess
 import sys
 import uuid
 from datetime import datetime
 from pathlib import Path
 
+if __package__:
+    from erirpg.hooks.gitrefs import run_git
+    from erirpg.hooks.modified_files import log_dir, read_modified
+else:
+    from gitrefs import run_git
+    from modified_files import log_dir, read_modified
+
+# Record of the last snapshot, in .eri-rpg/
+SNAPSHOT_FILE = "precompact.json"
+
 
 def log(msg: str):
     """Log to file for debugging."""
@@ -84,22 +99,73 @@ def get_quick_fix_state(project_path: str) -> dict:
 
 def get_git_modified_files(project_path: str) -> list:
     """Get list of modified files from git."""
-    try:
-        result = subprocess.run(
-            ["git", "diff", "--name-only", "HEAD"],
-            cwd=project_path,
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            files = result.stdout.strip().split("\n")
-            return [f for f in files if f]
-    except Exception as e:
-        log(f"Git error: {e}")
+    code, out, err = run_git(["diff", "--name-only", "HEAD"], project_path)
+    if code == 0:
+        return [f for f in out.strip().split("\n") if f]
+    log(f"Git error: {err.strip()}")
     return []
 
 
+def get_changed_files(project_path: str) -> list:
+    """Files modified in the project, relative to it.
+
+    Read from the file-change log kept by the PostToolUse hook, which
+    costs no git call; projects without a log fall back to git.
+    """
+    directory = log_dir(project_path)
+    if directory is None or not os.path.isdir(directory):
+        return get_git_modified_files(project_path)
+    files = []
+    for path in read_modified(project_path):
+        try:
+            files.append(os.path.relpath(path, project_path))
+        except ValueError:
+            files.append(path)
+    return files
+
+
+def load_snapshot(project_path: str) -> dict:
+    """What the previous snapshot saved ({} if none)."""
+    try:
+        with open(Path(project_path) / ".eri-rpg" / SNAPSHOT_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_snapshot(project_path: str, snapshot: dict) -> None:
+    """Record this snapshot for the next delta (atomic replace)."""
+    path = Path(project_path) / ".eri-rpg" / SNAPSHOT_FILE
+    tmp = path.with_name(f"{SNAPSHOT_FILE}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w") as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(tmp, path)
+    except OSError as e:
+        log(f"Failed to save snapshot: {e}")
+
+
+def describe_delta(previous: dict, current: dict, new_decisions: list) -> list:
+    """Summary lines for what changed since the previous snapshot."""
+    if not previous:
+        return []
+    lines = []
+    new_files = [f for f in current["files"] if f not in set(previous.get("files", []))]
+    if new_files:
+        shown = ", ".join(new_files[:5]) + (f" (+{len(new_files) - 5} more)" if len(new_files) > 5 else "")
+        lines.append(f"  Files changed: {shown}")
+    if new_decisions:
+        lines.append(f"  New decisions: {len(new_decisions)}")
+        for decision in new_decisions[-3:]:
+            lines.append(f"    - {decision[:60]}")
+    run, prev_run = current.get("run"), previous.get("run")
+    if run and prev_run and run["id"] == prev_run.get("id") and run["completed"] != prev_run.get("completed"):
+        lines.append(f"  Run progress: {prev_run.get('completed')} -> {run['completed']}/{run['total']} steps")
+    if lines:
+        lines.insert(0, f"Since last snapshot ({previous.get('at', '?')[:16]}):")
+    return lines
+
+
 def get_project_name(project_path: str) -> str:
     """Get project name from config or directory name."""
     config_path = Path(project_path) / ".eri-rpg" / "config.json"
@@ -145,26 +211,30 @@ def get_or_create_session_id(project_path: str) -> str:
     return session_id
 
 
-def save_session_to_sqlite(project_path: str, run_state: dict, quick_fix: dict) -> str:
-    """Save session context to SQLite database.
+def save_session_to_sqlite(project_path: str, run_state: dict, quick_fix: dict) -> tuple:
+    """Save session context to SQLite database, incrementally.
 
-    Returns the session ID.
+    Returns:
+        (session_id, delta summary lines)
     """
     try:
         # Import storage module
         from erirpg import storage
         from erirpg.generators.context_md import generate_context_md
+        from erirpg.status_sync import sync_from_session
 
         project_name = get_project_name(project_path)
         session_id = get_or_create_session_id(project_path)
 
-        # Check if session exists
-        existing = storage.get_session(session_id)
+        previous = load_snapshot(project_path)
+        if previous.get("session_id") != session_id:
+            previous = {}
 
         # Determine phase and step from run state
         phase = None
         step = None
         progress_pct = 0
+        run = None
 
         if run_state:
             plan = run_state.get("plan", {})
@@ -181,50 +251,61 @@ def save_session_to_sqlite(project_path: str, run_state: dict, quick_fix: dict)
 
             spec = run_state.get("spec", {})
             phase = spec.get("phase", "implementing")
+            run = {"id": run_state.get("id"), "completed": completed, "total": len(steps)}
         elif quick_fix:
             phase = "quick_fix"
             step = quick_fix.get("target_file", "unknown")
 
         # Get modified files
-        files_modified = get_git_modified_files(project_path)
-
-        if existing:
-            # Update existing session
-            storage.update_session(
-                session_id,
-                phase=phase,
-                step=step,
-                progress_pct=progress_pct,
-                files_modified=files_modified,
-            )
-            log(f"Updated session {session_id}")
-        else:
-            # Create new session
-            storage.create_session(
-                session_id=session_id,
-                project_name=project_name,
-                phase=phase,
-                step=step,
-            )
-            if files_modified:
-                storage.update_session(session_id, files_modified=files_modified)
-            log(f"Created session {session_id}")
-
-        # Generate CONTEXT.md
+        files_modified = get_changed_files(project_path)
+
+        # One connection, one transaction
+        saved = storage.save_session_snapshot(
+            session_id,
+            project_name,
+            phase=phase,
+            step=step,
+            progress_pct=progress_pct,
+            files_modified=files_modified,
+            since_decision_id=previous.get("last_decision_id", 0),
+        )
+        log(f"{'Created' if saved['created'] else 'Updated'} session {session_id}")
+
+        snapshot = {
+            "session_id": session_id,
+            "at": datetime.now().isoformat(),
+            "phase": phase,
+            "step": step,
+            "progress_pct": progress_pct,
+            "files": files_modified,
+            "run": run,
+            "last_decision_id": saved["last_decision_id"],
+            "fingerprint": saved["fingerprint"],
+        }
         context_path = Path(project_path) / ".eri-rpg" / "CONTEXT.md"
-        generate_context_md(project_name, session_id, str(context_path))
-        log(f"Generated CONTEXT.md")
+        unchanged = all(
+            previous.get(key) == snapshot[key]
+            for key in ("phase", "step", "progress_pct", "files", "run", "fingerprint")
+        )
+        if unchanged and context_path.exists():
+            log("Snapshot unchanged, CONTEXT.md kept")
+        else:
+            sync_from_session(session_id)
+            generate_context_md(project_name, session_id, str(context_path))
+            log(f"Generated CONTEXT.md")
 
-        return session_id
+        delta = describe_delta(previous, snapshot, saved["new_decisions"])
+        save_snapshot(project_path, snapshot)
+        return session_id, delta
 
     except ImportError as e:
         log(f"Import error (storage not available): {e}")
-        return None
+        return None, []
     except Exception as e:
         log(f"Failed to save session to SQLite: {e}")
         import traceback
         log(traceback.format_exc())
-        return None
+        return None, []
 
 
 def create_resume_file(project_path: str, run_state: dict, quick_fix: dict) -> str:
@@ -346,7 +427,7 @@ def main():
             log(f"Created resume file: {resume_path}")
 
         # Save session context to SQLite (new)
-        session_id = save_session_to_sqlite(project_path, run_state, quick_fix)
+        session_id, delta = save_session_to_sqlite(project_path, run_state, quick_fix)
         log(f"Session ID: {session_id}")
 
         # Output summary for compaction
@@ -368,6 +449,7 @@ def main():
 
         if session_id:
             summary_lines.append(f"Session: {session_id}")
+        summary_lines.extend(delta)
 
         if summary_lines:
             summary_lines.append("")
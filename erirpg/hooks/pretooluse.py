@@ -33,6 +33,9 @@ Or with explicit path (set ERIRPG_ROOT env var):
   "command": "ERIRPG_ROOT=/path/to/eri-rpg python3 ${ERIRPG_ROOT}/erirpg/hooks/pretooluse.py"
 """
 
+import time
+_LOADED_AT = time.perf_counter()
+
 import json
 import os
 import sys
@@ -40,6 +43,13 @@ import traceback
 from datetime import datetime
 from pathlib import Path
 
+if __package__:
+    from erirpg.hooks.active import active_state, get_enforcement_config
+    from erirpg.hooks.timing import HookTimer
+else:
+    from active import active_state, get_enforcement_config
+    from timing import HookTimer
+
 # Portable path resolution - use Path(__file__).parent
 HOOK_DIR = Path(__file__).parent.resolve()
 ERIRPG_ROOT = os.environ.get('ERIRPG_ROOT', str(HOOK_DIR.parent.parent))
@@ -55,125 +65,6 @@ def log(msg: str):
         import sys; print(f"[EriRPG] {e}", file=sys.stderr)  # Can't log, ignore
 
 
-def get_active_run_state(project_path: str) -> dict:
-    """Check for active EriRPG run in project."""
-    run_dir = Path(project_path) / ".eri-rpg" / "runs"
-    if not run_dir.exists():
-        return None
-
-    # Find most recent run
-    runs = list(run_dir.glob("*.json"))
-    if not runs:
-        return None
-
-    # Get latest by mtime
-    latest = max(runs, key=lambda p: p.stat().st_mtime)
-
-    try:
-        with open(latest) as f:
-            run_state = json.load(f)
-
-        # Check if run is still in progress
-        if run_state.get("completed_at") is None:
-            return run_state
-    except Exception as e:
-        import sys; print(f"[EriRPG] {e}", file=sys.stderr)
-
-    return None
-
-
-def get_preflight_state(project_path: str) -> dict:
-    """Check for active preflight state."""
-    preflight_file = Path(project_path) / ".eri-rpg" / "preflight_state.json"
-    if not preflight_file.exists():
-        return None
-
-    try:
-        with open(preflight_file) as f:
-            return json.load(f)
-    except Exception as e:
-        import sys; print(f"[EriRPG] {e}", file=sys.stderr); return None
-
-
-def get_quick_fix_state(project_path: str) -> dict:
-    """Check for active quick fix state."""
-    quick_fix_file = Path(project_path) / ".eri-rpg" / "quick_fix_state.json"
-    if not quick_fix_file.exists():
-        return None
-
-    try:
-        with open(quick_fix_file) as f:
-            return json.load(f)
-    except Exception as e:
-        import sys; print(f"[EriRPG] {e}", file=sys.stderr); return None
-
-
-def get_project_mode(project_path: str) -> str:
-    """Get the operational mode for a project.
-
-    Returns "bootstrap" (no enforcement) or "maintain" (full enforcement).
-    Handles migration: projects with learnings default to maintain.
-    """
-    config_file = Path(project_path) / ".eri-rpg" / "config.json"
-
-    if config_file.exists():
-        try:
-            with open(config_file) as f:
-                data = json.load(f)
-
-            # If mode is explicitly set, use it
-            if "mode" in data:
-                return data["mode"]
-
-        except (json.JSONDecodeError, KeyError):
-            pass
-
-    # Migration: check if project has learnings
-    knowledge_file = Path(project_path) / ".eri-rpg" / "knowledge.json"
-    if knowledge_file.exists():
-        try:
-            with open(knowledge_file) as f:
-                knowledge = json.load(f)
-
-            # Has learnings → assume stable project → maintain
-            if knowledge.get("learnings"):
-                return "maintain"
-        except (json.JSONDecodeError, KeyError):
-            pass
-
-    # Default for new/empty projects
-    return "bootstrap"
-
-
-def get_enforcement_config(project_path: str) -> dict:
-    """Get enforcement configuration for a project.
-
-    Returns dict with:
-    - fail_closed: bool - Block on errors instead of allowing (safer but stricter)
-    - block_bash_writes: bool - Block all Bash file writes
-
-    Defaults to fail-open and allowing Bash writes for backwards compatibility.
-    """
-    defaults = {"fail_closed": False, "block_bash_writes": False}
-
-    config_file = Path(project_path) / ".eri-rpg" / "config.json"
-
-    if config_file.exists():
-        try:
-            with open(config_file) as f:
-                data = json.load(f)
-
-            enforcement = data.get("enforcement", {})
-            return {
-                "fail_closed": enforcement.get("fail_closed", False),
-                "block_bash_writes": enforcement.get("block_bash_writes", False),
-            }
-        except (json.JSONDecodeError, KeyError):
-            pass
-
-    return defaults
-
-
 def detect_bash_file_write(command: str) -> str:
     """Detect if a Bash command writes to a file. Returns the file path or None."""
     import re
@@ -208,6 +99,15 @@ def detect_bash_file_write(command: str) -> str:
 
 def main():
     """Main hook entry point."""
+    timer = HookTimer("pretooluse", _LOADED_AT)
+    try:
+        _run(timer)
+    finally:
+        timer.finish()
+
+
+def _run(timer: HookTimer):
+    """Decide on one tool call, timing each phase."""
     # ONLY allow disabling via env var set BEFORE session starts
     # File-based disable removed - Claude could bypass enforcement by creating the file
     if os.environ.get("ERIRPG_HOOKS_DISABLED"):
@@ -218,6 +118,7 @@ def main():
     log("HOOK INVOKED")
     try:
         # Read input from Claude Code
+        timer.phase("input")
         raw_input = sys.stdin.read()
         log(f"Raw stdin: {raw_input[:500]}")
         input_data = json.loads(raw_input)
@@ -229,6 +130,7 @@ def main():
         log(f"tool_name={tool_name}, cwd={cwd}")
 
         # Project detection - check CWD for both .eri-rpg and .planning (coder)
+        timer.phase("project")
         project_root = None
         coder_root = None
         check = cwd
@@ -246,6 +148,7 @@ def main():
             print(json.dumps({}))
             sys.exit(0)
 
+        timer.phase("decision")
         # Track if this originated as a Bash command (for block_bash_writes check later)
         is_bash_write = False
 
@@ -316,6 +219,7 @@ def main():
 
         # Find project root from FILE PATH (not cwd!)
         # Look for .planning/ (coder workflow) or .eri-rpg/ (erirpg project)
+        timer.phase("project")
         project_path = None
         is_coder_project = False
         check_path = Path(file_path).parent
@@ -347,6 +251,7 @@ def main():
 
         # SECURITY: Resolve symlinks in project_path
         project_path = os.path.realpath(project_path)
+        timer.phase("decision")
 
         # ================================================================
         # CODER WORKFLOW - NO BLOCKING
@@ -361,7 +266,11 @@ def main():
         # ================================================================
         # ERI-RPG PROJECT - Check mode and enforcement
         # ================================================================
-        mode = get_project_mode(project_path)
+        # One small read of .eri-rpg/active.json (rebuilt if stale)
+        timer.phase("state")
+        active = active_state(project_path)
+        timer.phase("decision")
+        mode = active["mode"]
         log(f"Project mode: {mode}")
 
         if mode == "bootstrap":
@@ -370,7 +279,7 @@ def main():
             sys.exit(0)
 
         # Load enforcement config
-        enforcement = get_enforcement_config(project_path)
+        enforcement = active["enforcement"]
         log(f"Enforcement config: {enforcement}")
 
         # Check for block_bash_writes
@@ -386,7 +295,7 @@ def main():
 
         # Check for quick fix mode FIRST (lightweight mode, no full run required)
         log(f"Checking for quick fix in: {project_path}")
-        quick_fix = get_quick_fix_state(project_path)
+        quick_fix = active["quick_fix"]
         if quick_fix and quick_fix.get("quick_fix_active"):
             target_file = quick_fix.get("target_file", "")
             rel_path = os.path.relpath(file_path, project_path)
@@ -430,7 +339,7 @@ def main():
 
         # Check for active run
         log(f"Checking for active run in: {project_path}")
-        run_state = get_active_run_state(project_path)
+        run_state = active["run"]
         log(f"Run state: {run_state.get('id') if run_state else None}")
         if not run_state:
             # No active run - BLOCK with rich context
@@ -457,7 +366,7 @@ def main():
 
         # Check for preflight state
         log(f"Checking preflight state")
-        preflight = get_preflight_state(project_path)
+        preflight = active["preflight"]
         log(f"Preflight: ready={preflight.get('ready') if preflight else None}, targets={preflight.get('target_files') if preflight else None}")
         if not preflight or not preflight.get("ready"):
             # No preflight - BLOCK with rich context
@@ -10,15 +10,32 @@ Presents compact context summary from SQLite:
 - Last session phase/step/progress
 - Decision count and blocker status
 - Pending actions
+
+Context sources (git, SQLite, run files, planning files, todos) are
+gathered concurrently under one deadline (GATHER_BUDGET). Sources not
+done by then are reported as truncated and the rest is still shown,
+so a slow source can't make the hook hit its timeout. The new SQLite
+session is created on the main thread once the previous session's
+summary is in (or abandoned), so it always exists after the hook.
 """
 
 import json
 import os
 import sys
+import threading
+import time
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
 
+if __package__:
+    from erirpg.hooks.gitrefs import current_branch
+else:
+    from gitrefs import current_branch
+
+# Seconds to gather context sources in (the hook is installed with a 5s timeout)
+GATHER_BUDGET = 3.5
+
 
 def log(msg: str):
     """Log to file for debugging."""
@@ -257,17 +274,8 @@ def get_sqlite_context_summary(project_path: str) -> str:
 
 def get_git_branch(project_path: str) -> str:
     """Get current git branch name."""
-    import subprocess
     try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            cwd=project_path,
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
+        return current_branch(project_path)
     except Exception as e:
         log(f"Git branch error: {e}")
     return None
@@ -365,6 +373,72 @@ def start_new_sqlite_session(project_path: str) -> str:
         return None
 
 
+class Gatherer:
+    """Runs context sources concurrently and collects them by a deadline.
+
+    Each source runs in a daemon thread, so a source still running at the
+    deadline is abandoned without delaying the hook's exit.
+    """
+
+    def __init__(self, budget: float = None):
+        self.budget = GATHER_BUDGET if budget is None else budget
+        self.deadline = time.monotonic() + self.budget
+        self.status = {}  # section -> "complete" | "truncated"
+        self._threads = {}
+        self._results = {}
+
+    def submit(self, section: str, fn, *args) -> None:
+        """Start gathering a section."""
+        def run():
+            try:
+                self._results[section] = fn(*args)
+            except Exception as e:
+                log(f"Section {section} failed: {e}")
+                self._results[section] = None
+
+        thread = threading.Thread(target=run, name=f"sessionstart-{section}", daemon=True)
+        self._threads[section] = thread
+        thread.start()
+
+    def result(self, section: str, default=None):
+        """A section's result, waiting until the deadline at most."""
+        self._threads[section].join(max(0.0, self.deadline - time.monotonic()))
+        if section in self._results:
+            self.status[section] = "complete"
+            return self._results[section]
+        self.status[section] = "truncated"
+        return default
+
+    def truncated(self) -> list:
+        return [section for section, status in self.status.items() if status == "truncated"]
+
+
+def get_active_project_target(cwd: str) -> tuple:
+    """Active project plus the directory it should be worked on from.
+
+    Returns:
+        (project_name, project_path, target_dir, wrong_directory)
+    """
+    active_project, active_project_path = get_active_project_info()
+    log(f"Active project: {active_project}, path: {active_project_path}")
+
+    # Track if we're in a different directory than active project
+    wrong_directory = False
+    target_dir = None
+    if active_project and active_project_path and os.path.isdir(active_project_path):
+        target_dir = find_planning_directory(active_project_path)
+        log(f"Target dir: {target_dir}, current: {cwd}")
+        if os.path.realpath(target_dir) != os.path.realpath(cwd):
+            wrong_directory = True
+    return active_project, active_project_path, target_dir, wrong_directory
+
+
+def get_todo_summary() -> str:
+    """Personal todos summary."""
+    from erirpg.todos import get_session_summary
+    return get_session_summary()
+
+
 def main():
     """Main hook entry point."""
     log("=" * 50)
@@ -378,19 +452,6 @@ def main():
         input_data = json.loads(raw_input) if raw_input.strip() else {}
         cwd = input_data.get("cwd", os.getcwd())
 
-        # === CHECK ACTIVE PROJECT (advisory only) ===
-        active_project, active_project_path = get_active_project_info()
-        log(f"Active project: {active_project}, path: {active_project_path}")
-
-        # Track if we're in a different directory than active project
-        wrong_directory = False
-        target_dir = None
-        if active_project and active_project_path and os.path.isdir(active_project_path):
-            target_dir = find_planning_directory(active_project_path)
-            log(f"Target dir: {target_dir}, current: {cwd}")
-            if os.path.realpath(target_dir) != os.path.realpath(cwd):
-                wrong_directory = True
-
         # Project detection - early exit if not an eri-rpg project
         project_root = None
         check = cwd
@@ -406,18 +467,39 @@ def main():
             print(json.dumps({}))
             sys.exit(0)
 
+        # Find project roots
+        project_roots = find_project_roots(cwd)
+        log(f"Project roots: {project_roots}")
+
+        # Start every source at once; results are consumed in display order
+        gather = Gatherer()
+        gather.submit("active project", get_active_project_target, cwd)
+        gather.submit("CLAUDE.md", get_claude_md_refs, cwd)
+        gather.submit("planning", get_planning_state, cwd)
+        for project_path in project_roots:
+            gather.submit(f"session:{project_path}", get_sqlite_context_summary, project_path)
+            gather.submit(f"resume file:{project_path}", get_resume_file, project_path)
+            gather.submit(f"runs:{project_path}", get_incomplete_runs, project_path)
+            gather.submit(f"quick fix:{project_path}", get_quick_fix_state, project_path)
+        gather.submit("todos", get_todo_summary)
+
+        # === CHECK ACTIVE PROJECT (advisory only) ===
+        active_project, active_project_path, target_dir, wrong_directory = gather.result(
+            "active project"
+        ) or (None, None, None, False)
+
         messages = []
         context_found = False
 
         # === CONTEXT RECOVERY (runs first) ===
         # Check for CLAUDE.md references
-        claude_refs = get_claude_md_refs(cwd)
+        claude_refs = gather.result("CLAUDE.md", [])
         if claude_refs:
             context_found = True
             log(f"CLAUDE.md refs: {claude_refs}")
 
         # Check for .planning/ state (coder workflow)
-        planning_state = get_planning_state(cwd)
+        planning_state = gather.result("planning")
         if planning_state:
             context_found = True
             if planning_state.get("active_phase"):
@@ -428,25 +510,23 @@ def main():
             elif planning_state.get("has_roadmap"):
                 messages.append(f"[CONTEXT RECOVERY] Project has ROADMAP.md - check .planning/ROADMAP.md for status")
 
-        # Find project roots
-        project_roots = find_project_roots(cwd)
-        log(f"Project roots: {project_roots}")
-
         for project_path in project_roots:
             context_found = True  # EriRPG project found
 
             # Get SQLite context summary (new - takes priority)
-            sqlite_summary = get_sqlite_context_summary(project_path)
+            sqlite_summary = gather.result(f"session:{project_path}")
             if sqlite_summary:
                 messages.append(sqlite_summary)
 
-            # Start a new session for tracking
+            # Start the new session for tracking only now: the summary must
+            # describe the previous one, and this must run even if the
+            # summary was abandoned at the deadline
             session_id = start_new_sqlite_session(project_path)
             if session_id:
                 log(f"Started session: {session_id}")
 
             # Check for resume file (from previous compaction)
-            resume_content = get_resume_file(project_path)
+            resume_content = gather.result(f"resume file:{project_path}")
             if resume_content:
                 # Only show if no SQLite summary (avoid duplication)
                 if not sqlite_summary:
@@ -459,7 +539,7 @@ def main():
                     pass  # Error logged elsewhere
 
             # Check for incomplete runs
-            incomplete = get_incomplete_runs(project_path)
+            incomplete = gather.result(f"runs:{project_path}", [])
             if incomplete:
                 recent = [r for r in incomplete if r["age_days"] < 7]
                 stale = [r for r in incomplete if r["age_days"] >= 7]
@@ -477,20 +557,23 @@ def main():
                     messages.append(f"EriRPG: {len(stale)} stale run(s) - consider /eri:cleanup")
 
             # Check for active quick fix
-            quick_fix = get_quick_fix_state(project_path)
+            quick_fix = gather.result(f"quick fix:{project_path}")
             if quick_fix and quick_fix.get("quick_fix_active"):
                 messages.append(f"EriRPG: Quick fix active on {quick_fix.get('target_file')}")
                 messages.append("Complete: eri-rpg quick-done or cancel: eri-rpg quick-cancel")
 
         # Add personal todos summary
-        try:
-            from erirpg.todos import get_session_summary
-            todo_summary = get_session_summary()
-            if todo_summary:
-                messages.append("")
-                messages.append(todo_summary)
-        except Exception as e:
-            log(f"Todo summary error: {e}")
+        todo_summary = gather.result("todos")
+        if todo_summary:
+            messages.append("")
+            messages.append(todo_summary)
+
+        log(f"Sections: {gather.status}")
+        truncated = gather.truncated()
+        if truncated:
+            sections = ", ".join(section.split(":")[0] for section in truncated)
+            messages.append("")
+            messages.append(f"[truncated] Not gathered within {gather.budget:g}s: {sections}")
 
         # Build final output
         if context_found or messages:
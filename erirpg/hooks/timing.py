@@ -0,0 +1,158 @@
+"""
+Per-phase latency timing for EriRPG hooks.
+
+Each hook invocation records how long it spent in each phase (module
+imports, reading input, finding the project, loading state, deciding,
+writing) as one compact JSON line. `eri-rpg hooks stats` summarizes the
+records as p50/p95/p99 per hook and phase, next to the hook's timeout.
+
+Standard library only, so hooks can use it without importing erirpg.
+
+Storage structure:
+    ~/.eri-rpg/
+    ├── hook-timings.jsonl     # {"hook", "at", "ms": {phase: ms}, "total"}
+    └── hook-timings.jsonl.1   # previous file, rotated at MAX_TIMINGS_BYTES
+
+Nothing is written unless ~/.eri-rpg/ already exists.
+
+Usage (in a hook):
+    _LOADED_AT = time.perf_counter()   # first statement of the module
+    ...
+    timer = HookTimer("pretooluse", _LOADED_AT)
+    timer.phase("input")
+    ...
+    timer.phase("state")
+    ...
+    timer.finish()
+"""
+
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+TIMINGS_FILE = os.path.join(os.path.expanduser("~"), ".eri-rpg", "hook-timings.jsonl")
+
+# Rotate the timings file past this size (one previous file is kept)
+MAX_TIMINGS_BYTES = 1 << 20
+
+# Timeouts the hooks are installed with (seconds)
+HOOK_TIMEOUTS = {
+    "pretooluse": 5,
+    "posttooluse": 10,
+    "persona_detect": 2,
+    "precompact": 10,
+    "sessionstart": 5,
+}
+
+PERCENTILES = (50, 95, 99)
+
+# Modules whose import time was already recorded (by load timestamp)
+_imports_recorded = set()
+
+
+class HookTimer:
+    """Accumulates per-phase durations of one hook invocation."""
+
+    def __init__(self, hook: str, loaded_at: Optional[float] = None, path: Optional[str] = None):
+        self.hook = hook
+        self.path = path
+        self.ms: Dict[str, float] = {}
+        self._start = time.perf_counter()
+        self._phase: Optional[str] = None
+        self._phase_start = self._start
+        # Import time counts once per module load (a resident daemon
+        # imports hooks once and then serves many calls)
+        if loaded_at is not None and (hook, loaded_at) not in _imports_recorded:
+            _imports_recorded.add((hook, loaded_at))
+            self.ms["imports"] = (self._start - loaded_at) * 1000
+
+    def phase(self, name: Optional[str]) -> None:
+        """End the current phase and start another (None to stop timing)."""
+        now = time.perf_counter()
+        if self._phase is not None:
+            self.ms[self._phase] = self.ms.get(self._phase, 0.0) + (now - self._phase_start) * 1000
+        self._phase = name
+        self._phase_start = now
+
+    def finish(self) -> None:
+        """End timing and append the record to the timings file."""
+        self.phase(None)
+        total = (time.perf_counter() - self._start) * 1000 + self.ms.get("imports", 0.0)
+        record = {
+            "hook": self.hook,
+            "at": round(time.time(), 3),
+            "ms": {k: round(v, 3) for k, v in self.ms.items()},
+            "total": round(total, 3),
+        }
+        append_record(record, self.path)
+
+
+def append_record(record: dict, path: Optional[str] = None) -> None:
+    """Append one timing record, rotating the file when it grows too big."""
+    path = path or TIMINGS_FILE
+    if not os.path.isdir(os.path.dirname(path)):
+        return
+    try:
+        with open(path, "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+            size = f.tell()
+        if size > MAX_TIMINGS_BYTES:
+            os.replace(path, path + ".1")
+    except OSError:
+        pass  # Timing must never break a hook
+
+
+def load_records(path: Optional[str] = None) -> List[dict]:
+    """Read timing records, oldest first (rotated file included)."""
+    path = path or TIMINGS_FILE
+    records = []
+    for name in (path + ".1", path):
+        try:
+            with open(name, "r") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue  # Torn write
+        except OSError:
+            continue
+    return records
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of values (0.0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(records: List[dict]) -> Dict[str, Dict[str, dict]]:
+    """Latency percentiles per hook and phase.
+
+    Returns:
+        Dict of hook -> phase -> {"n", "p50", "p95", "p99"}; the
+        "total" phase covers whole invocations
+    """
+    samples: Dict[str, Dict[str, List[float]]] = {}
+    for record in records:
+        hook = record.get("hook")
+        if not hook:
+            continue
+        phases = samples.setdefault(hook, {})
+        for name, ms in record.get("ms", {}).items():
+            phases.setdefault(name, []).append(ms)
+        if "total" in record:
+            phases.setdefault("total", []).append(record["total"])
+
+    summary: Dict[str, Dict[str, dict]] = {}
+    for hook, phases in samples.items():
+        summary[hook] = {}
+        for name, values in phases.items():
+            stats = {"n": len(values)}
+            for pct in PERCENTILES:
+                stats[f"p{pct}"] = round(percentile(values, pct), 2)
+            summary[hook][name] = stats
+    return summary
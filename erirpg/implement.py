@@ -17,7 +17,9 @@ from typing import Dict, List, Optional, Any
 
 from erirpg.analyze import load_patterns, ProjectPatterns
 from erirpg.memory import KnowledgeStore, load_knowledge
-from erirpg.graph import load_graph
+
+# Seconds allowed for all Drift calls made while enriching a plan
+DRIFT_PLAN_BUDGET = 10.0
 
 
 @dataclass
@@ -476,7 +478,7 @@ def _enrich_with_drift_impact(
         Enriched ImplementationPlan
     """
     try:
-        from erirpg.drift_bridge import DriftBridge
+        from erirpg.drift_bridge import DriftBridge, DriftScheduler
     except ImportError:
         return plan
 
@@ -484,17 +486,26 @@ def _enrich_with_drift_impact(
     if not bridge.is_available():
         return plan
 
+    # Skip test files for impact analysis
+    checked = [fp for fp in plan.file_plan if "test" not in fp.path.lower()]
+
+    # Query Drift for all files concurrently, within a fixed budget
+    calls = {}
+    for fp in checked:
+        calls[("impact", fp.path)] = lambda p=fp.path: bridge.impact_analysis_async(p)
+        calls[("outliers", fp.path)] = lambda p=fp.path: bridge.find_outliers_async(p)
+    scheduler = DriftScheduler(budget=DRIFT_PLAN_BUDGET)
+    results = scheduler.run(calls)
+
     # Track all affected files to detect overlap
     all_affected: Dict[str, List[str]] = {}
 
-    for file_plan in plan.file_plan:
-        # Skip test files for impact analysis
-        if "test" in file_plan.path.lower():
+    for file_plan in checked:
+        impact = results[("impact", file_plan.path)]
+        if impact is None:
+            file_plan.notes.append("Drift impact analysis timed out")
             continue
 
-        # Get impact analysis for this file
-        impact = bridge.impact_analysis(file_plan.path)
-
         # Set risk level
         file_plan.risk = impact.risk_level
 
@@ -518,7 +529,7 @@ def _enrich_with_drift_impact(
             )
 
         # Check for existing outliers in this file
-        outliers = bridge.find_outliers(file_plan.path)
+        outliers = results[("outliers", file_plan.path)]
         if outliers:
             file_plan.notes.append(
                 f"File has {len(outliers)} existing outliers - consider fixing"
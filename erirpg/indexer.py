@@ -31,6 +31,7 @@ from erirpg.parsers.mojo import (
 )
 from erirpg.parsers import get_parser_for_file, detect_language
 from erirpg.registry import Project
+from erirpg.tfidf import build_module_index
 
 
 # Standard library modules to ignore as external deps
@@ -243,6 +244,9 @@ def index_project(project: Project, verbose: bool = False) -> Graph:
     # Also save to JSON for backward compatibility
     graph.save(project.graph_path)
 
+    # Precompute the module search index next to the graph
+    build_module_index(graph, project.graph_path)
+
     if verbose:
         stats = graph.stats()
         print(f"Indexed: {stats['modules']} modules, {stats['edges']} edges, "
@@ -68,7 +68,7 @@ def install_claude_code(verbose: bool = True) -> bool:
             "matcher": "Edit|Write|MultiEdit|Bash",
             "hooks": [{
                 "type": "command",
-                "command": f"python3 {erirpg_root}/erirpg/hooks/pretooluse.py",
+                "command": f"python3 {erirpg_root}/erirpg/hooks/client.py pretooluse",
                 "timeout": 5
             }]
         }],
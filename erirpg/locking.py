@@ -0,0 +1,193 @@
+"""
+Cross-process locking and merging for EriRPG state files.
+
+Parallel agents, hooks and CLI invocations all load-modify-save the same
+JSON files (knowledge.json, state.json). This module provides:
+
+- file_lock(): an fcntl advisory lock on a sidecar "<file>.lock" with a
+  timeout. Re-entrant within a thread. On platforms without fcntl the
+  lock is a no-op.
+- merge_fields() / merge_records(): three-way merges used when a writer's
+  base version is stale, so concurrent updates to different fields or
+  records are combined instead of the last writer winning. On a true
+  conflict (both sides changed the same field/record) the writer's own
+  version wins.
+
+Usage:
+    with file_lock(path):
+        current = read_json(path)
+        data = merge_fields(base, ours, current)
+        atomic_write_json(path, data)
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_LOCK_TIMEOUT = 10.0
+
+_local = threading.local()
+
+
+class LockTimeout(TimeoutError):
+    """Raised when a file lock can't be acquired in time."""
+
+
+def _held() -> Dict[str, list]:
+    held = getattr(_local, "held", None)
+    if held is None:
+        held = _local.held = {}
+    return held
+
+
+@contextmanager
+def file_lock(path: str, timeout: float = DEFAULT_LOCK_TIMEOUT) -> Iterator[None]:
+    """Hold an exclusive advisory lock for a file.
+
+    The lock lives on "<path>.lock" so the data file itself can be
+    replaced atomically while locked.
+
+    Args:
+        path: File being protected
+        timeout: Seconds to wait before raising LockTimeout
+
+    Raises:
+        LockTimeout: If another process holds the lock past the timeout
+    """
+    lock_path = os.path.abspath(path) + ".lock"
+    held = _held()
+    if lock_path in held:
+        held[lock_path][1] += 1
+        try:
+            yield
+        finally:
+            held[lock_path][1] -= 1
+        return
+
+    if fcntl is None:
+        yield
+        return
+
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    deadline = time.monotonic() + timeout
+    delay = 0.005
+    try:
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise LockTimeout(f"Timed out after {timeout}s waiting for {lock_path}")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.1)
+
+        held[lock_path] = [fd, 1]
+        try:
+            yield
+        finally:
+            del held[lock_path]
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def read_json(path: str) -> Optional[Any]:
+    """Read a JSON file, or None if missing or unreadable."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def atomic_write_json(path: str, data: Any, indent: Optional[int] = 2) -> None:
+    """Write JSON via a temp file and rename, so readers never see a partial file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp, path)
+
+
+_MISSING = object()
+
+
+def merge_fields(base: Any, ours: Any, theirs: Any) -> Any:
+    """Three-way merge of JSON-like values.
+
+    - Unchanged on one side: take the other side's value.
+    - Dicts changed on both sides: merge key by key.
+    - Lists changed on both sides: ours, plus items theirs added.
+    - Anything else changed on both sides: ours wins.
+    """
+    if ours == base:
+        return theirs
+    if theirs == base or theirs == ours:
+        return ours
+
+    if isinstance(ours, dict) and isinstance(theirs, dict):
+        base_d = base if isinstance(base, dict) else {}
+        merged = {}
+        for key in list(ours) + [k for k in theirs if k not in ours]:
+            value = merge_fields(
+                base_d.get(key, _MISSING),
+                ours.get(key, _MISSING),
+                theirs.get(key, _MISSING),
+            )
+            if value is not _MISSING:
+                merged[key] = value
+        return merged
+
+    if isinstance(ours, list) and isinstance(theirs, list):
+        base_l = base if isinstance(base, list) else []
+        return ours + [x for x in theirs if x not in ours and x not in base_l]
+
+    return ours
+
+
+def merge_records(
+    base: Dict[Hashable, Any],
+    ours: Dict[Hashable, Any],
+    theirs: Dict[Hashable, Any],
+) -> Dict[Hashable, Any]:
+    """Three-way merge of keyed records (record-level, not field-level).
+
+    A record changed or deleted on only one side keeps that change. A
+    record changed on both sides keeps ours.
+
+    Returns:
+        Merged records, in ours' order followed by records only theirs has
+    """
+    merged = {}
+    for key in list(ours) + [k for k in theirs if k not in ours]:
+        b = base.get(key, _MISSING)
+        o = ours.get(key, _MISSING)
+        t = theirs.get(key, _MISSING)
+        value = t if o == b else o
+        if value is not _MISSING:
+            merged[key] = value
+    return merged
+
+
+def merge_record_lists(
+    base: List[dict],
+    ours: List[dict],
+    theirs: List[dict],
+    key: Callable[[dict], Hashable],
+) -> List[dict]:
+    """merge_records for lists of dicts identified by key(record)."""
+    return list(merge_records(
+        {key(r): r for r in base},
+        {key(r): r for r in ours},
+        {key(r): r for r in theirs},
+    ).values())
@@ -12,22 +12,39 @@ Key design principles:
 
 Storage structure:
     .eri-rpg/
-    ├── graph.json       # Structural index (rebuildable)
-    ├── knowledge.json   # Semantic memory (PRESERVED)
-    └── runs/            # Execution history (in knowledge.json)
+    ├── graph.json                # Structural index (rebuildable)
+    ├── knowledge.json            # Semantic memory (PRESERVED)
+    ├── knowledge.journal.jsonl   # Appended mutations since last snapshot
+    ├── blobs/                    # Snapshot file contents (content-addressed)
+    ├── search-index.json         # BM25 index over learnings (rebuildable)
+    └── runs/                     # Execution history (in knowledge.json)
+
+Mutations made through add_learning, add_decision, add_run and
+record_enrichment are journaled. flush_knowledge() appends them to the
+journal instead of rewriting knowledge.json; load replays the journal on
+top of the snapshot, and a full save (or compaction) folds it back in.
 """
 
+import copy
 import hashlib
 import json
 import os
-import subprocess
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from erirpg.blobs import BlobStore
+from erirpg.hooks.gitrefs import head_commit
+from erirpg.locking import atomic_write_json, file_lock, merge_record_lists, merge_records
 from erirpg.refs import CodeRef
 
+# Journal is folded into knowledge.json once it grows past this size
+JOURNAL_COMPACT_BYTES = 1024 * 1024
+
+# Seconds allowed for all Drift calls made by enrich_learnings_batch
+DRIFT_ENRICH_BUDGET = 30.0
+
 # ============================================================================
 # Helper Functions
 # ============================================================================
@@ -54,18 +71,8 @@ def read_file_content(path: str) -> str:
 
 def git_head() -> Optional[str]:
     """Get current git HEAD commit (first 12 chars)."""
-    try:
-        result = subprocess.run(
-            ['git', 'rev-parse', 'HEAD'],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()[:12]
-    except Exception as e:
-        import sys; print(f"[EriRPG] {e}", file=sys.stderr)
-    return None
+    commit = head_commit(os.getcwd())
+    return commit[:12] if commit else None
 
 
 def in_git_repo() -> bool:
@@ -99,7 +106,8 @@ class LearningVersion:
 
     # File state at snapshot time
     files_hashes: Dict[str, str] = field(default_factory=dict)  # path -> content hash
-    files_content: Optional[Dict[str, str]] = None  # path -> content (for small files)
+    files_content: Optional[Dict[str, str]] = None  # path -> content (legacy inline snapshots)
+    files_blobs: Dict[str, str] = field(default_factory=dict)  # path -> blob digest
 
     # Git info (if available)
     commit_before: Optional[str] = None
@@ -119,9 +127,11 @@ class LearningVersion:
             "commit_before": self.commit_before,
             "commit_after": self.commit_after,
         }
-        # Only include files_content if present and non-empty
+        # Only include file content references if present and non-empty
         if self.files_content:
             d["files_content"] = self.files_content
+        if self.files_blobs:
+            d["files_blobs"] = self.files_blobs
         return d
 
     @classmethod
@@ -137,10 +147,125 @@ class LearningVersion:
             change_description=d.get("change_description", ""),
             files_hashes=d.get("files_hashes", {}),
             files_content=d.get("files_content"),
+            files_blobs=d.get("files_blobs", {}),
             commit_before=d.get("commit_before"),
             commit_after=d.get("commit_after"),
         )
 
+    def has_content(self) -> bool:
+        """Check if this version stored any file content."""
+        return bool(self.files_content or self.files_blobs)
+
+    def content_paths(self) -> List[str]:
+        """Paths of files whose content was stored."""
+        paths = list(self.files_content or {})
+        paths.extend(p for p in self.files_blobs if p not in paths)
+        return paths
+
+    def load_files_content(self, project_path: str) -> Dict[str, Optional[str]]:
+        """Resolve stored file contents, reading blobs through the blob store.
+
+        Returns:
+            Dict of path -> content (None if the blob is missing)
+        """
+        contents: Dict[str, Optional[str]] = dict(self.files_content or {})
+        if self.files_blobs:
+            blobs = BlobStore(project_path)
+            for path, digest in self.files_blobs.items():
+                if path not in contents:
+                    contents[path] = blobs.get(digest)
+        return contents
+
+
+# Fields that are stored only when they differ from the previous version
+VERSION_DELTA_FIELDS = (
+    "summary", "purpose", "key_functions", "gotchas", "files_hashes", "files_blobs",
+)
+_DELTA_DEFAULTS = {
+    "summary": "",
+    "purpose": "",
+    "key_functions": {},
+    "gotchas": [],
+    "files_hashes": {},
+    "files_blobs": {},
+}
+
+
+def encode_version_deltas(versions: List[LearningVersion]) -> List[dict]:
+    """Serialize a version history as deltas.
+
+    The first version is stored in full. Each later version carries its
+    own metadata plus only the snapshot fields that changed since the
+    previous version, marked with "delta": True.
+    """
+    encoded = []
+    prev = None
+    for v in versions:
+        d = v.to_dict()
+        full = {name: d.get(name, _DELTA_DEFAULTS[name]) for name in VERSION_DELTA_FIELDS}
+        if prev is not None:
+            for name in VERSION_DELTA_FIELDS:
+                if full[name] == prev[name]:
+                    d.pop(name, None)
+                else:
+                    d[name] = full[name]
+            d["delta"] = True
+        encoded.append(d)
+        prev = full
+    return encoded
+
+
+def decode_version_deltas(entries: List[dict]) -> List[LearningVersion]:
+    """Rebuild full versions by replaying deltas onto the previous version.
+
+    Entries without a "delta" marker (older knowledge.json files) are
+    treated as full versions.
+    """
+    versions = []
+    prev: dict = {}
+    for entry in entries:
+        if entry.get("delta"):
+            # Copy containers so versions never share mutable state
+            full = {name: copy.copy(prev.get(name, _DELTA_DEFAULTS[name])) for name in VERSION_DELTA_FIELDS}
+            full.update(entry)
+        else:
+            full = entry
+        versions.append(LearningVersion.from_dict(full))
+        prev = full
+    return versions
+
+
+@dataclass
+class VersionRetention:
+    """Which learning versions survive a save.
+
+    A version is kept if it is among the last `keep_last`, is the newest
+    version of one of the last `keep_daily` days or `keep_weekly` ISO
+    weeks that have versions, or is the learning's current version.
+    """
+    keep_last: int = 20
+    keep_daily: int = 7
+    keep_weekly: int = 8
+
+    def select(self, versions: List[LearningVersion], current_version: int = 0) -> List[LearningVersion]:
+        """Return the versions to keep, in their original order."""
+        if len(versions) <= self.keep_last:
+            return list(versions)
+
+        keep = {id(v) for v in versions[-self.keep_last:]} if self.keep_last > 0 else set()
+
+        daily: Dict[object, LearningVersion] = {}
+        weekly: Dict[object, LearningVersion] = {}
+        for v in versions:
+            daily[v.timestamp.date()] = v
+            weekly[tuple(v.timestamp.isocalendar()[:2])] = v
+        for bucket, limit in ((daily, self.keep_daily), (weekly, self.keep_weekly)):
+            if limit > 0:
+                for key in sorted(bucket)[-limit:]:
+                    keep.add(id(bucket[key]))
+
+        return [v for v in versions if id(v) in keep or v.version == current_version]
+
 
 @dataclass
 class RollbackResult:
@@ -357,15 +482,15 @@ class StoredLearning:
             if os.path.exists(full_path):
                 version.files_hashes[f] = hash_file(full_path)
 
-        # Store content for small files
+        # Store content for small files in the blob store
         if store_content:
-            version.files_content = {}
+            blobs = BlobStore(project_path)
             for f in files:
                 full_path = os.path.join(project_path, f) if project_path else f
                 if os.path.exists(full_path):
                     content = read_file_content(full_path)
                     if content.count('\n') <= max_content_lines:
-                        version.files_content[f] = content
+                        version.files_blobs[f] = blobs.put(content)
 
         self.versions.append(version)
         return version
@@ -460,7 +585,7 @@ class StoredLearning:
         )
 
         # Check if we have file content to restore
-        if not old.files_content:
+        if not old.has_content():
             result.success = False
             result.error = (
                 f"Version {target_version} has no stored file content. "
@@ -469,9 +594,18 @@ class StoredLearning:
             return result
 
         # Restore files
-        for file_path, content in old.files_content.items():
+        for file_path, content in old.load_files_content(project_path).items():
             full_path = os.path.join(project_path, file_path)
 
+            if content is None:
+                result.files_restored.append({
+                    "path": file_path,
+                    "action": "failed",
+                    "error": f"Snapshot blob missing: {old.files_blobs.get(file_path, '')[:12]}",
+                })
+                result.files_failed.append(file_path)
+                continue
+
             # Check current state
             current_content = None
             if os.path.exists(full_path):
@@ -535,7 +669,7 @@ class StoredLearning:
         # Find the version by its version number
         for v in self.versions:
             if v.version == target_version:
-                return bool(v.files_content)
+                return v.has_content()
 
         return False
 
@@ -546,6 +680,18 @@ class StoredLearning:
                 return v
         return None
 
+    def prune_versions(self, retention: "VersionRetention") -> int:
+        """Drop versions the retention policy does not keep.
+
+        Returns:
+            Number of versions removed
+        """
+        kept = retention.select(self.versions, self.current_version)
+        removed = len(self.versions) - len(kept)
+        if removed:
+            self.versions = kept
+        return removed
+
     def history_summary(self) -> str:
         """Get a summary of version history."""
         if not self.versions:
@@ -711,9 +857,9 @@ class StoredLearning:
         }
         if self.source_ref:
             d["source_ref"] = self.source_ref.to_dict()
-        # Include versions if any exist
+        # Include versions if any exist (delta-encoded)
         if self.versions:
-            d["versions"] = [v.to_dict() for v in self.versions]
+            d["versions"] = encode_version_deltas(self.versions)
         return d
 
     @classmethod
@@ -725,7 +871,7 @@ class StoredLearning:
         # Load versions if present
         versions = []
         if "versions" in d:
-            versions = [LearningVersion.from_dict(v) for v in d["versions"]]
+            versions = decode_version_deltas(d["versions"])
 
         return cls(
             module_path=d["module_path"],
@@ -1360,11 +1506,23 @@ class KnowledgeStore:
     user_decisions: List["Decision"] = field(default_factory=list)  # Decision logging
     deferred_ideas: List["DeferredIdea"] = field(default_factory=list)  # Deferred ideas
 
+    # Version history retention, applied on save
+    retention: VersionRetention = field(default_factory=VersionRetention, repr=False, compare=False)
+
+    # Journal and base-version bookkeeping (not persisted)
+    _journal: List[dict] = field(default_factory=list, repr=False, compare=False)
+    _base_files: Optional[tuple] = field(default=None, repr=False, compare=False)
+    _base_stamp: Optional[str] = field(default=None, repr=False, compare=False)
+    _path: Optional[str] = field(default=None, repr=False, compare=False)
+    # Set by changes the journal doesn't record (the search index must resync)
+    _index_stale: bool = field(default=False, repr=False, compare=False)
+
     # CRUD for learnings
 
     def add_learning(self, learning: StoredLearning) -> None:
         """Add or update a learning."""
         self.learnings[learning.module_path] = learning
+        self._journal.append({"op": "add_learning", "learning": learning.to_dict()})
 
     def get_learning(self, module_path: str) -> Optional[StoredLearning]:
         """Get learning for a module path."""
@@ -1378,6 +1536,7 @@ class KnowledgeStore:
         """Remove a learning. Returns True if it existed."""
         if module_path in self.learnings:
             del self.learnings[module_path]
+            self._index_stale = True
             return True
         return False
 
@@ -1390,6 +1549,7 @@ class KnowledgeStore:
     def add_decision(self, decision: StoredDecision) -> None:
         """Add a decision."""
         self.decisions.append(decision)
+        self._journal.append({"op": "add_decision", "decision": decision.to_dict()})
 
     def get_decisions_for_module(self, module_path: str) -> List[StoredDecision]:
         """Get all decisions affecting a module."""
@@ -1446,13 +1606,54 @@ class KnowledgeStore:
     def add_run(self, run: RunRecord) -> None:
         """Add a run record."""
         self.runs.append(run)
+        self._journal.append({"op": "add_run", "run": run.to_dict()})
 
     def get_recent_runs(self, limit: int = 10) -> List[RunRecord]:
         """Get most recent run records."""
         return sorted(self.runs, key=lambda r: r.timestamp, reverse=True)[:limit]
 
+    def record_enrichment(self, module_path: str) -> None:
+        """Journal the Drift enrichment fields of a learning.
+
+        Call after enrich_with_drift() (or equivalent in-place updates) so
+        the enrichment survives a flush without re-journaling the whole
+        learning.
+        """
+        learning = self.learnings.get(module_path)
+        if learning is None:
+            return
+        self._journal.append({
+            "op": "enrich",
+            "module_path": module_path,
+            "drift_pattern_id": learning.drift_pattern_id,
+            "drift_confidence": learning.drift_confidence,
+            "is_outlier": learning.is_outlier,
+            "outlier_reason": learning.outlier_reason,
+            "validated_by_drift": learning.validated_by_drift,
+        })
+
     # Staleness detection
 
+    def check_staleness(
+        self,
+        project_path: str,
+        module_paths: Optional[List[str]] = None,
+    ) -> Dict[str, bool]:
+        """Check staleness of many learnings in one batch.
+
+        Args:
+            project_path: Root path of the project
+            module_paths: Learnings to check (default: all)
+
+        Returns:
+            Dict of module_path -> True if stale
+        """
+        from erirpg.staleness import get_staleness_service
+
+        paths = self.learnings.keys() if module_paths is None else module_paths
+        refs = {p: self.learnings[p].source_ref for p in paths if p in self.learnings}
+        return get_staleness_service(project_path).check_refs(refs)
+
     def get_stale_learnings(self, project_path: str) -> List[str]:
         """Find all learnings whose source files have changed.
 
@@ -1462,11 +1663,7 @@ class KnowledgeStore:
         Returns:
             List of module paths with stale learnings
         """
-        stale = []
-        for module_path, learning in self.learnings.items():
-            if learning.is_stale(project_path):
-                stale.append(module_path)
-        return stale
+        return [p for p, stale in self.check_staleness(project_path).items() if stale]
 
     def get_fresh_learnings(self, project_path: str) -> List[str]:
         """Find all learnings that are still fresh.
@@ -1477,33 +1674,54 @@ class KnowledgeStore:
         Returns:
             List of module paths with fresh learnings
         """
-        fresh = []
-        for module_path, learning in self.learnings.items():
-            if not learning.is_stale(project_path):
-                fresh.append(module_path)
-        return fresh
+        return [p for p, stale in self.check_staleness(project_path).items() if not stale]
 
     # Search
 
-    def search(self, query: str, limit: int = 10) -> List[tuple[str, StoredLearning, float]]:
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        project_path: Optional[str] = None,
+    ) -> List[tuple[str, StoredLearning, float]]:
         """Search learnings by query.
 
-        Simple keyword-based search matching against:
+        BM25 keyword search matching against:
         - Module path
         - Summary
         - Purpose
         - Key function names and descriptions
         - Gotchas
 
+        Stores loaded from disk use the persistent search-index.json,
+        re-indexing only learnings that changed since it was written.
+
         Args:
             query: Search query (space-separated keywords)
             limit: Maximum results to return
+            project_path: If provided, penalize stale results
 
         Returns:
             List of (module_path, learning, score) tuples
         """
-        from erirpg.search import search_learnings
-        return search_learnings(self.learnings, query, limit)
+        from erirpg.search import LearningIndex, search_learnings
+
+        if self._path is None:
+            return search_learnings(self.learnings, query, limit, project_path)
+
+        index_path = get_search_index_path(self._path)
+        index = LearningIndex.load(index_path)
+        stamp = _knowledge_stamp(self._path)
+        if index.stamp != stamp or self._journal or self._index_stale:
+            index.sync(self.learnings)
+            index.stamp = None if self._journal or self._index_stale else stamp
+            index.dirty = True
+            try:
+                if os.path.isdir(os.path.dirname(index_path)):
+                    index.save(index_path)
+            except OSError as e:
+                import sys; print(f"[EriRPG] Could not save search index: {e}", file=sys.stderr)
+        return search_learnings(self.learnings, query, limit, project_path, index=index)
 
 
     # ============================================================================
@@ -1559,6 +1777,34 @@ class KnowledgeStore:
         """Generate next idea ID."""
         return f"IDEA-{len(self.deferred_ideas) + 1:03d}"
 
+    # Snapshot blobs
+
+    def referenced_blobs(self) -> set:
+        """Digests of all blobs referenced by learning versions."""
+        digests = set()
+        for learning in self.learnings.values():
+            for v in learning.versions:
+                digests.update(v.files_blobs.values())
+        return digests
+
+    def externalize_snapshots(self, project_path: str) -> int:
+        """Move legacy inline snapshot content into the blob store.
+
+        Returns:
+            Number of file contents moved
+        """
+        blobs = BlobStore(project_path)
+        moved = 0
+        for learning in self.learnings.values():
+            for v in learning.versions:
+                if not v.files_content:
+                    continue
+                for path, content in v.files_content.items():
+                    v.files_blobs[path] = blobs.put(content)
+                    moved += 1
+                v.files_content = None
+        return moved
+
     # Statistics
 
     def stats(self) -> dict:
@@ -1575,16 +1821,9 @@ class KnowledgeStore:
 
     # Persistence
 
-    def save(self, path: str) -> None:
-        """Save knowledge store to JSON file.
-
-        Args:
-            path: Path to knowledge.json file
-        """
-        p = Path(path)
-        p.parent.mkdir(parents=True, exist_ok=True)
-
-        data = {
+    def _to_data(self) -> dict:
+        """Serialize the store to knowledge.json data."""
+        return {
             "project": self.project,
             "version": self.version,
             "saved_at": datetime.now().isoformat(),
@@ -1597,26 +1836,9 @@ class KnowledgeStore:
             "deferred_ideas": [i.to_dict() for i in self.deferred_ideas],
         }
 
-        with open(p, "w") as f:
-            json.dump(data, f, indent=2)
-
     @classmethod
-    def load(cls, path: str) -> "KnowledgeStore":
-        """Load knowledge store from JSON file.
-
-        Args:
-            path: Path to knowledge.json file
-
-        Returns:
-            Loaded KnowledgeStore, or empty one if file doesn't exist
-        """
-        if not os.path.exists(path):
-            # Return empty store - caller should set project name
-            return cls(project="unknown")
-
-        with open(path, "r") as f:
-            data = json.load(f)
-
+    def _from_data(cls, data: dict) -> "KnowledgeStore":
+        """Build a store from knowledge.json data."""
         return cls(
             project=data.get("project", "unknown"),
             version=data.get("version", "0.60.0"),
@@ -1647,6 +1869,252 @@ class KnowledgeStore:
             ],
         )
 
+    def save(self, path: str) -> None:
+        """Save knowledge store to JSON file.
+
+        Applies the version retention policy, then writes a full snapshot
+        under the knowledge lock and folds the journal into it. If another
+        writer changed the store since this one was loaded, the two are
+        merged record by record (see merge_knowledge_data) instead of
+        overwriting their changes.
+
+        Args:
+            path: Path to knowledge.json file
+
+        Raises:
+            LockTimeout: If another writer holds the lock too long
+        """
+        p = Path(path)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        journal_path = get_journal_path(path)
+
+        for learning in self.learnings.values():
+            learning.prune_versions(self.retention)
+        data = self._to_data()
+
+        with file_lock(path):
+            if self._base_files is not None and _knowledge_stamp(path) != self._base_stamp:
+                base = _parse_knowledge(*self._base_files)
+                current = _parse_knowledge(*_read_knowledge_files(path))
+                data = merge_knowledge_data(base, data, current)
+                merged = KnowledgeStore._from_data(data)
+                for name in ("learnings", "decisions", "patterns", "discussions",
+                             "runs", "user_decisions", "deferred_ideas"):
+                    setattr(self, name, getattr(merged, name))
+
+            atomic_write_json(str(p), data)
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+
+            self._base_files = (json.dumps(data).encode("utf-8"), b"")
+            self._base_stamp = _knowledge_stamp(path)
+
+        self._journal.clear()
+        self._index_stale = False
+        self._path = str(p)
+
+    def flush(self, path: str) -> int:
+        """Append pending mutations to the journal instead of rewriting.
+
+        Only mutations made through add_learning, add_decision, add_run and
+        record_enrichment are journaled. Anything else (discussions,
+        patterns, removals) still needs save().
+
+        Args:
+            path: Path to knowledge.json file
+
+        Returns:
+            Number of records appended
+        """
+        if not self._journal:
+            return 0
+
+        count = len(self._journal)
+        journal_path = get_journal_path(path)
+        payload = "".join(json.dumps(rec) + "\n" for rec in self._journal).encode("utf-8")
+
+        with file_lock(path):
+            # No snapshot yet: write one so readers of knowledge.json see it
+            if not os.path.exists(path):
+                self.save(path)
+                return count
+
+            fd = os.open(journal_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
+
+            # Our base now includes our own records
+            if self._base_files is not None:
+                self._base_files = (self._base_files[0], self._base_files[1] + payload)
+            self._journal.clear()
+
+            if os.path.getsize(journal_path) > JOURNAL_COMPACT_BYTES:
+                compact_journal(path)
+        return count
+
+    @classmethod
+    def load(cls, path: str) -> "KnowledgeStore":
+        """Load knowledge store from JSON file.
+
+        The snapshot is read first, then any journaled mutations are
+        replayed on top of it. The raw files are kept as this store's base
+        version for merging on save.
+
+        Args:
+            path: Path to knowledge.json file
+
+        Returns:
+            Loaded KnowledgeStore, or empty one if file doesn't exist
+        """
+        # Stamp before reading: a write in between only causes a merge
+        stamp = _knowledge_stamp(path)
+        snapshot, journal = _read_knowledge_files(path)
+        data = _parse_knowledge(snapshot, journal)
+
+        # Empty store if nothing exists - caller should set project name
+        store = cls._from_data(data)
+        store._base_files = (snapshot, journal)
+        store._base_stamp = stamp
+        store._path = path
+        return store
+
+
+def _read_knowledge_files(path: str) -> tuple:
+    """Read raw knowledge.json and journal bytes (None / b"" if missing)."""
+    snapshot = None
+    journal = b""
+    try:
+        with open(path, "rb") as f:
+            snapshot = f.read()
+    except FileNotFoundError:
+        pass
+    try:
+        with open(get_journal_path(path), "rb") as f:
+            journal = f.read()
+    except FileNotFoundError:
+        pass
+    return snapshot, journal
+
+
+def _apply_journal_record(data: dict, rec: dict) -> None:
+    """Replay a single journal record onto knowledge.json data."""
+    op = rec.get("op")
+    if op == "add_learning":
+        data.setdefault("learnings", {})[rec["learning"]["module_path"]] = rec["learning"]
+    elif op == "add_decision":
+        decisions = data.setdefault("decisions", [])
+        if not any(d.get("id") == rec["decision"]["id"] for d in decisions):
+            decisions.append(rec["decision"])
+    elif op == "add_run":
+        data.setdefault("runs", []).append(rec["run"])
+    elif op == "enrich":
+        learning = data.get("learnings", {}).get(rec.get("module_path", ""))
+        if learning is not None:
+            for key in ("drift_pattern_id", "drift_confidence", "is_outlier",
+                        "outlier_reason", "validated_by_drift"):
+                learning[key] = rec.get(key)
+
+
+def _parse_knowledge(snapshot: Optional[bytes], journal: bytes) -> dict:
+    """Parse a knowledge snapshot and replay its journal onto it."""
+    data = json.loads(snapshot) if snapshot else {}
+
+    # Ignore a trailing partial record from an in-flight append
+    end = journal.rfind(b"\n") + 1
+    for line in journal[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            _apply_journal_record(data, json.loads(line))
+        except (ValueError, KeyError, TypeError) as e:
+            import sys; print(f"[EriRPG] Skipping bad journal record: {e}", file=sys.stderr)
+    return data
+
+
+def read_knowledge_data(path: str) -> dict:
+    """Raw knowledge.json data with the journal replayed onto it.
+
+    For readers that want plain dicts rather than a KnowledgeStore.
+
+    Args:
+        path: Path to knowledge.json file
+
+    Returns:
+        Knowledge data ({} if neither file exists)
+
+    Raises:
+        ValueError: If the snapshot isn't valid JSON
+    """
+    return _parse_knowledge(*_read_knowledge_files(path))
+
+
+def merge_knowledge_data(base: dict, ours: dict, theirs: dict) -> dict:
+    """Three-way merge of knowledge.json data at record level.
+
+    Learnings, patterns and discussions merge by key; decisions, user
+    decisions and deferred ideas by id; runs by (timestamp, command).
+    A record changed on only one side keeps that change; a record both
+    sides changed keeps ours.
+
+    Args:
+        base: Data the writer originally loaded
+        ours: Data the writer wants to save
+        theirs: Data currently on disk
+
+    Returns:
+        Merged data
+    """
+    merged = dict(ours)
+    for name in ("learnings", "patterns", "discussions"):
+        merged[name] = merge_records(
+            base.get(name, {}), ours.get(name, {}), theirs.get(name, {})
+        )
+    for name in ("decisions", "user_decisions", "deferred_ideas"):
+        merged[name] = merge_record_lists(
+            base.get(name, []), ours.get(name, []), theirs.get(name, []),
+            key=lambda r: r.get("id"),
+        )
+    merged["runs"] = merge_record_lists(
+        base.get("runs", []), ours.get("runs", []), theirs.get("runs", []),
+        key=lambda r: (r.get("timestamp"), r.get("command")),
+    )[-100:]
+    return merged
+
+
+def get_journal_path(knowledge_path: str) -> str:
+    """Get the journal path that sits next to a knowledge.json file."""
+    base, _ = os.path.splitext(knowledge_path)
+    return base + ".journal.jsonl"
+
+
+def get_search_index_path(knowledge_path: str) -> str:
+    """Get the search index path that sits next to a knowledge.json file."""
+    return os.path.join(os.path.dirname(knowledge_path), "search-index.json")
+
+
+def _knowledge_stamp(knowledge_path: str) -> str:
+    """Identify the on-disk state of a knowledge store (snapshot + journal)."""
+    parts = []
+    for p in (knowledge_path, get_journal_path(knowledge_path)):
+        try:
+            st = os.stat(p)
+            parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+        except OSError:
+            parts.append("-")
+    return "|".join(parts)
+
+
+def compact_journal(knowledge_path: str) -> None:
+    """Fold the journal into the knowledge.json snapshot.
+
+    Args:
+        knowledge_path: Path to knowledge.json file
+    """
+    with file_lock(knowledge_path):
+        KnowledgeStore.load(knowledge_path).save(knowledge_path)
+
 
 def get_knowledge_path(project_path: str) -> str:
     """Get the path to knowledge.json for a project.
@@ -1688,6 +2156,59 @@ def save_knowledge(project_path: str, store: KnowledgeStore) -> None:
     store.save(path)
 
 
+def flush_knowledge(project_path: str, store: KnowledgeStore) -> int:
+    """Append a store's pending mutations to the project's journal.
+
+    Cheaper than save_knowledge() and safe against concurrent writers,
+    but only covers journaled mutations (see KnowledgeStore.flush).
+
+    Args:
+        project_path: Root path of the project
+        store: KnowledgeStore with pending mutations
+
+    Returns:
+        Number of records appended
+    """
+    return store.flush(get_knowledge_path(project_path))
+
+
+def gc_blobs(project_path: str, dry_run: bool = False) -> dict:
+    """Drop snapshot blobs no learning version references.
+
+    Legacy inline snapshot content is moved into the blob store first.
+
+    Args:
+        project_path: Root path of the project
+        dry_run: Only report what would be removed
+
+    Returns:
+        Dict with stats: {"kept": n, "removed": n, "bytes_freed": n, "externalized": n}
+    """
+    knowledge_path = get_knowledge_path(project_path)
+    if not os.path.isdir(os.path.dirname(knowledge_path)):
+        return {"kept": 0, "removed": 0, "bytes_freed": 0, "externalized": 0}
+
+    # Hold the knowledge lock so no save lands between reading the
+    # references and deleting; blobs put() but not yet saved are covered
+    # by the gc grace period.
+    with file_lock(knowledge_path):
+        store = load_knowledge(project_path, Path(project_path).name)
+        externalized = 0
+        if not dry_run:
+            externalized = store.externalize_snapshots(project_path)
+            if externalized:
+                save_knowledge(project_path, store)
+        else:
+            # Inline content would be externalized, not collected
+            for learning in store.learnings.values():
+                for v in learning.versions:
+                    externalized += len(v.files_content or {})
+
+        stats = BlobStore(project_path).gc(store.referenced_blobs(), dry_run=dry_run)
+    stats["externalized"] = externalized
+    return stats
+
+
 # ============================================================================
 # Operation-Aware Learning Updates
 # ============================================================================
@@ -2006,29 +2527,32 @@ def enrich_learnings_batch(project_path: str, force: bool = False) -> dict:
     """
     Batch enrich all stored learnings with Drift pattern data.
 
-    Efficiently queries Drift once for file patterns and outliers,
-    then enriches all learnings that haven't been validated yet.
+    Queries Drift for outliers and batched file patterns concurrently,
+    within DRIFT_ENRICH_BUDGET seconds, then enriches all learnings that
+    haven't been validated yet. Learnings whose Drift data didn't arrive
+    in time are left unvalidated for the next run.
 
     Args:
         project_path: Root path of the project
         force: Re-enrich even if already validated
 
     Returns:
-        Dict with stats: {"enriched": n, "skipped": n, "failed": n, "drift_available": bool}
+        Dict with stats: {"enriched": n, "skipped": n, "failed": n,
+        "timed_out": n, "drift_available": bool}
     """
     try:
-        from erirpg.drift_bridge import DriftBridge
+        from erirpg.drift_bridge import DriftBridge, DriftScheduler, FILE_BATCH_SIZE
     except ImportError:
-        return {"enriched": 0, "skipped": 0, "failed": 0, "drift_available": False}
+        return {"enriched": 0, "skipped": 0, "failed": 0, "timed_out": 0, "drift_available": False}
 
     bridge = DriftBridge(project_path)
     if not bridge.is_available():
-        return {"enriched": 0, "skipped": 0, "failed": 0, "drift_available": False}
+        return {"enriched": 0, "skipped": 0, "failed": 0, "timed_out": 0, "drift_available": False}
 
     # Load knowledge store
     store = load_knowledge(project_path, Path(project_path).name)
 
-    stats = {"enriched": 0, "skipped": 0, "failed": 0, "drift_available": True}
+    stats = {"enriched": 0, "skipped": 0, "failed": 0, "timed_out": 0, "drift_available": True}
 
     # Get all unique files from learnings
     files_to_check = set()
@@ -2039,23 +2563,39 @@ def enrich_learnings_batch(project_path: str, force: bool = False) -> dict:
     if not files_to_check:
         return stats
 
-    # Batch get outliers once (more efficient than per-file)
-    all_outliers = bridge.find_outliers()
+    # Outliers once for the whole project, file patterns in batches of
+    # files; all of it concurrently and within one budget
+    files = sorted(files_to_check)
+    calls = {"outliers": bridge.find_outliers_async}
+    for start in range(0, len(files), FILE_BATCH_SIZE):
+        chunk = files[start:start + FILE_BATCH_SIZE]
+        calls[("patterns", start)] = lambda c=chunk: bridge.get_file_patterns_batch_async(c)
+    results = DriftScheduler(budget=DRIFT_ENRICH_BUDGET).run(calls)
+
     outliers_by_file = {}
-    for outlier in all_outliers:
+    for outlier in results["outliers"] or []:
         if outlier.file not in outliers_by_file:
             outliers_by_file[outlier.file] = []
         outliers_by_file[outlier.file].append(outlier)
 
+    patterns_by_file = {}
+    for key, chunk_results in results.items():
+        if key != "outliers" and chunk_results is not None:
+            patterns_by_file.update(chunk_results)
+
     # Enrich each learning
     for module_path, learning in store.learnings.items():
         if not force and learning.validated_by_drift:
             stats["skipped"] += 1
             continue
 
+        if results["outliers"] is None or module_path not in patterns_by_file:
+            # Drift didn't answer within the budget: validate next time
+            stats["timed_out"] += 1
+            continue
+
         try:
-            # Get file patterns
-            file_data = bridge.get_file_patterns(module_path)
+            file_data = patterns_by_file[module_path]
 
             # Check pattern match
             for pattern in file_data.patterns:
@@ -2072,6 +2612,7 @@ def enrich_learnings_batch(project_path: str, force: bool = False) -> dict:
                 break
 
             learning.validated_by_drift = True
+            store.record_enrichment(module_path)
             stats["enriched"] += 1
 
         except Exception as e:
@@ -2079,8 +2620,8 @@ def enrich_learnings_batch(project_path: str, force: bool = False) -> dict:
             print(f"[EriRPG] Failed to enrich {module_path}: {e}", file=sys.stderr)
             stats["failed"] += 1
 
-    # Save updated store
-    save_knowledge(project_path, store)
+    # Journal the enrichments
+    flush_knowledge(project_path, store)
 
     return stats
 
@@ -14,6 +14,7 @@ State tracks:
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Optional
+import copy
 import json
 
 
@@ -193,6 +194,9 @@ class State:
     created_at: Optional[str] = None
     updated_at: Optional[str] = None
 
+    # state.json as last loaded/saved, for merging concurrent writes
+    _base: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
+
     def __post_init__(self):
         if not self.created_at:
             self.created_at = datetime.now().isoformat()
@@ -217,9 +221,9 @@ class State:
             project_name=data.get("project_name", ""),
             position=StatePosition.from_dict(data.get("position", {})),
             metrics=StateMetrics.from_dict(data.get("metrics", {})),
-            decisions=data.get("decisions", []),
-            todos=data.get("todos", []),
-            blockers=data.get("blockers", []),
+            decisions=list(data.get("decisions", [])),
+            todos=list(data.get("todos", [])),
+            blockers=list(data.get("blockers", [])),
             continuity=StateContinuity.from_dict(data.get("continuity", {})),
             created_at=data.get("created_at"),
             updated_at=data.get("updated_at"),
@@ -273,12 +277,18 @@ def load_state(project_path: str) -> Optional[State]:
     with open(state_path, "r") as f:
         data = json.load(f)
 
-    return State.from_dict(data)
+    state = State.from_dict(data)
+    state._base = data
+    return state
 
 
 def save_state(project_path: str, state: State) -> str:
     """Save state to project.
 
+    Writes under the state file lock. If the state was loaded with
+    load_state() and state.json changed on disk since, the two versions
+    are merged field by field rather than overwritten.
+
     Args:
         project_path: Path to project root
         state: State to save
@@ -287,15 +297,27 @@ def save_state(project_path: str, state: State) -> str:
         Path to saved file
     """
     import os
+    from erirpg.locking import atomic_write_json, file_lock, merge_fields, read_json
 
     state_dir = os.path.join(project_path, ".eri-rpg")
     os.makedirs(state_dir, exist_ok=True)
 
     state_path = os.path.join(state_dir, "state.json")
     state._touch()
-
-    with open(state_path, "w") as f:
-        json.dump(state.to_dict(), f, indent=2)
+    data = state.to_dict()
+
+    with file_lock(state_path):
+        if state._base is not None:
+            existing = read_json(state_path)
+            if isinstance(existing, dict) and existing != state._base:
+                data = merge_fields(state._base, data, existing)
+                merged = State.from_dict(data)
+                for name in ("position", "metrics", "decisions", "todos",
+                             "blockers", "continuity"):
+                    setattr(state, name, getattr(merged, name))
+
+        atomic_write_json(state_path, data)
+        state._base = copy.deepcopy(data)  # to_dict() shares lists with state
 
     return state_path
 
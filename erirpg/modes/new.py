@@ -21,6 +21,7 @@ from typing import List, Optional, Dict
 
 from erirpg.registry import Registry
 from erirpg.state import State
+from erirpg.tokens import get_estimator
 
 
 @dataclass
@@ -418,7 +419,7 @@ def generate_chunk_context(spec: ProjectSpec, chunk_id: str, output_dir: str) ->
     with open(path, "w") as f:
         f.write("\n".join(lines))
 
-    tokens = len("\n".join(lines)) // 4  # Rough estimate
+    tokens = get_estimator().estimate("\n".join(lines), path)
 
     return path, tokens
 
@@ -28,6 +28,7 @@ from erirpg.graph import Graph
 from erirpg.ops import find_modules, extract_feature, plan_transplant, Feature, TransplantPlan
 from erirpg.context import generate_context, estimate_tokens
 from erirpg.state import State
+from erirpg.tfidf import get_module_index
 from erirpg.memory import load_knowledge
 
 
@@ -183,12 +184,15 @@ def find_feature(
     graph: Graph,
     feature_query: str,
     project_name: str,
+    graph_path: Optional[str] = None,
 ) -> list:
     """Find modules matching feature query.
 
+    Uses the stored TF-IDF index next to graph_path when there is one.
     Returns list of (module, score) tuples.
     """
-    results = find_modules(graph, feature_query, limit=10)
+    index = get_module_index(graph, graph_path)
+    results = find_modules(graph, feature_query, limit=10, index=index)
 
     if not results:
         raise ValueError(
@@ -401,7 +405,7 @@ def run_take(description: str, verbose: bool = False) -> dict:
         print(f"Finding '{request.feature}' in {source_name}...")
 
     try:
-        results = find_feature(source_graph, request.feature, source_name)
+        results = find_feature(source_graph, request.feature, source_name, source_proj.graph_path)
     except ValueError as e:
         return {'success': False, 'error': str(e)}
 
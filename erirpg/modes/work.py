@@ -27,6 +27,8 @@ from erirpg.graph import Graph, Module
 from erirpg.ops import find_modules
 from erirpg.state import State
 from erirpg.memory import load_knowledge
+from erirpg.tokens import get_estimator
+from erirpg.tfidf import get_module_index
 
 
 def get_module_info(project_path: str, module_path: str, graph: "Graph") -> Optional[dict]:
@@ -121,12 +123,15 @@ def find_relevant_modules(
     graph: Graph,
     task: str,
     limit: int = 10,
+    graph_path: Optional[str] = None,
 ) -> List[Tuple[Module, float]]:
     """Find modules relevant to the task.
 
-    Searches by task keywords in module summaries, interfaces, docstrings.
+    Searches by task keywords in module summaries, interfaces, docstrings,
+    using the stored TF-IDF index next to graph_path when there is one.
     """
-    results = find_modules(graph, task, limit=limit)
+    index = get_module_index(graph, graph_path)
+    results = find_modules(graph, task, limit=limit, index=index)
     return results
 
 
@@ -317,7 +322,7 @@ def generate_work_context(
                 lines.append("")
                 lines.append(f"After understanding, store: `eri-rpg learn {project_name} {mod.path}`")
                 lines.append("")
-                tokens += len(code) // 4  # Rough token estimate
+                tokens += get_estimator(project_path).estimate(code, mod.path)
             else:
                 lines.append("*(Source file not found)*")
                 lines.append("")
@@ -471,7 +476,7 @@ def run_work(
     if verbose:
         print(f"Finding relevant modules for: {task}")
 
-    modules = find_relevant_modules(graph, task, limit=10)
+    modules = find_relevant_modules(graph, task, limit=10, graph_path=proj.graph_path)
 
     if not modules:
         return {
@@ -10,14 +10,15 @@ These operations work on indexed graphs to:
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Set, Union
+from typing import Dict, List, Optional, Tuple, Union
 import json
 import os
-import re
 
 from erirpg.graph import Graph, Module, Interface
 from erirpg.registry import Project
-from erirpg.refs import CodeRef
+from erirpg.refs import CodeRef, SymbolRef
+from erirpg.slicing import render_slices, slice_feature
+from erirpg.tfidf import ModuleIndex, get_module_index
 
 
 @dataclass
@@ -38,6 +39,8 @@ class Feature:
         provides: Interfaces exported by this feature (with source_module provenance)
         code_refs: Dict of path -> CodeRef (reference-based storage)
         code_snapshots: Dict of path -> str (snapshot-based storage)
+        symbol_refs: Dict of path -> SymbolRefs of the symbols the feature
+            uses (components without an entry are used whole)
     """
     name: str
     source_project: str
@@ -48,6 +51,7 @@ class Feature:
     provides: List[Dict] = field(default_factory=list)  # Interfaces with source_module provenance
     code_refs: Dict[str, CodeRef] = field(default_factory=dict)  # path -> CodeRef
     code_snapshots: Dict[str, str] = field(default_factory=dict)  # path -> code (for backwards compat)
+    symbol_refs: Dict[str, List[SymbolRef]] = field(default_factory=dict)  # path -> used symbols
 
     # Backward compatibility property
     @property
@@ -97,6 +101,26 @@ class Feature:
 
         return result
 
+    def hydrate_slices(self, project_path: str) -> Dict[str, str]:
+        """Load fresh code, keeping only the symbols the feature uses.
+
+        Components without symbol refs, or whose sliced symbols have
+        changed since extraction, are hydrated whole.
+
+        Args:
+            project_path: Root path of the source project
+
+        Returns:
+            Dict of path -> (possibly sliced) code content
+        """
+        result = self.hydrate_code(project_path)
+        for path, refs in self.symbol_refs.items():
+            if path in result and refs:
+                sliced = render_slices(result[path], refs, path)
+                if sliced is not None:
+                    result[path] = sliced
+        return result
+
     def get_stale_components(self, project_path: str) -> List[str]:
         """Get components whose source files have changed.
 
@@ -124,6 +148,10 @@ class Feature:
             "provides": self.provides,
             "code_refs": {k: v.to_dict() for k, v in self.code_refs.items()},
         }
+        if self.symbol_refs:
+            data["symbol_refs"] = {
+                k: [ref.to_dict() for ref in refs] for k, refs in self.symbol_refs.items()
+            }
         # Include snapshots if present (for --snapshot mode or backward compat)
         if self.code_snapshots:
             data["code"] = self.code_snapshots
@@ -141,6 +169,11 @@ class Feature:
         if "code_refs" in data:
             code_refs = {k: CodeRef.from_dict(v) for k, v in data["code_refs"].items()}
 
+        symbol_refs = {
+            k: [SymbolRef.from_dict(d) for d in refs]
+            for k, refs in data.get("symbol_refs", {}).items()
+        }
+
         # Load code snapshots if present (v1 format or --snapshot)
         code_snapshots = data.get("code", {})
 
@@ -161,6 +194,7 @@ class Feature:
             provides=data["provides"],
             code_refs=code_refs,
             code_snapshots=code_snapshots,
+            symbol_refs=symbol_refs,
         )
 
 
@@ -238,10 +272,11 @@ def find_modules(
     graph: Graph,
     query: str,
     limit: int = 10,
+    index: Optional[ModuleIndex] = None,
 ) -> List[Tuple[Module, float]]:
     """Find modules matching a query.
 
-    Uses simple token-based scoring:
+    Uses TF-IDF cosine scoring over the module index:
     - Summary match: 0.5 weight
     - Interface names: 0.3 weight
     - Docstrings: 0.2 weight
@@ -250,62 +285,45 @@ def find_modules(
         graph: Project graph
         query: Search query
         limit: Maximum results
+        index: Prebuilt ModuleIndex (looked up/built for the graph if omitted)
 
     Returns:
         List of (Module, score) tuples, sorted by score descending
     """
-    query_tokens = _tokenize(query.lower())
-
-    results = []
-    for mod in graph.modules.values():
-        score = 0.0
-
-        # Summary match (0.5 weight)
-        summary_tokens = _tokenize(mod.summary.lower())
-        summary_score = _jaccard(query_tokens, summary_tokens)
-        score += summary_score * 0.5
+    return find_modules_batch(graph, [query], limit=limit, index=index)[0]
 
-        # Interface names (0.3 weight)
-        iface_names = " ".join(i.name for i in mod.interfaces)
-        iface_tokens = _tokenize(iface_names.lower())
-        iface_score = _jaccard(query_tokens, iface_tokens)
-        score += iface_score * 0.3
 
-        # Docstrings (0.2 weight)
-        docstrings = " ".join(i.docstring for i in mod.interfaces)
-        doc_tokens = _tokenize(docstrings.lower())
-        doc_score = _jaccard(query_tokens, doc_tokens)
-        score += doc_score * 0.2
-
-        # Boost for exact phrase in summary
-        if query.lower() in mod.summary.lower():
-            score += 0.3
-
-        # Boost for path match
-        path_tokens = _tokenize(mod.path.lower().replace("/", " ").replace("_", " "))
-        if query_tokens & path_tokens:
-            score += 0.1
-
-        if score > 0:
-            results.append((mod, score))
-
-    # Sort by score descending
-    results.sort(key=lambda x: x[1], reverse=True)
-    return results[:limit]
-
-
-def _tokenize(text: str) -> Set[str]:
-    """Tokenize text into words."""
-    return set(re.findall(r'\w+', text))
+def find_modules_batch(
+    graph: Graph,
+    queries: List[str],
+    limit: int = 10,
+    index: Optional[ModuleIndex] = None,
+) -> List[List[Tuple[Module, float]]]:
+    """Find modules for several queries in one pass over the index.
 
+    Args:
+        graph: Project graph
+        queries: Search queries
+        limit: Maximum results per query
+        index: Prebuilt ModuleIndex (looked up/built for the graph if omitted)
 
-def _jaccard(set1: Set[str], set2: Set[str]) -> float:
-    """Jaccard similarity between two sets."""
-    if not set1 or not set2:
-        return 0.0
-    intersection = len(set1 & set2)
-    union = len(set1 | set2)
-    return intersection / union if union > 0 else 0.0
+    Returns:
+        One list of (Module, score) tuples per query, sorted by score descending
+    """
+    if index is None:
+        index = get_module_index(graph)
+
+    batch = []
+    for scores in index.score_batch(queries):
+        results = []
+        for idx, score in scores.items():
+            mod = graph.modules.get(index.paths[idx])
+            if mod is not None and score > 0:
+                results.append((mod, score))
+        # Sort by score descending
+        results.sort(key=lambda x: x[1], reverse=True)
+        batch.append(results[:limit])
+    return batch
 
 
 def extract_feature(
@@ -331,7 +349,8 @@ def extract_feature(
         Extracted Feature
     """
     # Find matching modules
-    matches = find_modules(graph, query, limit=5)
+    index = get_module_index(graph, project.graph_path)
+    matches = find_modules(graph, query, limit=5, index=index)
     if not matches:
         raise ValueError(f"No modules match query: {query}")
 
@@ -362,6 +381,9 @@ def extract_feature(
                 with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
                     code_snapshots[comp] = f.read()
 
+    # Slice components down to the symbols the feature uses
+    symbol_refs = slice_feature(graph, project.path, ordered, primary.path, query)
+
     # Extract requires (external deps)
     requires = []
     external_seen = set()
@@ -414,6 +436,7 @@ def extract_feature(
         provides=provides,
         code_refs=code_refs,
         code_snapshots=code_snapshots,
+        symbol_refs=symbol_refs,
     )
 
 
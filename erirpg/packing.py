@@ -0,0 +1,237 @@
+"""
+Relevance-weighted packing of module code into a context token budget.
+
+Instead of splitting the code budget in proportion to module size, each
+module without a stored learning offers several candidate renderings,
+each an item with a token cost and a value:
+
+- "full":       the whole module
+- "truncated":  a head cut that keeps the remaining signatures
+- "signatures": definition lines only
+- "summary":    the graph's one-line module summary
+
+A module's value comes from its relevance to the feature (graph distance
+to the primary module, centrality within the feature, and query match),
+scaled by how much of the module each rendering conveys. The packer then
+picks at most one item per module to maximize total value within the
+budget (a multiple-choice knapsack, solved by DP on a coarse token grid).
+
+Usage:
+    relevance = module_relevance(feature.components, graph, primary, query_scores)
+    items = {
+        p: candidate_items(p, code[p], count_tokens, truncate, SIGNATURE_RE, summary)
+        for p in paths
+    }
+    chosen = pack_items(items, relevance, budget)
+"""
+
+import math
+import re
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from erirpg.graph import Graph
+
+# Weights of the relevance components (sum to 1)
+DISTANCE_WEIGHT = 0.5
+CENTRALITY_WEIGHT = 0.2
+QUERY_WEIGHT = 0.3
+
+# Share of a module's value each rendering conveys
+FIDELITY = {
+    "full": 1.0,
+    "signatures": 0.45,
+    "summary": 0.2,
+}
+# Truncated bodies: base + share of the code kept
+TRUNCATED_BASE = 0.45
+TRUNCATED_SCALE = 0.5
+
+# Head cuts offered as "truncated" items, as fractions of the full size
+TRUNCATION_FRACTIONS = (0.5, 0.25)
+
+# Max DP grid cells along the budget axis
+DP_RESOLUTION = 500
+
+
+@dataclass
+class ContextItem:
+    """One way of rendering a module into context."""
+    path: str
+    kind: str  # "full" | "truncated" | "signatures" | "summary"
+    text: str
+    tokens: int
+    fidelity: float
+
+
+def module_relevance(
+    paths: List[str],
+    graph: Optional["Graph"],
+    primary: str = "",
+    query_scores: Optional[Dict[str, float]] = None,
+) -> Dict[str, float]:
+    """Relevance (0-1) of each feature module.
+
+    Combines closeness to the primary module (BFS over import edges in
+    either direction), in-feature degree centrality and query match
+    scores (normalized to the best match).
+
+    Args:
+        paths: Feature module paths
+        graph: Source graph (relevance is uniform without one)
+        primary: Primary module of the feature
+        query_scores: Optional path -> query relevance (any scale)
+
+    Returns:
+        Dict of path -> relevance
+    """
+    members = set(paths)
+    neighbors: Dict[str, set] = {p: set() for p in paths}
+    if graph is not None:
+        for edge in graph.edges:
+            if edge.source in members and edge.target in members and edge.source != edge.target:
+                neighbors[edge.source].add(edge.target)
+                neighbors[edge.target].add(edge.source)
+
+    # Distance from the primary module
+    distance: Dict[str, int] = {}
+    if primary in members:
+        distance[primary] = 0
+        queue = deque([primary])
+        while queue:
+            node = queue.popleft()
+            for nxt in neighbors[node]:
+                if nxt not in distance:
+                    distance[nxt] = distance[node] + 1
+                    queue.append(nxt)
+
+    max_degree = max((len(n) for n in neighbors.values()), default=0) or 1
+    scores = query_scores or {}
+    best_query = max(scores.values(), default=0.0) or 1.0
+
+    relevance = {}
+    for path in paths:
+        if path in distance:
+            closeness = 1.0 / (1 + distance[path])
+        else:
+            closeness = 0.5 if not distance else 0.1
+        centrality = len(neighbors[path]) / max_degree
+        query = scores.get(path, 0.0) / best_query
+        relevance[path] = (
+            DISTANCE_WEIGHT * closeness
+            + CENTRALITY_WEIGHT * centrality
+            + QUERY_WEIGHT * query
+        )
+    if primary in relevance:
+        relevance[primary] = 1.0
+    return relevance
+
+
+def candidate_items(
+    path: str,
+    code: str,
+    count_tokens: Callable[[str], int],
+    truncate: Callable[[str, int, str], tuple],
+    signature_re: "re.Pattern",
+    summary: str = "",
+) -> List[ContextItem]:
+    """Build the candidate renderings of one module.
+
+    Args:
+        path: Module path
+        code: Module source ("" if unavailable)
+        count_tokens: Exact token counter
+        truncate: truncate_code-like callable (code, max_tokens, path)
+        signature_re: Pattern matching definition lines
+        summary: Graph summary of the module
+
+    Returns:
+        Candidate items, cheapest last
+    """
+    items: List[ContextItem] = []
+    if code:
+        full_tokens = count_tokens(code)
+        items.append(ContextItem(path, "full", code, full_tokens, FIDELITY["full"]))
+
+        total_lines = max(1, code.count("\n") + 1)
+        for fraction in TRUNCATION_FRACTIONS:
+            text, tokens, was_truncated = truncate(code, int(full_tokens * fraction), path)
+            if not was_truncated or tokens >= full_tokens:
+                continue
+            kept = text.split("\n\n# ... [", 1)[0].count("\n") + 1
+            fidelity = TRUNCATED_BASE + TRUNCATED_SCALE * min(1.0, kept / total_lines)
+            items.append(ContextItem(path, "truncated", text, tokens, fidelity))
+
+        signatures = "\n".join(line for line in code.split("\n") if signature_re.match(line))
+        if signatures:
+            items.append(ContextItem(
+                path, "signatures", signatures, count_tokens(signatures), FIDELITY["signatures"]
+            ))
+
+    if summary:
+        items.append(ContextItem(path, "summary", summary, count_tokens(summary), FIDELITY["summary"]))
+    return items
+
+
+def pack_items(
+    items: Dict[str, List[ContextItem]],
+    relevance: Dict[str, float],
+    budget: int,
+    overhead: int = 0,
+) -> Dict[str, ContextItem]:
+    """Choose at most one item per module to maximize value within budget.
+
+    Multiple-choice knapsack solved exactly on a token grid of at most
+    DP_RESOLUTION cells. Costs are rounded up to the grid, so the chosen
+    items always fit.
+
+    Args:
+        items: path -> candidate items
+        relevance: path -> module relevance
+        budget: Tokens available
+        overhead: Extra tokens each chosen item costs (fences, notes)
+
+    Returns:
+        Dict of path -> chosen item (modules left out are absent)
+    """
+    if budget <= 0:
+        return {}
+
+    unit = max(1, math.ceil(budget / DP_RESOLUTION))
+    cells = budget // unit
+    paths = [p for p in items if items[p]]
+
+    # best[c] = best value using at most c cells; choice[i][c] = item index or -1
+    best = [0.0] * (cells + 1)
+    choices: List[List[int]] = []
+    for path in paths:
+        weight = relevance.get(path, 0.0)
+        options = [
+            (math.ceil((item.tokens + overhead) / unit), weight * item.fidelity)
+            for item in items[path]
+        ]
+        new_best = best[:]
+        choice = [-1] * (cells + 1)
+        for idx, (cost, value) in enumerate(options):
+            if cost > cells or value <= 0:
+                continue
+            for c in range(cells, cost - 1, -1):
+                candidate = best[c - cost] + value
+                if candidate > new_best[c]:
+                    new_best[c] = candidate
+                    choice[c] = idx
+        best = new_best
+        choices.append(choice)
+
+    # Walk back through the choices
+    chosen: Dict[str, ContextItem] = {}
+    c = cells
+    for i in range(len(paths) - 1, -1, -1):
+        idx = choices[i][c]
+        if idx >= 0:
+            item = items[paths[i]][idx]
+            chosen[paths[i]] = item
+            c -= math.ceil((item.tokens + overhead) / unit)
+    return chosen
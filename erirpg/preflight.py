@@ -263,6 +263,13 @@ def preflight(
     # Try to use cached learnings_status for instant lookup
     cached_status = _get_cached_learnings_status(project_path)
 
+    # Batch-check staleness for learnings the sync cache doesn't cover
+    uncached = [
+        f for f in normalized_files
+        if knowledge_store.has_learning(f) and not (cached_status and f in cached_status)
+    ]
+    computed_status = knowledge_store.check_staleness(project_path, uncached) if uncached else {}
+
     # Check learnings for each file
     for file_path in normalized_files:
         # module_key is already normalized
@@ -279,8 +286,8 @@ def preflight(
                 if cached_status[module_key] == "stale":
                     report.stale_learnings.append(file_path)
             else:
-                # Fallback: compute staleness (slower)
-                if learning.is_stale(project_path):
+                # Fallback: computed in the batch above
+                if computed_status.get(module_key):
                     report.stale_learnings.append(file_path)
         else:
             report.missing_learnings.append(file_path)
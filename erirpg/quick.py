@@ -35,6 +35,8 @@ from pathlib import Path
 from typing import Optional, List, Dict, Any
 
 from erirpg.registry import Registry
+from erirpg.hooks.active import refresh_active
+from erirpg.hooks.gitrefs import find_git_dir, head_commit
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -75,33 +77,12 @@ def _set_quick_fix_active(active: bool, file_path: Optional[str] = None, project
 
 def _is_git_repo(path: str) -> bool:
     """Check if path is inside a git repository."""
-    try:
-        result = subprocess.run(
-            ['git', 'rev-parse', '--git-dir'],
-            capture_output=True,
-            cwd=path,
-            timeout=5,
-        )
-        return result.returncode == 0
-    except Exception as e:
-        import sys; print(f"[EriRPG] {e}", file=sys.stderr); return False
+    return find_git_dir(path) is not None
 
 
 def _git_head(path: str) -> Optional[str]:
     """Get current git HEAD commit hash."""
-    try:
-        result = subprocess.run(
-            ['git', 'rev-parse', 'HEAD'],
-            capture_output=True,
-            text=True,
-            cwd=path,
-            timeout=5,
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except Exception as e:
-        import sys; print(f"[EriRPG] {e}", file=sys.stderr)
-    return None
+    return head_commit(path)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -128,6 +109,7 @@ def save_quick_fix_state(project_path: str, file_path: str, description: str) ->
     state_file = state_dir / "quick_fix_state.json"
     with open(state_file, "w") as f:
         json.dump(state, f, indent=2)
+    refresh_active(project_path)
 
     return state_file
 
@@ -137,6 +119,7 @@ def clear_quick_fix_state(project_path: str) -> None:
     state_file = Path(project_path) / ".eri-rpg" / "quick_fix_state.json"
     if state_file.exists():
         state_file.unlink()
+        refresh_active(project_path)
 
 
 def load_quick_fix_state(project_path: str) -> Optional[Dict[str, Any]]:
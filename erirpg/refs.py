@@ -7,9 +7,10 @@ and can hydrate (load fresh content) on demand.
 """
 
 from dataclasses import dataclass, field
-from typing import Optional, TYPE_CHECKING
+from typing import List, Optional, Tuple, TYPE_CHECKING
 import hashlib
 import os
+import re
 
 if TYPE_CHECKING:
     pass
@@ -37,7 +38,10 @@ class CodeRef:
 
         Uses a two-phase check:
         1. Fast path: check mtime (if unchanged, file unchanged)
-        2. Slow path: if mtime changed, verify with hash
+        2. Slow path: if mtime changed, verify with hash (through the
+           project's stat-keyed hash cache)
+
+        To check many refs, use StalenessService.check_refs instead.
 
         Args:
             project_path: Root path of the project
@@ -55,7 +59,8 @@ class CodeRef:
             return False  # Quick path: unchanged
 
         # mtime changed - verify with hash
-        current_hash = self._compute_hash(full_path)
+        from erirpg.staleness import get_staleness_service
+        current_hash = get_staleness_service(project_path).current_hash(self.path)
         return current_hash != self.content_hash
 
     def hydrate(self, project_path: str) -> str:
@@ -159,3 +164,131 @@ class CodeRef:
     def __repr__(self) -> str:
         lines = f":{self.line_start}-{self.line_end}" if self.line_end else ""
         return f"CodeRef({self.path}{lines})"
+
+
+@dataclass
+class SymbolRef(CodeRef):
+    """Reference to one top-level symbol (or the module header) of a file.
+
+    Besides the file identity inherited from CodeRef, it carries a hash
+    of the symbol's own lines, so the slice stays valid while only other
+    parts of the file change.
+
+    Attributes:
+        name: Symbol name ("" for the module header)
+        symbol_hash: SHA256 hash of lines line_start..line_end
+    """
+    name: str = ""
+    symbol_hash: str = ""
+
+    @staticmethod
+    def _hash_lines(lines: List[str]) -> str:
+        return hashlib.sha256("".join(lines).encode("utf-8")).hexdigest()
+
+    def matches(self, lines: List[str]) -> bool:
+        """Check whether the symbol's range in lines still has its content."""
+        if self.line_end is None or self.line_end > len(lines):
+            return False
+        return self._hash_lines(lines[self.line_start - 1:self.line_end]) == self.symbol_hash
+
+    def locate(self, lines: List[str]) -> Optional[Tuple[int, int]]:
+        """Find the symbol's current line range in lines.
+
+        The stored range is tried first. If lines were inserted or removed
+        above the symbol, lines naming it are tried as the start of a range
+        of the stored length (with any decorators above), and the one
+        matching the stored hash nearest the old position is taken. The
+        module header is only looked for at its stored range.
+
+        Returns:
+            (line_start, line_end), or None if the symbol changed or is gone
+        """
+        if self.matches(lines):
+            return self.line_start, self.line_end
+        if not self.name or self.line_end is None:
+            return None
+
+        length = self.line_end - self.line_start + 1
+        word = re.compile(r"\b%s\b" % re.escape(self.name))
+        best = None
+        for i, line in enumerate(lines):
+            if not word.search(line):
+                continue
+            start = i + 1
+            while start > 1 and lines[start - 2].lstrip().startswith("@"):
+                start -= 1
+            for candidate in {i + 1, start}:
+                end = candidate + length - 1
+                if end > len(lines):
+                    continue
+                if self._hash_lines(lines[candidate - 1:end]) != self.symbol_hash:
+                    continue
+                if best is None or abs(candidate - self.line_start) < abs(best[0] - self.line_start):
+                    best = (candidate, end)
+        return best
+
+    def is_stale(self, project_path: str) -> bool:
+        """Check if the referenced symbol has changed.
+
+        A file that is unchanged as a whole is fresh; otherwise the
+        symbol is located again (it may have moved) and re-hashed.
+        """
+        if not super().is_stale(project_path):
+            return False
+        try:
+            with open(os.path.join(project_path, self.path), "r", encoding="utf-8", errors="ignore") as f:
+                lines = f.read().splitlines(keepends=True)
+        except OSError:
+            return True
+        return self.locate(lines) is None
+
+    @classmethod
+    def from_lines(
+        cls,
+        file_ref: CodeRef,
+        name: str,
+        lines: List[str],
+        line_start: int,
+        line_end: int,
+    ) -> "SymbolRef":
+        """Create a SymbolRef for a line range of a file.
+
+        Args:
+            file_ref: Whole-file CodeRef capturing the file's current state
+            name: Symbol name ("" for the module header)
+            lines: Current file lines (with line endings)
+            line_start: Starting line (1-indexed)
+            line_end: Ending line (1-indexed, inclusive)
+        """
+        return cls(
+            path=file_ref.path,
+            content_hash=file_ref.content_hash,
+            mtime=file_ref.mtime,
+            line_start=line_start,
+            line_end=line_end,
+            name=name,
+            symbol_hash=cls._hash_lines(lines[line_start - 1:line_end]),
+        )
+
+    def to_dict(self) -> dict:
+        """Serialize to dictionary for JSON storage."""
+        d = super().to_dict()
+        d["name"] = self.name
+        d["symbol_hash"] = self.symbol_hash
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "SymbolRef":
+        """Deserialize from dictionary."""
+        return cls(
+            path=d["path"],
+            content_hash=d["content_hash"],
+            mtime=d["mtime"],
+            line_start=d.get("line_start", 1),
+            line_end=d.get("line_end"),
+            name=d.get("name", ""),
+            symbol_hash=d.get("symbol_hash", ""),
+        )
+
+    def __repr__(self) -> str:
+        return f"SymbolRef({self.path}:{self.name or '<header>'}:{self.line_start}-{self.line_end})"
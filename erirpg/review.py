@@ -24,16 +24,16 @@ import json
 import os
 import glob
 
+from erirpg.tokens import get_estimator
+
 # Try to import from context, but provide fallbacks if tiktoken unavailable
 try:
     from erirpg.context import count_tokens, truncate_code, get_fence_language
 except ImportError:
     # Fallback implementations when tiktoken is not available
     def count_tokens(text: str) -> int:
-        """Estimate tokens using ~4 chars per token heuristic."""
-        if not text:
-            return 0
-        return len(text) // 4
+        """Estimate tokens with the fast per-extension estimator."""
+        return get_estimator().estimate(text)
     
     def truncate_code(code: str, max_tokens: int, file_path: str = "") -> tuple:
         """Simple truncation based on estimated tokens."""
@@ -1410,10 +1410,15 @@ def review_for_clone(
     return result
 
 
-def review_file(file_path: str, content: str, budget: int) -> List[ReviewItem]:
+def review_file(
+    file_path: str, content: str, budget: int, project_path: Optional[str] = None
+) -> List[ReviewItem]:
     """Review a single file within token budget."""
-    # Truncate if over budget
-    truncated, tokens, was_truncated = truncate_code(content, budget, file_path)
+    # Truncate if over budget (only counted exactly near the budget)
+    if get_estimator(project_path).fits(content, budget, file_path):
+        truncated, was_truncated = content, False
+    else:
+        truncated, _, was_truncated = truncate_code(content, budget, file_path)
     
     # Extract items from (possibly truncated) content
     items = extract_review_items(file_path, truncated)
@@ -1489,7 +1494,6 @@ def review_path(
     
     for file_path in files:
         content = read_file_content(file_path, use_full)
-        file_tokens = count_tokens(content)
         
         # Apply budget
         file_budget = min(per_file_budget, total_budget - tokens_used)
@@ -1504,8 +1508,10 @@ def review_path(
             ))
             continue
         
-        items = review_file(file_path, content, file_budget)
+        items = review_file(file_path, content, file_budget, project_path)
         all_items.extend(items)
+        # Exact only when the file is close to its budget
+        file_tokens = get_estimator(project_path).count(content, file_budget, file_path)
         tokens_used += min(file_tokens, file_budget)
     
     # Build result
@@ -2,12 +2,18 @@
 Search functionality for EriRPG knowledge.
 
 Provides keyword-based search over learnings with ranking
-by relevance, freshness, and confidence.
+by relevance, freshness, and confidence. Learnings are searched
+through a persistent BM25 inverted index that is updated
+incrementally as learnings change.
 """
 
+import json
+import math
+import os
 import re
+import zlib
 from datetime import datetime
-from typing import Dict, List, Set, Tuple, TYPE_CHECKING
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from erirpg.memory import StoredLearning
@@ -44,102 +50,289 @@ def jaccard_similarity(set1: Set[str], set2: Set[str]) -> float:
     return intersection / union if union > 0 else 0.0
 
 
+# Indexed learning fields and their BM25 weights
+LEARNING_FIELDS = ("path", "summary", "purpose", "functions", "gotchas")
+FIELD_WEIGHTS = {
+    "path": 2.0,
+    "summary": 3.0,
+    "purpose": 2.0,
+    "functions": 2.0,
+    "gotchas": 1.0,
+}
+BM25_K1 = 1.2
+BM25_B = 0.75
+INDEX_FORMAT = 1
+
+
+def tokenize_terms(text: str) -> List[str]:
+    """Tokenize text into lowercase words, keeping duplicates.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of lowercase word tokens in order
+    """
+    if not text:
+        return []
+    return re.findall(r'\w+', text.lower())
+
+
+def learning_fields(module_path: str, learning: "StoredLearning") -> Dict[str, str]:
+    """Get the searchable text of a learning, per field."""
+    return {
+        "path": module_path.replace("/", " ").replace("_", " "),
+        "summary": learning.summary,
+        "purpose": learning.purpose,
+        "functions": " ".join(
+            f"{name} {desc}" for name, desc in learning.key_functions.items()
+        ),
+        "gotchas": " ".join(learning.gotchas),
+    }
+
+
+def _fingerprint(fields: Dict[str, str]) -> int:
+    """Cheap, process-stable fingerprint of a learning's indexed text."""
+    return zlib.crc32("\x00".join(fields[f] for f in LEARNING_FIELDS).encode("utf-8"))
+
+
+class LearningIndex:
+    """Persistent inverted index over learnings with BM25F-style scoring.
+
+    Each field is scored with BM25 against its own average length and the
+    per-field scores are combined with FIELD_WEIGHTS. Documents are keyed
+    by module path and carry a fingerprint of their text, so sync() only
+    re-tokenizes learnings that actually changed.
+
+    Storage: .eri-rpg/search-index.json
+    """
+
+    def __init__(self):
+        self.stamp: Optional[str] = None
+        # term -> {module_path: [tf per field in LEARNING_FIELDS order]}
+        self.postings: Dict[str, Dict[str, List[int]]] = {}
+        # module_path -> {"fp": int, "len": [len per field], "terms": [unique terms]}
+        self.docs: Dict[str, dict] = {}
+        self.total_len: List[int] = [0] * len(LEARNING_FIELDS)
+        self.dirty = False
+
+    # Maintenance
+
+    def add(self, module_path: str, learning: "StoredLearning") -> None:
+        """Index (or re-index) a single learning."""
+        fields = learning_fields(module_path, learning)
+        self._add_fields(module_path, fields, _fingerprint(fields))
+
+    def _add_fields(self, module_path: str, fields: Dict[str, str], fp: int) -> None:
+        if module_path in self.docs:
+            self.remove(module_path)
+
+        lengths = []
+        tfs: Dict[str, List[int]] = {}
+        for i, name in enumerate(LEARNING_FIELDS):
+            terms = tokenize_terms(fields[name])
+            lengths.append(len(terms))
+            for term in terms:
+                tfs.setdefault(term, [0] * len(LEARNING_FIELDS))[i] += 1
+
+        for term, tf in tfs.items():
+            self.postings.setdefault(term, {})[module_path] = tf
+        for i, n in enumerate(lengths):
+            self.total_len[i] += n
+        self.docs[module_path] = {"fp": fp, "len": lengths, "terms": list(tfs)}
+        self.dirty = True
+
+    def remove(self, module_path: str) -> bool:
+        """Drop a learning from the index. Returns True if it was indexed."""
+        doc = self.docs.pop(module_path, None)
+        if doc is None:
+            return False
+        for term in doc["terms"]:
+            posting = self.postings.get(term)
+            if posting is not None:
+                posting.pop(module_path, None)
+                if not posting:
+                    del self.postings[term]
+        for i, n in enumerate(doc["len"]):
+            self.total_len[i] -= n
+        self.dirty = True
+        return True
+
+    def sync(self, learnings: Dict[str, "StoredLearning"]) -> int:
+        """Bring the index in line with a set of learnings.
+
+        Only new or changed learnings are re-tokenized.
+
+        Returns:
+            Number of documents added, updated or removed
+        """
+        changed = 0
+        for module_path in [p for p in self.docs if p not in learnings]:
+            self.remove(module_path)
+            changed += 1
+        for module_path, learning in learnings.items():
+            fields = learning_fields(module_path, learning)
+            fp = _fingerprint(fields)
+            doc = self.docs.get(module_path)
+            if doc is None or doc["fp"] != fp:
+                self._add_fields(module_path, fields, fp)
+                changed += 1
+        return changed
+
+    # Scoring
+
+    def score(self, query: str) -> Dict[str, float]:
+        """Score every document that matches at least one query term."""
+        n_docs = len(self.docs)
+        if not n_docs:
+            return {}
+        avg_len = [max(total / n_docs, 1e-9) for total in self.total_len]
+        weights = [FIELD_WEIGHTS[name] for name in LEARNING_FIELDS]
+
+        scores: Dict[str, float] = {}
+        for term in set(tokenize_terms(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            df = len(posting)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for module_path, tf in posting.items():
+                lengths = self.docs[module_path]["len"]
+                term_score = 0.0
+                for i, f in enumerate(tf):
+                    if not f:
+                        continue
+                    norm = 1 - BM25_B + BM25_B * lengths[i] / avg_len[i]
+                    term_score += weights[i] * f * (BM25_K1 + 1) / (f + BM25_K1 * norm)
+                scores[module_path] = scores.get(module_path, 0.0) + idf * term_score
+        return scores
+
+    # Persistence
+
+    def to_dict(self) -> dict:
+        return {
+            "format": INDEX_FORMAT,
+            "stamp": self.stamp,
+            "total_len": self.total_len,
+            "docs": self.docs,
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "LearningIndex":
+        index = cls()
+        if d.get("format") != INDEX_FORMAT:
+            return index
+        index.stamp = d.get("stamp")
+        index.total_len = d.get("total_len", index.total_len)
+        index.docs = d.get("docs", {})
+        index.postings = d.get("postings", {})
+        return index
+
+    def save(self, path: str) -> None:
+        """Write the index if it changed since it was loaded."""
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: str) -> "LearningIndex":
+        """Load an index, or return an empty one if missing or unreadable."""
+        if not os.path.exists(path):
+            return cls()
+        try:
+            with open(path, "r") as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError) as e:
+            import sys; print(f"[EriRPG] Rebuilding search index: {e}", file=sys.stderr)
+            return cls()
+
+
 def search_learnings(
     learnings: Dict[str, "StoredLearning"],
     query: str,
     limit: int = 10,
     project_path: str = None,
+    index: Optional[LearningIndex] = None,
 ) -> List[Tuple[str, "StoredLearning", float]]:
     """Search learnings by query.
 
-    Scoring components:
-    - Path match: 0.2 weight (module path contains query terms)
-    - Summary match: 0.3 weight (summary text matches)
-    - Purpose match: 0.2 weight (purpose text matches)
-    - Functions match: 0.2 weight (function names/descriptions)
-    - Gotchas match: 0.1 weight (gotcha text matches)
+    Scoring is BM25 per field, combined with weights:
+    - Summary: 3.0
+    - Path, purpose, functions: 2.0
+    - Gotchas: 1.0
 
-    Boosted by:
-    - Recency: +0.1 for learnings < 7 days old
+    Adjusted by:
+    - Exact phrase in path or summary: x1.25
+    - Recency: x1.1 for learnings < 7 days old, x1.05 < 30 days
     - Confidence: multiplied by confidence score
-    - Freshness: -0.2 if stale (when project_path provided)
+    - Freshness: x0.5 if stale (when project_path provided, top results only)
 
     Args:
         learnings: Dict of module_path -> StoredLearning
         query: Search query (space-separated keywords)
         limit: Maximum results to return
         project_path: Optional project path for staleness checking
+        index: Index already synced with learnings; built in memory if omitted
 
     Returns:
         List of (module_path, learning, score) tuples sorted by score
     """
-    query_tokens = tokenize(query)
-
-    if not query_tokens:
+    if not tokenize(query):
         return []
 
-    results = []
-
-    for module_path, learning in learnings.items():
-        score = 0.0
-
-        # Path match (0.2 weight)
-        path_tokens = tokenize(module_path.replace("/", " ").replace("_", " "))
-        path_score = jaccard_similarity(query_tokens, path_tokens)
-        score += path_score * 0.2
-
-        # Exact path substring match bonus
-        if query.lower() in module_path.lower():
-            score += 0.15
+    if index is None:
+        index = LearningIndex()
+        index.sync(learnings)
 
-        # Summary match (0.3 weight)
-        summary_tokens = tokenize(learning.summary)
-        summary_score = jaccard_similarity(query_tokens, summary_tokens)
-        score += summary_score * 0.3
-
-        # Exact phrase in summary bonus
-        if query.lower() in learning.summary.lower():
-            score += 0.2
-
-        # Purpose match (0.2 weight)
-        purpose_tokens = tokenize(learning.purpose)
-        purpose_score = jaccard_similarity(query_tokens, purpose_tokens)
-        score += purpose_score * 0.2
+    query_lower = query.lower()
+    now = datetime.now()
+    results = []
 
-        # Functions match (0.2 weight)
-        func_text = " ".join(
-            f"{name} {desc}"
-            for name, desc in learning.key_functions.items()
-        )
-        func_tokens = tokenize(func_text)
-        func_score = jaccard_similarity(query_tokens, func_tokens)
-        score += func_score * 0.2
+    for module_path, score in index.score(query).items():
+        learning = learnings.get(module_path)
+        if learning is None:
+            continue  # Indexed but removed since
 
-        # Gotchas match (0.1 weight)
-        gotcha_text = " ".join(learning.gotchas)
-        gotcha_tokens = tokenize(gotcha_text)
-        gotcha_score = jaccard_similarity(query_tokens, gotcha_tokens)
-        score += gotcha_score * 0.1
+        # Exact phrase bonus
+        if query_lower in module_path.lower() or query_lower in learning.summary.lower():
+            score *= 1.25
 
         # Recency boost
-        days_old = (datetime.now() - learning.learned_at).days
+        days_old = (now - learning.learned_at).days
         if days_old < 7:
-            score += 0.1
+            score *= 1.1
         elif days_old < 30:
-            score += 0.05
+            score *= 1.05
 
         # Confidence multiplier
         score *= learning.confidence
 
-        # Staleness penalty
-        if project_path and learning.is_stale(project_path):
-            score -= 0.2
-
         if score > 0.01:  # Threshold to filter noise
             results.append((module_path, learning, score))
 
-    # Sort by score descending
     results.sort(key=lambda x: x[2], reverse=True)
+
+    # Staleness stats/hashes files, so only check the top of the ranking
+    if project_path:
+        from erirpg.staleness import get_staleness_service
+
+        top = results[:limit * 2]
+        stale = get_staleness_service(project_path).check_refs(
+            {path: learning.source_ref for path, learning, _ in top}
+        )
+        top = [
+            (path, learning, score * 0.5 if stale[path] else score)
+            for path, learning, score in top
+        ]
+        top.sort(key=lambda x: x[2], reverse=True)
+        results = top
+
     return results[:limit]
 
 
@@ -0,0 +1,234 @@
+"""
+Symbol-level slicing of feature code.
+
+Inlining whole modules into context is wasteful when a feature touches
+a few functions of a large file. Slicing keeps, per component, only:
+
+- the module header (imports and setup before the first definition)
+- the top-level functions and classes the feature actually uses
+- their transitive local callees (symbols of the same module they name)
+
+Symbol ranges come from the interface line numbers stored in the graph:
+a symbol runs from its definition line (plus any decorators above it) up
+to the line before the next symbol. Each slice is recorded as a SymbolRef
+with a hash of its own lines, so an edit elsewhere in the file does not
+invalidate it, and lines added or removed above it only move it (it is
+located again by name when rendering).
+
+Which symbols are "used":
+- primary module: symbols whose names match the feature query (all of
+  them if none match)
+- other components: symbols named by the slices already selected in
+  modules that depend on them (components are walked dependents-first)
+
+A component falls back to the whole file when nothing in it is
+referenced, its symbols have no line numbers, or every symbol is needed.
+
+Usage:
+    refs = slice_feature(graph, project.path, components, primary, query)
+    code = render_slices(text, refs[path], path)
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from erirpg.refs import CodeRef, SymbolRef
+
+if TYPE_CHECKING:
+    from erirpg.graph import Graph, Module
+
+IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+NAME_PART_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+# Interface types that start a top-level slice
+SLICE_TYPES = {
+    "class", "function", "async_function", "def", "fn", "struct", "enum",
+    "trait", "impl", "mixin", "extension", "typedef", "macro",
+}
+
+# Query terms shorter than this don't select symbols
+MIN_QUERY_TERM = 3
+
+# Extensions whose line comments start with "#"
+HASH_COMMENT_EXTS = {"py", "pyi", "rb", "sh", "yaml", "yml", "toml"}
+
+# Name of the SymbolRef holding the module header
+HEADER = ""
+
+
+def name_parts(name: str) -> List[str]:
+    """Split a snake_case or CamelCase identifier into lowercase words."""
+    parts = []
+    for chunk in name.split("_"):
+        parts.extend(p.lower() for p in NAME_PART_RE.findall(chunk))
+    return parts
+
+
+def matches_query(name: str, query: str) -> bool:
+    """Whether a symbol name shares a word (or word stem) with the query."""
+    terms = [t for t in re.findall(r"\w+", query.lower()) if len(t) >= MIN_QUERY_TERM]
+    for part in name_parts(name):
+        if len(part) < MIN_QUERY_TERM:
+            continue
+        for term in terms:
+            if term.startswith(part) or part.startswith(term):
+                return True
+    return False
+
+
+def symbol_ranges(module: "Module", lines: List[str]) -> Dict[str, Tuple[int, int]]:
+    """Line ranges (1-indexed, inclusive) of a module's top-level symbols.
+
+    Args:
+        module: Graph module with interface line numbers
+        lines: Current file lines
+
+    Returns:
+        Dict of symbol name -> (start, end); HEADER maps to the lines
+        before the first symbol (absent if there are none)
+    """
+    starts = []
+    seen = set()
+    for iface in module.interfaces:
+        if iface.type not in SLICE_TYPES or not iface.line or iface.name in seen:
+            continue
+        if iface.line > len(lines):
+            continue
+        seen.add(iface.name)
+        start = iface.line
+        # Decorators belong to the symbol they decorate
+        while start > 1 and lines[start - 2].lstrip().startswith("@"):
+            start -= 1
+        starts.append((start, iface.name))
+    starts.sort()
+
+    ranges: Dict[str, Tuple[int, int]] = {}
+    if starts and starts[0][0] > 1:
+        ranges[HEADER] = (1, starts[0][0] - 1)
+    for i, (start, name) in enumerate(starts):
+        end = starts[i + 1][0] - 1 if i + 1 < len(starts) else len(lines)
+        # Trailing blank lines are separators, not part of the symbol
+        while end > start and not lines[end - 1].strip():
+            end -= 1
+        ranges[name] = (start, max(start, end))
+    return ranges
+
+
+def _identifiers(lines: List[str], start: int, end: int) -> Set[str]:
+    return set(IDENTIFIER_RE.findall("".join(lines[start - 1:end])))
+
+
+def select_symbols(
+    ranges: Dict[str, Tuple[int, int]],
+    lines: List[str],
+    roots: Set[str],
+) -> Set[str]:
+    """Close a set of root symbols over their local callees."""
+    symbols = set(ranges) - {HEADER}
+    selected = set(roots) & symbols
+    frontier = list(selected)
+    while frontier:
+        name = frontier.pop()
+        start, end = ranges[name]
+        for ident in _identifiers(lines, start, end) & symbols:
+            if ident not in selected:
+                selected.add(ident)
+                frontier.append(ident)
+    return selected
+
+
+def slice_feature(
+    graph: "Graph",
+    project_path: str,
+    components: List[str],
+    primary: str,
+    query: str,
+) -> Dict[str, List[SymbolRef]]:
+    """Build symbol slices for a feature's components.
+
+    Args:
+        graph: Source project graph
+        project_path: Source project root
+        components: Component paths, dependencies first
+        primary: Primary module path
+        query: Query the feature was extracted with
+
+    Returns:
+        Dict of path -> SymbolRefs in file order; components that should
+        be included whole are absent
+    """
+    result: Dict[str, List[SymbolRef]] = {}
+    referenced: Set[str] = set()
+
+    for path in reversed(components):
+        module = graph.get_module(path)
+        full_path = os.path.join(project_path, path)
+        try:
+            with open(full_path, "r", encoding="utf-8", errors="ignore") as f:
+                lines = f.read().splitlines(keepends=True)
+        except OSError:
+            continue
+        if module is None:
+            referenced |= set(IDENTIFIER_RE.findall("".join(lines)))
+            continue
+
+        ranges = symbol_ranges(module, lines)
+        symbols = set(ranges) - {HEADER}
+        if path == primary:
+            roots = {name for name in symbols if matches_query(name, query)}
+        else:
+            roots = symbols & referenced
+        selected = select_symbols(ranges, lines, roots)
+
+        if not selected or selected == symbols:
+            # Whole file: everything in it may be used
+            referenced |= set(IDENTIFIER_RE.findall("".join(lines)))
+            continue
+
+        file_ref = CodeRef.from_file(project_path, path)
+        refs = []
+        for name, (start, end) in sorted(ranges.items(), key=lambda item: item[1]):
+            if name == HEADER or name in selected:
+                refs.append(SymbolRef.from_lines(file_ref, name, lines, start, end))
+                if name != HEADER:
+                    referenced |= _identifiers(lines, start, end)
+        result[path] = refs
+
+    return result
+
+
+def render_slices(text: str, refs: List[SymbolRef], path: str = "") -> Optional[str]:
+    """Render a component's slices from its current text.
+
+    Each slice is located in text first, so slices that moved (lines
+    added or removed above them) still render. Gaps between slices are
+    marked with a comment giving the number of omitted lines.
+
+    Returns:
+        The sliced code, or None if any slice no longer matches text
+    """
+    lines = text.splitlines(keepends=True)
+    spans = []
+    for ref in refs:
+        span = ref.locate(lines)
+        if span is None:
+            return None
+        spans.append(span)
+    spans.sort()
+    if any(spans[i][0] <= spans[i - 1][1] for i in range(1, len(spans))):
+        return None
+
+    ext = os.path.splitext(path)[1].lstrip(".").lower()
+    comment = "#" if ext in HASH_COMMENT_EXTS else "//"
+    out = []
+    pos = 1
+    for start, end in spans:
+        if start > pos:
+            out.append(f"\n{comment} ... ({start - pos} lines omitted)\n\n")
+        chunk = "".join(lines[start - 1:end])
+        out.append(chunk if chunk.endswith("\n") else chunk + "\n")
+        pos = end + 1
+    if pos <= len(lines):
+        out.append(f"\n{comment} ... ({len(lines) - pos + 1} lines omitted)\n")
+    return "".join(out)
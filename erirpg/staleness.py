@@ -0,0 +1,203 @@
+"""
+Batched staleness checks for EriRPG.
+
+Checking whether a learning is stale means comparing its CodeRef against
+the file on disk, which needs a SHA-256 of the file whenever its mtime
+moved. This module checks many refs at once:
+
+- A persistent (inode, size, mtime_ns) -> hash cache means a file is
+  only re-hashed when its stat signature changed since it was last seen.
+- Files that do need hashing are hashed on a thread pool (hashlib
+  releases the GIL on large buffers).
+
+Storage structure:
+    .eri-rpg/
+    └── hash-cache.json   # path -> [inode, size, mtime_ns, sha256]
+
+Usage:
+    service = get_staleness_service(project_path)
+    stale = service.check_refs({path: learning.source_ref, ...})
+"""
+
+import atexit
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from erirpg.refs import CodeRef
+
+# Shared per-project services for this process
+_services: Dict[str, "StalenessService"] = {}
+
+
+def hash_path(full_path: str) -> str:
+    """Compute the full SHA-256 hex digest of a file (same as CodeRef)."""
+    hasher = hashlib.sha256()
+    with open(full_path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class HashCache:
+    """Persistent stat-keyed file hash cache."""
+
+    def __init__(self, project_path: str):
+        self.project_path = project_path
+        self.cache_file = os.path.join(project_path, ".eri-rpg", "hash-cache.json")
+        self.entries: Dict[str, list] = {}
+        self.dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, "r") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, rel_path: str, st: os.stat_result) -> Optional[str]:
+        """Return the cached hash if the file's stat signature is unchanged."""
+        entry = self.entries.get(rel_path)
+        if entry and entry[:3] == [st.st_ino, st.st_size, st.st_mtime_ns]:
+            return entry[3]
+        return None
+
+    def put(self, rel_path: str, st: os.stat_result, digest: str) -> None:
+        self.entries[rel_path] = [st.st_ino, st.st_size, st.st_mtime_ns, digest]
+        self.dirty = True
+
+    def save(self) -> None:
+        """Write the cache if it changed (and .eri-rpg/ exists)."""
+        if not self.dirty or not os.path.isdir(os.path.dirname(self.cache_file)):
+            return
+        tmp = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp, self.cache_file)
+            self.dirty = False
+        except OSError as e:
+            import sys; print(f"[EriRPG] Could not save hash cache: {e}", file=sys.stderr)
+
+
+class StalenessService:
+    """Checks staleness of many CodeRefs against one project tree."""
+
+    def __init__(self, project_path: str, max_workers: Optional[int] = None):
+        self.project_path = project_path
+        self.max_workers = max_workers or min(16, (os.cpu_count() or 2) * 2)
+        self.cache = HashCache(project_path)
+
+    def hashes(self, rel_paths: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Current content hash for each path (None if missing/unreadable).
+
+        Only files whose stat signature changed since they were cached are
+        read; those are hashed in parallel.
+        """
+        result: Dict[str, Optional[str]] = {}
+        to_hash: Dict[str, os.stat_result] = {}
+
+        for rel in set(rel_paths):
+            try:
+                st = os.stat(os.path.join(self.project_path, rel))
+            except OSError:
+                result[rel] = None
+                continue
+            cached = self.cache.get(rel, st)
+            if cached is not None:
+                result[rel] = cached
+            else:
+                to_hash[rel] = st
+
+        if to_hash:
+            result.update(self._hash_many(to_hash))
+        return result
+
+    def _hash_many(self, to_hash: Dict[str, os.stat_result]) -> Dict[str, Optional[str]]:
+        rels = list(to_hash)
+
+        def _one(rel: str) -> Optional[str]:
+            try:
+                return hash_path(os.path.join(self.project_path, rel))
+            except OSError:
+                return None
+
+        if len(rels) == 1 or self.max_workers <= 1:
+            digests = [_one(rel) for rel in rels]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                digests = list(pool.map(_one, rels))
+
+        out = {}
+        for rel, digest in zip(rels, digests):
+            out[rel] = digest
+            if digest is not None:
+                self.cache.put(rel, to_hash[rel], digest)
+        return out
+
+    def current_hash(self, rel_path: str) -> Optional[str]:
+        """Current content hash of a single file."""
+        return self.hashes([rel_path]).get(rel_path)
+
+    def check_refs(self, refs: Mapping[Hashable, Optional["CodeRef"]]) -> Dict[Hashable, bool]:
+        """Check many refs at once.
+
+        Uses the same rules as CodeRef.is_stale: missing files are stale,
+        an unchanged mtime means fresh, otherwise the content hash decides.
+        Refs that are None are never stale.
+
+        Args:
+            refs: key -> CodeRef (e.g. module path -> learning.source_ref)
+
+        Returns:
+            key -> True if stale
+        """
+        result: Dict[Hashable, bool] = {}
+        need_hash: Dict[Hashable, "CodeRef"] = {}
+
+        for key, ref in refs.items():
+            if ref is None:
+                result[key] = False
+                continue
+            try:
+                mtime = os.path.getmtime(os.path.join(self.project_path, ref.path))
+            except OSError:
+                result[key] = True  # File deleted
+                continue
+            if mtime == ref.mtime:
+                result[key] = False  # Quick path: unchanged
+            else:
+                need_hash[key] = ref
+
+        if need_hash:
+            current = self.hashes(ref.path for ref in need_hash.values())
+            for key, ref in need_hash.items():
+                result[key] = current.get(ref.path) != ref.content_hash
+
+        self.cache.save()
+        return result
+
+    def stale_paths(self, refs: Mapping[Hashable, Optional["CodeRef"]]) -> List[Hashable]:
+        """Keys of the refs that are stale, in input order."""
+        checked = self.check_refs(refs)
+        return [key for key in refs if checked[key]]
+
+
+def get_staleness_service(project_path: str) -> StalenessService:
+    """Get the shared staleness service for a project in this process.
+
+    The hash cache is written back at interpreter exit if it changed.
+    """
+    key = os.path.abspath(project_path)
+    service = _services.get(key)
+    if service is None:
+        service = StalenessService(project_path)
+        _services[key] = service
+        atexit.register(service.cache.save)
+    return service
@@ -11,6 +11,8 @@ from typing import Dict, List, Optional
 import json
 import os
 
+from erirpg.locking import atomic_write_json, file_lock, merge_fields, read_json
+
 
 @dataclass
 class State:
@@ -43,6 +45,7 @@ class State:
     history: List[Dict] = field(default_factory=list)
 
     _state_dir: str = field(default="", repr=False)
+    _base: Optional[Dict] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
         if not self._state_dir:
@@ -134,20 +137,16 @@ class State:
         return "Unknown state. Run: eri-rpg status"
 
     def save(self) -> None:
-        """Save state to disk."""
-        os.makedirs(self._state_dir, exist_ok=True)
+        """Save state to disk.
 
-        # Load existing state to preserve fields we don't track (like persona)
-        existing = {}
-        if os.path.exists(self._state_path):
-            try:
-                with open(self._state_path, "r") as f:
-                    existing = json.load(f)
-            except Exception:
-                pass
+        Runs under the state file lock. If this state was loaded from disk
+        and another process has written since, the two versions are merged
+        field by field (history entries from both are kept) instead of the
+        last writer winning.
+        """
+        os.makedirs(self._state_dir, exist_ok=True)
 
         data = {
-            **existing,  # Preserve fields we don't manage
             "active_project": self.active_project,
             "target_project": self.target_project,
             "target_project_path": self.target_project_path,
@@ -160,8 +159,29 @@ class State:
             "history": self.history[-50:],  # Keep last 50 entries
         }
 
-        with open(self._state_path, "w") as f:
-            json.dump(data, f, indent=2)
+        with file_lock(self._state_path):
+            # Load existing state to preserve fields we don't track (like persona)
+            existing = read_json(self._state_path)
+            if not isinstance(existing, dict):
+                existing = {}
+
+            if self._base is not None and existing != self._base:
+                data = merge_fields(self._base, {**existing, **data}, existing)
+                data["history"] = sorted(
+                    data.get("history") or [], key=lambda e: e.get("timestamp", "")
+                )[-50:]
+                # Adopt the merged values, or the next save would see our
+                # stale fields as changes and revert the other writer
+                for name in ("active_project", "target_project", "target_project_path",
+                             "current_task", "phase", "waiting_on", "context_file",
+                             "feature_file", "plan_file"):
+                    setattr(self, name, data.get(name))
+                self.history = list(data["history"])
+            else:
+                data = {**existing, **data}  # Preserve fields we don't manage
+
+            atomic_write_json(self._state_path, data)
+            self._base = data
 
     @classmethod
     def load(cls) -> "State":
@@ -183,7 +203,8 @@ class State:
             state.context_file = data.get("context_file")
             state.feature_file = data.get("feature_file")
             state.plan_file = data.get("plan_file")
-            state.history = data.get("history", [])
+            state.history = list(data.get("history", []))
+            state._base = data
 
         return state
 
@@ -6,17 +6,28 @@ Two-line status display:
   Line 1: Project | Phase | Persona | Context%
   Line 2: Branch | Tier | Knowledge | Tests | Tokens
 
+Everything read from disk (global and project state, registry, config,
+knowledge, .planning/STATE.md, the git branch) is cached per project in
+.eri-rpg/statusline.json together with the stat of each input file, so
+a render with unchanged inputs costs a few stats and one small read.
+
 Usage:
     echo '{"context_window":{"used_percentage":45,"used_tokens":50000}}' | python3 statusline.py
 """
 
 import json
 import os
-import subprocess
 import sys
 from pathlib import Path
 from typing import Optional, Tuple
 
+if __package__:
+    from erirpg.hooks.gitrefs import current_branch, head_path
+    from erirpg.hooks.global_state import flush_pending
+else:
+    from hooks.gitrefs import current_branch, head_path
+    from hooks.global_state import flush_pending
+
 # Default persona when nothing else applies
 DEFAULT_PERSONA = "analyzer"
 
@@ -56,6 +67,15 @@ ACTION_PERSONA_DEFAULTS = {
     "quick-done": "analyzer",
 }
 
+# Render cache in <project>/.eri-rpg/
+CACHE_FILE = "statusline.json"
+CACHE_VERSION = 1
+# Cached cwds per project (most recently rebuilt kept)
+MAX_CACHE_ENTRIES = 8
+
+# Parent levels searched for .eri-rpg/ and .planning/
+MAX_SEARCH_LEVELS = 5
+
 
 def load_global_state() -> dict:
     """Load global state from ~/.eri-rpg/state.json"""
@@ -120,18 +140,9 @@ def get_active_persona(global_state: dict) -> str:
     return DEFAULT_PERSONA
 
 
-def get_git_branch() -> Optional[str]:
-    """Get current git branch name."""
-    try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-            capture_output=True, text=True, timeout=2
-        )
-        if result.returncode == 0:
-            return result.stdout.strip()
-    except:
-        pass
-    return None
+def get_git_branch(cwd: Optional[str] = None) -> Optional[str]:
+    """Get current git branch name from .git/HEAD ("HEAD" if detached)."""
+    return current_branch(cwd or os.getcwd())
 
 
 def get_project_tier(project_path: str) -> str:
@@ -250,7 +261,7 @@ def get_coder_phase_info(cwd: str) -> Tuple[Optional[int], Optional[int], Option
 
     # Search from cwd upward for .planning/STATE.md
     search_path = Path(cwd)
-    for _ in range(5):  # Max 5 levels up
+    for _ in range(MAX_SEARCH_LEVELS):
         state_file = search_path / ".planning" / "STATE.md"
         if state_file.exists():
             try:
@@ -285,7 +296,7 @@ def get_coder_project_name(cwd: str) -> Optional[str]:
         Project name (directory name) or None if no .planning/ found
     """
     search_path = Path(cwd)
-    for _ in range(5):  # Max 5 levels up
+    for _ in range(MAX_SEARCH_LEVELS):
         planning_dir = search_path / ".planning"
         if planning_dir.exists():
             # Use directory name - simple and reliable
@@ -318,6 +329,133 @@ def format_tokens(tokens: Optional[int]) -> str:
     return str(tokens)
 
 
+def find_project_dir(cwd: str) -> Optional[str]:
+    """Nearest directory (up to MAX_SEARCH_LEVELS up) with .eri-rpg/."""
+    search_path = Path(cwd)
+    for _ in range(MAX_SEARCH_LEVELS):
+        if (search_path / ".eri-rpg").exists():
+            return str(search_path)
+        search_path = search_path.parent
+    return None
+
+
+def collect_facts(cwd: str) -> dict:
+    """Read everything the status line shows from disk."""
+    global_state = load_global_state()
+    registry = load_registry()
+
+    # Get project name - priority order:
+    # 1. target_project (explicitly switched to, persists across edits)
+    # 2. active_project (legacy, for backwards compat)
+    # 3. cwd-based detection
+    # Note: active_edited_project is NOT used here - that's just for tracking
+    # what was last edited, not what project user is working ON.
+    project_name = global_state.get("target_project") or global_state.get("active_project")
+
+    # Fallback to cwd-based detection
+    if not project_name:
+        project_name = get_coder_project_name(cwd)
+
+    if not project_name:
+        project_name, _, _ = get_project_info(registry, cwd)
+
+    # For tier, check cwd
+    project_dir = find_project_dir(cwd)
+    project_path = project_dir or cwd
+    tier = get_project_tier(project_dir) if project_dir else None
+
+    coder_current, coder_total, coder_status = get_coder_phase_info(cwd)
+    model_provider, model_display = get_model_provider_info(project_path)
+
+    return {
+        "project_name": project_name,
+        "tier": tier,
+        "persona": get_active_persona(global_state),
+        "phase": global_state.get("phase", "idle"),
+        "branch": get_git_branch(cwd),
+        "knowledge": get_knowledge_count(project_path),
+        "test_status": get_last_test_status(project_path),
+        # Current task comes from PROJECT state, not global
+        "current_task": get_project_state(project_path).get("current_task"),
+        "coder_current": coder_current,
+        "coder_total": coder_total,
+        "coder_status": coder_status,
+        "model_provider": model_provider,
+        "model_display": model_display,
+    }
+
+
+def fact_sources(cwd: str) -> list:
+    """Every file collect_facts(cwd) reads (or would read if it existed)."""
+    eri_home = Path.home() / ".eri-rpg"
+    eri_dir = Path(find_project_dir(cwd) or cwd) / ".eri-rpg"
+    sources = [
+        eri_home / "state.json",
+        eri_home / "registry.json",
+        eri_dir / "config.json",
+        eri_dir / "knowledge.json",
+        eri_dir / "verification.json",
+        eri_dir / "state.json",
+    ]
+    search_path = Path(cwd)
+    for _ in range(MAX_SEARCH_LEVELS):
+        sources.append(search_path / ".planning")
+        sources.append(search_path / ".planning" / "STATE.md")
+        if search_path == search_path.parent:
+            break
+        search_path = search_path.parent
+    head = head_path(cwd)
+    if head:
+        sources.append(Path(head))
+    return [str(path) for path in sources]
+
+
+def _stamp(paths: list) -> dict:
+    stamps = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamps[path] = [st.st_mtime_ns, st.st_size]
+        except OSError:
+            stamps[path] = None
+    return stamps
+
+
+def load_facts(cwd: str, project_root: str) -> dict:
+    """Status line facts for cwd, served from the render cache when valid.
+
+    The cache (<project_root>/.eri-rpg/statusline.json) holds one entry
+    per cwd with the stat of every input file; any changed stat (or
+    input created/removed) rebuilds the entry.
+    """
+    cache_path = Path(project_root) / ".eri-rpg" / CACHE_FILE
+    sources = _stamp(fact_sources(cwd))
+
+    try:
+        cache = json.loads(cache_path.read_text())
+        if cache.get("version") != CACHE_VERSION:
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+    entries = cache.get("entries", {})
+    entry = entries.get(cwd)
+    if entry and entry.get("sources") == sources:
+        return entry["facts"]
+
+    facts = collect_facts(cwd)
+    entries.pop(cwd, None)
+    entries[cwd] = {"sources": sources, "facts": facts}
+    while len(entries) > MAX_CACHE_ENTRIES:
+        entries.pop(next(iter(entries)))
+    tmp = cache_path.with_name(f"{CACHE_FILE}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(json.dumps({"version": CACHE_VERSION, "entries": entries}))
+        os.replace(tmp, cache_path)
+    except OSError:
+        pass  # Cache is best effort
+    return facts
+
+
 def main():
     """Main entry point."""
     # Read input from Claude Code
@@ -369,7 +507,7 @@ def main():
         if context_pct is not None:
             line1_parts.append(f"🔄 {context_pct}%")
 
-        branch = get_git_branch()
+        branch = get_git_branch(cwd)
         if branch:
             branch_display = branch[:15] + "…" if len(branch) > 15 else branch
             line2_parts.append(f"🌿 {branch_display}")
@@ -388,91 +526,40 @@ def main():
             print(line2)
         return
 
-    # Load state (only for eri-rpg projects)
-    global_state = load_global_state()
-    registry = load_registry()
-
-    # Get project name - priority order:
-    # 1. target_project (explicitly switched to, persists across edits)
-    # 2. active_project (legacy, for backwards compat)
-    # 3. cwd-based detection
-    # Note: active_edited_project is NOT used here - that's just for tracking
-    # what was last edited, not what project user is working ON.
-    project_name = global_state.get("target_project")
-
-    if not project_name:
-        # Check active_project from global state (legacy)
-        active_proj = global_state.get("active_project")
-        if active_proj:
-            project_name = active_proj
-            # Also get project_path from registry for this project
-            proj_info = registry.get(active_proj, {})
-            if proj_info.get("path"):
-                project_path = proj_info["path"]
-
-    # Fallback to cwd-based detection
-    if not project_name:
-        project_name = get_coder_project_name(cwd)
-
-    if not project_name:
-        project_name, project_path, _ = get_project_info(registry, cwd)
-
-    # For tier, check cwd
-    project_path = cwd
-    tier = None
-    search_path = Path(cwd)
-    for _ in range(5):
-        if (search_path / ".eri-rpg").exists():
-            project_path = str(search_path)
-            tier = get_project_tier(project_path)
-            break
-        search_path = search_path.parent
-
-    # Gather all info
-    persona = get_active_persona(global_state)
-    phase = global_state.get("phase", "idle")
-    branch = get_git_branch()
-    knowledge = get_knowledge_count(project_path)
-    test_status = get_last_test_status(project_path)
-
-    # Get project-specific state for current_task
-    project_state = get_project_state(project_path)
-
-    # Get coder phase info (from .planning/STATE.md)
-    coder_current, coder_total, coder_status = get_coder_phase_info(cwd)
+    # Land a debounced persona change whose window has ended
+    flush_pending()
 
-    # Get model provider info for the project
-    model_provider, model_display = "claude", "balanced"
-    if project_path:
-        model_provider, model_display = get_model_provider_info(project_path)
+    facts = load_facts(cwd, project_root)
+    coder_current, coder_total = facts["coder_current"], facts["coder_total"]
+    branch, tier = facts["branch"], facts["tier"]
 
     # === LINE 1: Model | Phase | Persona | Context | Task ===
     line1_parts = []
 
     # Show model with appropriate icon
     # 🤖 = Claude/Anthropic, 🏠 = local model
-    if model_provider == "local":
-        line1_parts.append(f"🏠 {model_display}")
+    if facts["model_provider"] == "local":
+        line1_parts.append(f"🏠 {facts['model_display']}")
     elif model_name:
         line1_parts.append(f"🤖 {model_name}")
 
     # Show coder phase with progress bar (takes priority over eri phase)
     if coder_current is not None and coder_total is not None:
         progress = format_progress_bar(coder_current, coder_total, width=8)
-        if coder_status == "done":
+        if facts["coder_status"] == "done":
             line1_parts.append(f"✅ Phase {coder_current}/{coder_total} {progress}")
         else:
             line1_parts.append(f"🔨 Phase {coder_current}/{coder_total} {progress}")
-    elif phase and phase != "idle":
-        line1_parts.append(f"📍 {phase}")
+    elif facts["phase"] and facts["phase"] != "idle":
+        line1_parts.append(f"📍 {facts['phase']}")
 
-    line1_parts.append(f"🎭 {persona}")
+    line1_parts.append(f"🎭 {facts['persona']}")
 
     if context_pct is not None:
         line1_parts.append(f"🔄 {context_pct}%")
 
     # Current task/section - from PROJECT state, not global
-    current_task = project_state.get("current_task")
+    current_task = facts["current_task"]
     if current_task:
         # Truncate long task names
         task_display = current_task[:30] + "…" if len(current_task) > 30 else current_task
@@ -491,14 +578,14 @@ def main():
         line2_parts.append(f"{tier_icons.get(tier, '⚡')} {tier}")
 
     # Bold white project name (ANSI: \033[1;37m = bold white, \033[0m = reset)
-    if project_name:
-        line2_parts.append(f"\033[1;37mProject: {project_name}\033[0m")
+    if facts["project_name"]:
+        line2_parts.append(f"\033[1;37mProject: {facts['project_name']}\033[0m")
 
-    if knowledge > 0:
-        line2_parts.append(f"🧠 {knowledge}")
+    if facts["knowledge"] > 0:
+        line2_parts.append(f"🧠 {facts['knowledge']}")
 
-    if test_status:
-        line2_parts.append(f"🧪 {test_status}")
+    if facts["test_status"]:
+        line2_parts.append(f"🧪 {facts['test_status']}")
 
     if tokens_used:
         line2_parts.append(f"📊 {format_tokens(tokens_used)}")
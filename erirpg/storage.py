@@ -1017,6 +1017,78 @@ def end_session(
     )
 
 
+def save_session_snapshot(
+    session_id: str,
+    project_name: str,
+    phase: Optional[str] = None,
+    step: Optional[str] = None,
+    progress_pct: int = 0,
+    files_modified: Optional[List[str]] = None,
+    since_decision_id: int = 0,
+    db_path: Optional[str] = None,
+) -> dict:
+    """Create or update a session in a single transaction.
+
+    Used at compaction time, where one connection and one commit replace
+    the separate get/create/update round trips. Only non-None phase,
+    step and files_modified overwrite an existing session. Status files
+    are not synced; callers sync when the snapshot changed.
+
+    Args:
+        since_decision_id: Report decisions with a greater id as new
+
+    Returns:
+        Dict with "created", "new_decisions" (decision texts),
+        "last_decision_id" and "fingerprint" (changes whenever the
+        session's decisions, blockers, actions or learnings change)
+    """
+    import json
+    init_db(db_path)
+    files_json = json.dumps(files_modified) if files_modified is not None else None
+
+    with get_connection(db_path) as conn:
+        with conn:
+            cursor = conn.execute("""
+                UPDATE sessions SET
+                    phase = COALESCE(?, phase),
+                    step = COALESCE(?, step),
+                    progress_pct = ?,
+                    files_modified = COALESCE(?, files_modified)
+                WHERE id = ?
+            """, (phase, step, progress_pct, files_json, session_id))
+            created = cursor.rowcount == 0
+            if created:
+                conn.execute("""
+                    INSERT INTO sessions (id, project_name, started_at, phase, step, progress_pct, files_modified)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (session_id, project_name, datetime.now().isoformat(), phase, step,
+                      progress_pct, files_json))
+
+            new_decisions = conn.execute("""
+                SELECT id, decision FROM decisions
+                WHERE session_id = ? AND id > ? ORDER BY id
+            """, (session_id, since_decision_id)).fetchall()
+            fingerprint = [
+                list(conn.execute(f"""
+                    SELECT COUNT(*), COALESCE(MAX(id), 0), COALESCE(SUM({done}), 0)
+                    FROM {table} WHERE session_id = ?
+                """, (session_id,)).fetchone())
+                for table, done in (
+                    ("decisions", "archived"),
+                    ("blockers", "resolved"),
+                    ("next_actions", "completed"),
+                    ("session_learnings", "0"),
+                )
+            ]
+
+    return {
+        "created": created,
+        "new_decisions": [row["decision"] for row in new_decisions],
+        "last_decision_id": new_decisions[-1]["id"] if new_decisions else since_decision_id,
+        "fingerprint": fingerprint,
+    }
+
+
 # Decision operations
 
 def add_decision(
@@ -0,0 +1,263 @@
+"""
+Sparse TF-IDF index over graph modules.
+
+Built at index time and stored next to the graph so that module search
+(ops.find_modules) does not re-tokenize every module's summary, interface
+names and docstrings for each query.
+
+The index is a sparse term x module matrix per field, stored column-wise
+as postings (term -> [(module_idx, weight), ...]) with L2-normalized
+module vectors. A query is a sparse vector; scoring is a sparse dot
+product that only touches modules sharing a term with the query. Many
+queries can be scored in one pass over the postings of their union of
+terms.
+
+Storage structure:
+    .eri-rpg/
+    ├── graph.json
+    └── tfidf.json     # Rebuildable from graph.json
+
+Usage:
+    index = get_module_index(graph, project.graph_path)
+    scores = index.score("token budget")
+    batch = index.score_batch(["auth", "cache"])
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from erirpg.graph import Graph, Module
+
+# Field -> weight in the combined score (path only gates a flat bonus)
+FIELD_WEIGHTS = {
+    "summary": 0.5,
+    "names": 0.3,
+    "docs": 0.2,
+}
+PATH_BONUS = 0.1
+PHRASE_BONUS = 0.3
+INDEX_FORMAT = 1
+
+# In-process cache: (project, indexed_at) -> ModuleIndex
+_index_cache: Dict[Tuple[str, str], "ModuleIndex"] = {}
+
+
+def _terms(text: str) -> List[str]:
+    """Tokenize text into lowercase words (keeps underscores)."""
+    return re.findall(r'\w+', text.lower())
+
+
+def module_fields(mod: "Module") -> Dict[str, str]:
+    """Get the searchable text of a module, per field."""
+    return {
+        "summary": mod.summary,
+        "names": " ".join(i.name for i in mod.interfaces),
+        "docs": " ".join(i.docstring for i in mod.interfaces),
+        "path": mod.path.replace("/", " ").replace("_", " "),
+    }
+
+
+class ModuleIndex:
+    """Sparse TF-IDF matrices (one per field) over a graph's modules."""
+
+    def __init__(self):
+        self.stamp: str = ""
+        self.paths: List[str] = []
+        self.summaries: List[str] = []  # lowercased, for the phrase bonus
+        # field -> term -> [[module_idx, weight], ...]
+        self.postings: Dict[str, Dict[str, List[List[float]]]] = {}
+        # field -> term -> idf
+        self.idf: Dict[str, Dict[str, float]] = {}
+        # term -> [module_idx, ...]
+        self.path_postings: Dict[str, List[int]] = {}
+
+    @classmethod
+    def build(cls, graph: "Graph") -> "ModuleIndex":
+        """Build the index from a graph (one pass over every module)."""
+        index = cls()
+        index.stamp = graph.indexed_at.isoformat()
+
+        counts: Dict[str, List[Counter]] = {name: [] for name in FIELD_WEIGHTS}
+        for idx, mod in enumerate(graph.modules.values()):
+            fields = module_fields(mod)
+            index.paths.append(mod.path)
+            index.summaries.append(mod.summary.lower())
+            for name in FIELD_WEIGHTS:
+                counts[name].append(Counter(_terms(fields[name])))
+            for term in set(_terms(fields["path"])):
+                index.path_postings.setdefault(term, []).append(idx)
+
+        n_docs = len(index.paths)
+        for name, docs in counts.items():
+            df: Counter = Counter()
+            for tf in docs:
+                df.update(tf.keys())
+            idf = {t: math.log((1 + n_docs) / (1 + d)) + 1 for t, d in df.items()}
+
+            postings: Dict[str, List[List[float]]] = {}
+            for idx, tf in enumerate(docs):
+                if not tf:
+                    continue
+                weights = {t: c * idf[t] for t, c in tf.items()}
+                norm = math.sqrt(sum(w * w for w in weights.values()))
+                for t, w in weights.items():
+                    postings.setdefault(t, []).append([idx, w / norm])
+            index.postings[name] = postings
+            index.idf[name] = idf
+
+        return index
+
+    def _query_vector(self, field_name: str, terms: List[str]) -> Dict[str, float]:
+        """Binary TF-IDF query vector for one field, L2-normalized."""
+        idf = self.idf.get(field_name, {})
+        weights = {t: idf[t] for t in set(terms) if t in idf}
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        return {t: w / norm for t, w in weights.items()} if norm else {}
+
+    def score_batch(self, queries: List[str]) -> List[Dict[int, float]]:
+        """Score several queries against every module.
+
+        Each postings list is walked once for all queries that share its
+        term.
+
+        Returns:
+            One dict per query: module_idx -> score (matching modules only)
+        """
+        query_terms = [_terms(q) for q in queries]
+        results: List[Dict[int, float]] = [{} for _ in queries]
+
+        for name, field_weight in FIELD_WEIGHTS.items():
+            # term -> [(query_idx, query_weight), ...]
+            wanted: Dict[str, List[Tuple[int, float]]] = {}
+            for qi, terms in enumerate(query_terms):
+                for t, w in self._query_vector(name, terms).items():
+                    wanted.setdefault(t, []).append((qi, w * field_weight))
+
+            postings = self.postings.get(name, {})
+            for t, consumers in wanted.items():
+                for idx, doc_w in postings.get(t, ()):
+                    idx = int(idx)
+                    for qi, qw in consumers:
+                        scores = results[qi]
+                        scores[idx] = scores.get(idx, 0.0) + qw * doc_w
+
+        for qi, (query, terms) in enumerate(zip(queries, query_terms)):
+            scores = results[qi]
+            path_hits = set()
+            for t in set(terms):
+                path_hits.update(self.path_postings.get(t, ()))
+            for idx in path_hits:
+                scores[idx] = scores.get(idx, 0.0) + PATH_BONUS
+
+            phrase = query.lower()
+            if phrase:
+                for idx in scores:
+                    if phrase in self.summaries[idx]:
+                        scores[idx] += PHRASE_BONUS
+
+        return results
+
+    def score(self, query: str) -> Dict[int, float]:
+        """Score a single query. See score_batch."""
+        return self.score_batch([query])[0]
+
+    # Persistence
+
+    def to_dict(self) -> dict:
+        return {
+            "format": INDEX_FORMAT,
+            "stamp": self.stamp,
+            "paths": self.paths,
+            "summaries": self.summaries,
+            "postings": self.postings,
+            "idf": self.idf,
+            "path_postings": self.path_postings,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "ModuleIndex":
+        index = cls()
+        index.stamp = d.get("stamp", "")
+        index.paths = d.get("paths", [])
+        index.summaries = d.get("summaries", [])
+        index.postings = d.get("postings", {})
+        index.idf = d.get("idf", {})
+        index.path_postings = d.get("path_postings", {})
+        return index
+
+    def save(self, path: str) -> None:
+        """Save index to JSON file."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["ModuleIndex"]:
+        """Load index from JSON file, or None if missing/unreadable."""
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("format") != INDEX_FORMAT:
+            return None
+        return cls.from_dict(data)
+
+
+def get_index_path(graph_path: str) -> str:
+    """Get the TF-IDF index path that sits next to a graph.json file."""
+    return os.path.join(os.path.dirname(graph_path), "tfidf.json")
+
+
+def build_module_index(graph: "Graph", graph_path: Optional[str] = None) -> "ModuleIndex":
+    """Build the index for a graph and save it next to graph.json.
+
+    Args:
+        graph: Freshly indexed graph
+        graph_path: Path to graph.json (index is only cached in memory if omitted)
+
+    Returns:
+        The built ModuleIndex
+    """
+    index = ModuleIndex.build(graph)
+    _index_cache[(graph.project, index.stamp)] = index
+    if graph_path and os.path.isdir(os.path.dirname(graph_path)):
+        try:
+            index.save(get_index_path(graph_path))
+        except OSError as e:
+            import sys; print(f"[EriRPG] Could not save TF-IDF index: {e}", file=sys.stderr)
+    return index
+
+
+def get_module_index(graph: "Graph", graph_path: Optional[str] = None) -> "ModuleIndex":
+    """Get the index for a graph, from memory, disk, or by building it.
+
+    A stored index is only used if it was built for the same indexing
+    run (matching graph.indexed_at).
+
+    Args:
+        graph: Project graph
+        graph_path: Path to graph.json, to find a stored index
+
+    Returns:
+        ModuleIndex for the graph
+    """
+    stamp = graph.indexed_at.isoformat()
+    key = (graph.project, stamp)
+    cached = _index_cache.get(key)
+    if cached is not None and len(cached.paths) == len(graph.modules):
+        return cached
+
+    if graph_path:
+        stored = ModuleIndex.load(get_index_path(graph_path))
+        if stored is not None and stored.stamp == stamp and len(stored.paths) == len(graph.modules):
+            _index_cache[key] = stored
+            return stored
+
+    return build_module_index(graph, graph_path)
@@ -0,0 +1,200 @@
+"""
+Fast token estimation for EriRPG.
+
+Exact counting (context.count_tokens) needs tiktoken plus its BPE ranks,
+which is too slow to load for hooks, previews and other hot paths that
+only need approximate counts. This module estimates tokens from character
+counts using a chars-per-token ratio per file extension, with a relative
+error bound for each:
+
+- Defaults are rough cl100k ratios with wide error bounds.
+- Whenever context generation counts a module exactly, the (chars,
+  tokens) pair is recorded as a calibration sample for its extension, so
+  ratios and error bounds converge to the project's own code. Each
+  (path, content) pair is sampled once, so unchanged modules regenerated
+  run after run don't drown out the rest.
+- count() only falls back to exact tiktoken counting when the estimate's
+  error band straddles the caller's limit.
+
+This module never imports tiktoken itself.
+
+Storage structure:
+    .eri-rpg/
+    └── token-calibration.json   # ext -> [[chars, tokens, key], ...] samples
+
+Usage:
+    estimator = get_estimator(project_path)
+    approx = estimator.estimate(code, "src/app.py")
+    low, high = estimator.bounds(code, "src/app.py")
+    tokens = estimator.count(code, limit=2000, path="src/app.py")
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+# Extension -> default chars per token (cl100k, rough)
+DEFAULT_CHARS_PER_TOKEN = {
+    "py": 3.6,
+    "pyi": 3.6,
+    "js": 3.4,
+    "jsx": 3.4,
+    "ts": 3.4,
+    "tsx": 3.4,
+    "rs": 3.3,
+    "go": 3.4,
+    "c": 3.3,
+    "h": 3.3,
+    "cpp": 3.2,
+    "hpp": 3.2,
+    "md": 4.2,
+    "txt": 4.2,
+    "json": 3.0,
+    "yaml": 3.4,
+    "yml": 3.4,
+}
+FALLBACK_CHARS_PER_TOKEN = 3.5
+
+# Relative error bound when an extension isn't calibrated yet
+DEFAULT_ERROR = 0.35
+# Never claim a tighter bound than this
+MIN_ERROR = 0.05
+# Samples needed before calibration replaces the defaults
+MIN_SAMPLES = 5
+# Samples kept per extension (most recent)
+MAX_SAMPLES = 64
+# Texts shorter than this are too noisy to calibrate with
+MIN_SAMPLE_TOKENS = 50
+
+# Shared estimators for this process: project path (or "") -> estimator
+_estimators: Dict[str, "TokenEstimator"] = {}
+
+
+def _ext(path: str) -> str:
+    """Lowercase extension of a path without the dot ("" if none)."""
+    return os.path.splitext(path)[1].lstrip(".").lower()
+
+
+class TokenEstimator:
+    """Per-extension chars-per-token estimator with error bounds."""
+
+    def __init__(self, calibration_file: Optional[str] = None):
+        self.calibration_file = calibration_file
+        # ext -> [[chars, tokens, key], ...] (key: hash of path and content)
+        self.samples: Dict[str, List[List[int]]] = {}
+        self._ratios: Dict[str, Tuple[float, float]] = {}
+        self.dirty = False
+        if calibration_file:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.calibration_file, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict):
+            self.samples = data.get("samples", {})
+
+    def ratio(self, path: str = "") -> Tuple[float, float]:
+        """Chars per token and relative error bound for a path's extension."""
+        ext = _ext(path)
+        cached = self._ratios.get(ext)
+        if cached is not None:
+            return cached
+
+        samples = self.samples.get(ext, [])
+        if len(samples) < MIN_SAMPLES:
+            result = (DEFAULT_CHARS_PER_TOKEN.get(ext, FALLBACK_CHARS_PER_TOKEN), DEFAULT_ERROR)
+        else:
+            chars = sum(s[0] for s in samples)
+            tokens = sum(s[1] for s in samples)
+            ratio = chars / tokens
+            error = max(abs(s[0] / ratio - s[1]) / s[1] for s in samples)
+            result = (ratio, max(MIN_ERROR, error))
+
+        self._ratios[ext] = result
+        return result
+
+    def estimate(self, text: str, path: str = "") -> int:
+        """Estimated token count of text (typed by path's extension)."""
+        if not text:
+            return 0
+        ratio, _ = self.ratio(path)
+        return max(1, round(len(text) / ratio))
+
+    def bounds(self, text: str, path: str = "") -> Tuple[int, int]:
+        """Low and high token counts the exact count should fall within."""
+        estimate = self.estimate(text, path)
+        _, error = self.ratio(path)
+        return int(estimate * (1 - error)), int(estimate * (1 + error)) + 1
+
+    def count(self, text: str, limit: int, path: str = "") -> int:
+        """Token count that is exact only where it matters for limit.
+
+        If the error band lies entirely below or above limit, the estimate
+        is returned (the fits/doesn't-fit answer can't change). Otherwise
+        the text is counted exactly with tiktoken, if available.
+        """
+        low, high = self.bounds(text, path)
+        if high <= limit or low > limit:
+            return self.estimate(text, path)
+        try:
+            from erirpg.context import count_tokens
+        except ImportError:
+            return self.estimate(text, path)
+        return count_tokens(text)
+
+    def fits(self, text: str, limit: int, path: str = "") -> bool:
+        """Whether text fits in limit tokens (exact near the limit)."""
+        return self.count(text, limit, path) <= limit
+
+    def observe(self, path: str, text: str, tokens: int) -> None:
+        """Record an exact count as a calibration sample.
+
+        A path whose content was already sampled is not sampled again.
+        """
+        if tokens < MIN_SAMPLE_TOKENS:
+            return
+        ext = _ext(path)
+        key = hashlib.blake2b(
+            f"{path}\0{text}".encode("utf-8", "surrogatepass"), digest_size=8
+        ).hexdigest()
+        samples = self.samples.setdefault(ext, [])
+        if any(len(s) > 2 and s[2] == key for s in samples):
+            return
+        samples.append([len(text), tokens, key])
+        del samples[:-MAX_SAMPLES]
+        self._ratios.pop(ext, None)
+        self.dirty = True
+
+    def save(self) -> None:
+        """Write calibration samples if they changed (and the dir exists)."""
+        if not self.dirty or not self.calibration_file:
+            return
+        if not os.path.isdir(os.path.dirname(self.calibration_file)):
+            return
+        tmp = f"{self.calibration_file}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w") as f:
+                json.dump({"samples": self.samples}, f)
+            os.replace(tmp, self.calibration_file)
+            self.dirty = False
+        except OSError as e:
+            import sys; print(f"[EriRPG] Could not save token calibration: {e}", file=sys.stderr)
+
+
+def get_calibration_path(project_path: str) -> str:
+    """Get the token calibration file path for a project."""
+    return os.path.join(project_path, ".eri-rpg", "token-calibration.json")
+
+
+def get_estimator(project_path: Optional[str] = None) -> TokenEstimator:
+    """Get the shared estimator for a project (defaults only if None)."""
+    key = os.path.abspath(project_path) if project_path else ""
+    estimator = _estimators.get(key)
+    if estimator is None:
+        estimator = TokenEstimator(get_calibration_path(project_path) if project_path else None)
+        _estimators[key] = estimator
+    return estimator
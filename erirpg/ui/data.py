@@ -6,6 +6,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from erirpg.memory import get_knowledge_path, read_knowledge_data
+
 REGISTRY_PATH = Path.home() / ".eri-rpg" / "registry.json"
 
 
@@ -45,14 +47,15 @@ def load_state(project_path: str) -> Dict[str, Any]:
 
 
 def load_knowledge(project_path: str) -> Dict[str, Any]:
-    """Load project knowledge.json."""
+    """Load project knowledge.json, with journaled mutations applied."""
     try:
-        knowledge_file = Path(project_path) / ".eri-rpg" / "knowledge.json"
-        if knowledge_file.exists():
-            return json.loads(knowledge_file.read_text())
-    except (json.JSONDecodeError, IOError):
-        pass
-    return {"learnings": {}, "decisions": [], "patterns": {}}
+        knowledge = read_knowledge_data(get_knowledge_path(project_path))
+    except (ValueError, IOError):
+        knowledge = {}
+    knowledge.setdefault("learnings", {})
+    knowledge.setdefault("decisions", [])
+    knowledge.setdefault("patterns", {})
+    return knowledge
 
 
 def load_graph(project_path: str) -> Dict[str, Any]:
@@ -155,6 +158,21 @@ def check_staleness(project_path: str, file_path: str, source_ref: Dict) -> bool
         return False
 
 
+def check_staleness_batch(project_path: str, learnings: Dict[str, Dict]) -> Dict[str, bool]:
+    """Check staleness of many raw learnings at once (hash-cached)."""
+    from erirpg.refs import CodeRef
+    from erirpg.staleness import get_staleness_service
+
+    refs = {}
+    for file_path, data in learnings.items():
+        source_ref = data.get("source_ref")
+        refs[file_path] = CodeRef.from_dict(source_ref) if source_ref else None
+    try:
+        return get_staleness_service(project_path).check_refs(refs)
+    except (IOError, OSError):
+        return {file_path: False for file_path in learnings}
+
+
 def format_relative_time(timestamp: float) -> str:
     """Format timestamp as relative time."""
     now = datetime.now().timestamp()
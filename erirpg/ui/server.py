@@ -15,7 +15,7 @@ from fastapi.templating import Jinja2Templates
 from erirpg.ui.data import (
     get_all_projects, get_active_task, get_project, get_project_path,
     load_state, load_knowledge, load_runs, load_roadmap, load_graph,
-    get_git_log, get_drift_status, check_staleness, count_modules, count_learned,
+    get_git_log, get_drift_status, check_staleness_batch, count_modules, count_learned,
     get_project_mode, load_config
 )
 
@@ -88,16 +88,21 @@ def create_app() -> FastAPI:
         path = proj.get("path", "")
         knowledge = load_knowledge(path)
 
+        matching = {
+            file_path: data
+            for file_path, data in knowledge.get("learnings", {}).items()
+            if not search or search.lower() in file_path.lower()
+        }
+        staleness = check_staleness_batch(path, matching)
+
         learnings = []
-        for file_path, data in knowledge.get("learnings", {}).items():
-            if search and search.lower() not in file_path.lower():
-                continue
+        for file_path, data in matching.items():
             learnings.append({
                 "path": file_path,
                 "summary": data.get("summary", ""),
                 "confidence": data.get("confidence", 1.0),
                 "version": data.get("version", 1),
-                "stale": check_staleness(path, file_path, data.get("source_ref", {})),
+                "stale": staleness[file_path],
                 "drift_pattern": data.get("drift_pattern_id"),
                 "drift_confidence": data.get("drift_confidence")
             })
@@ -276,12 +281,16 @@ def create_app() -> FastAPI:
         knowledge = load_knowledge(str(path))
         learnings_data = knowledge.get("learnings", {})
 
-        learnings = []
-        for file_path, data in learnings_data.items():
-            if search and search.lower() not in file_path.lower():
-                continue
+        matching = {
+            file_path: data
+            for file_path, data in learnings_data.items()
+            if not search or search.lower() in file_path.lower()
+        }
+        staleness = check_staleness_batch(str(path), matching)
 
-            is_stale = check_staleness(str(path), file_path, data.get("source_ref", {}))
+        learnings = []
+        for file_path, data in matching.items():
+            is_stale = staleness[file_path]
             learnings.append({
                 "path": file_path,
                 "summary": data.get("summary", ""),
@@ -0,0 +1,200 @@
+"""
+Tests for token counting in erirpg.context.
+
+A fake word-splitting encoder stands in for tiktoken so these run
+without downloading BPE ranks.
+"""
+
+import pytest
+
+from erirpg import context
+
+
+class FakeEncoder:
+    """Counts one token per whitespace-separated word."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text):
+        self.calls += 1
+        return text.split()
+
+
+@pytest.fixture
+def encoder(tmp_path, monkeypatch):
+    fake = FakeEncoder()
+    monkeypatch.setattr(context, "_ENCODER", fake)
+    monkeypatch.setattr(context, "TOKEN_CACHE_PATH", str(tmp_path / "token-cache.json"))
+    monkeypatch.setattr(context, "_token_cache", None)
+    monkeypatch.setattr(context, "_token_cache_dirty", False)
+    return fake
+
+
+def _source(n, word="x"):
+    return " ".join(f"{word}{i}" for i in range(n))
+
+
+class TestTokenCache:
+    """Tests for the content-hash keyed token-count cache."""
+
+    def test_same_text_encoded_once(self, encoder):
+        text = _source(100)
+        assert context.count_tokens(text) == 100
+        assert context.count_tokens(text) == 100
+        assert encoder.calls == 1
+
+    def test_short_text_not_cached(self, encoder):
+        context.count_tokens("a b c")
+        context.count_tokens("a b c")
+        assert encoder.calls == 2
+        assert not context._get_token_cache()
+
+    def test_lru_eviction(self, encoder, monkeypatch):
+        monkeypatch.setattr(context, "TOKEN_CACHE_SIZE", 2)
+        a, b, c = _source(100, "a"), _source(100, "b"), _source(100, "c")
+        context.count_tokens(a)
+        context.count_tokens(b)
+        context.count_tokens(a)  # a is now most recent
+        context.count_tokens(c)  # evicts b
+        calls = encoder.calls
+        context.count_tokens(a)
+        assert encoder.calls == calls
+        context.count_tokens(b)
+        assert encoder.calls == calls + 1
+
+    def test_table_persists_across_processes(self, encoder, tmp_path, monkeypatch):
+        text = _source(120)
+        context.count_tokens(text)
+        context.save_token_cache()
+        assert (tmp_path / "token-cache.json").exists()
+
+        # Simulate a new process
+        monkeypatch.setattr(context, "_token_cache", None)
+        calls = encoder.calls
+        assert context.count_tokens(text) == 120
+        assert encoder.calls == calls
+
+
+class TestTruncateCode:
+    """Tests for single-pass truncate_code."""
+
+    def _code(self, n):
+        lines = []
+        for i in range(n):
+            if i % 10 == 0:
+                lines.append(f"def func_{i}(a, b):")
+            else:
+                lines.append(f"    value_{i} = a + b + {i}")
+        return "\n".join(lines)
+
+    def test_fits_unchanged(self, encoder):
+        code = self._code(5)
+        assert context.truncate_code(code, 1000) == (code, context.count_tokens(code), False)
+
+    def test_encodes_each_line_once(self, encoder):
+        code = self._code(300)
+        truncated, tokens, was_truncated = context.truncate_code(code, 400, "big.py")
+
+        assert was_truncated
+        assert tokens <= 400
+        # Full count + one pass over the lines + final count
+        assert encoder.calls == 300 + 2
+        assert "# Full source: big.py" in truncated
+
+    def test_keeps_as_many_lines_as_fit(self, encoder):
+        code = self._code(300)
+        truncated, tokens, _ = context.truncate_code(code, 400)
+        head = truncated.split("\n\n# ...")[0].split("\n")
+
+        # One more line would not fit alongside the marker
+        more = "\n".join(code.split("\n")[:len(head) + 1])
+        assert context.count_tokens(more) > 400 - 15
+
+    def test_keep_signatures(self, encoder):
+        code = self._code(300)
+        truncated, tokens, _ = context.truncate_code(code, 400, keep_signatures=True)
+
+        assert tokens <= 400
+        assert "# Signatures in truncated part:" in truncated
+        assert truncated.rstrip().endswith("def func_290(a, b):")
+        head = truncated.split("\n\n# ...")[0]
+        assert "value_299" not in head
+
+
+class TestTokenEstimator:
+    """Tests for the calibrated fast estimator in erirpg.tokens."""
+
+    def test_uncalibrated_uses_defaults(self):
+        from erirpg.tokens import TokenEstimator, DEFAULT_ERROR
+
+        estimator = TokenEstimator()
+        assert estimator.estimate("x" * 360, "a.py") == 100
+        assert estimator.ratio("a.py")[1] == DEFAULT_ERROR
+        low, high = estimator.bounds("x" * 360, "a.py")
+        assert low < 100 < high
+
+    def test_calibration_tightens_bounds(self, tmp_path):
+        from erirpg.tokens import TokenEstimator
+
+        estimator = TokenEstimator(str(tmp_path / "token-calibration.json"))
+        for n in range(5, 15):
+            estimator.observe("m.rs", "y" * (n * 250), n * 100)  # 2.5 chars/token
+
+        ratio, error = estimator.ratio("lib.rs")
+        assert ratio == pytest.approx(2.5)
+        assert error < 0.1
+        assert estimator.estimate("y" * 500, "lib.rs") == 200
+
+        estimator.save()
+        reloaded = TokenEstimator(str(tmp_path / "token-calibration.json"))
+        assert reloaded.ratio("lib.rs")[0] == pytest.approx(2.5)
+
+    def test_exact_only_near_limit(self, monkeypatch):
+        from erirpg.tokens import TokenEstimator
+
+        exact_calls = []
+
+        def exact(text):
+            exact_calls.append(text)
+            return 123
+
+        monkeypatch.setattr(context, "count_tokens", exact)
+        estimator = TokenEstimator()
+        text = "x" * 360  # ~100 tokens, +-35%
+
+        assert estimator.count(text, limit=1000, path="a.py") == 100
+        assert estimator.count(text, limit=10, path="a.py") == 100
+        assert not exact_calls
+
+        assert estimator.count(text, limit=100, path="a.py") == 123
+        assert exact_calls == [text]
+        assert not estimator.fits(text, 100, "a.py")
+
+    def test_unchanged_content_sampled_once(self):
+        from erirpg.tokens import TokenEstimator
+
+        estimator = TokenEstimator()
+        code = "x" * 400
+        for _ in range(3):
+            estimator.observe("a.py", code, 100)
+        estimator.observe("b.py", code, 100)
+        estimator.observe("a.py", code + "y" * 40, 110)
+        assert len(estimator.samples["py"]) == 3
+
+    def test_review_skips_exact_count_well_under_budget(self, monkeypatch):
+        from erirpg import review
+
+        exact_calls = []
+        monkeypatch.setattr(context, "count_tokens", lambda text: exact_calls.append(text) or 0)
+        monkeypatch.setattr(review, "truncate_code", lambda *a: pytest.fail("truncated"))
+
+        review.review_file("small.py", "x = 1\n" * 20, budget=2000)
+        assert not exact_calls
+
+    def test_tiny_samples_ignored(self):
+        from erirpg.tokens import TokenEstimator
+
+        estimator = TokenEstimator()
+        estimator.observe("a.py", "x = 1", 4)
+        assert not estimator.samples
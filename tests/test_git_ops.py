@@ -0,0 +1,102 @@
+"""
+Tests for commit discovery in erirpg.coder.git_ops.
+"""
+
+import subprocess
+
+import pytest
+
+from erirpg.coder import git_ops
+
+
+def git(cwd, *args):
+    return subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=cwd, capture_output=True, text=True, check=True,
+    ).stdout.strip()
+
+
+def commit(repo, path, message):
+    (repo / path).parent.mkdir(parents=True, exist_ok=True)
+    (repo / path).write_text(message)
+    git(repo, "add", path)
+    git(repo, "commit", "-q", "-m", message)
+    return git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    git(tmp_path, "init", "-q", "-b", "main")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_iter_commits_streams_files(repo):
+    commit(repo, "a.py", "feat: first (01-01)")
+    sha = commit(repo, "b/c.py", "fix: second\n\nBody mentions (01-02)")
+
+    commits = list(git_ops.iter_commits([]))
+    assert [c["message"] for c in commits] == ["fix: second", "feat: first (01-01)"]
+    assert commits[0]["full_hash"] == sha
+    assert commits[0]["files"] == ["b/c.py"]
+    assert commits[0]["tags"] == ["01-02"]
+
+
+@pytest.mark.parametrize("use_index", [True, False])
+def test_plan_and_phase_commits(repo, use_index):
+    commit(repo, "a.py", "feat: a (02-01)")
+    commit(repo, "b.py", "feat: b (02-03)")
+    commit(repo, "c.py", "feat: c (03-01)")
+    commit(repo, "d.py", "docs: unrelated")
+
+    plan = git_ops.find_plan_commits("2-3", use_index=use_index)
+    assert [c["files"] for c in plan] == [["b.py"]]
+    assert set(plan[0]) == {"hash", "full_hash", "message", "files"}
+
+    phase = git_ops.find_phase_commits(2, use_index=use_index)
+    assert [c["message"] for c in phase] == ["feat: b (02-03)", "feat: a (02-01)"]
+
+
+def test_index_updates_incrementally(repo, monkeypatch):
+    commit(repo, "a.py", "feat: a (01-01)")
+    assert len(git_ops.load_commit_index()) == 1
+    assert (repo / ".git" / git_ops.COMMIT_INDEX_FILE).exists()
+
+    commit(repo, "b.py", "feat: b (01-02)")
+    calls = []
+    real = git_ops.iter_commits
+    monkeypatch.setattr(git_ops, "iter_commits", lambda args, cwd=None: calls.append(args) or real(args, cwd))
+
+    commits = git_ops.load_commit_index()
+    assert [c["message"] for c in commits] == ["feat: b (01-02)", "feat: a (01-01)"]
+    assert "--not" in calls[0]  # only the new commit was read
+
+
+def test_index_holds_only_tagged_commits(repo):
+    commit(repo, "a.py", "feat: a (01-01)")
+    commit(repo, "b.py", "docs: untagged")
+    commit(repo, "c.py", "chore: parens ( spaced )")
+
+    assert [c["message"] for c in git_ops.load_commit_index()] == ["feat: a (01-01)"]
+
+
+def test_index_rebuilds_after_rewrite(repo):
+    commit(repo, "a.py", "feat: a (01-01)")
+    commit(repo, "b.py", "feat: b (01-02)")
+    git_ops.load_commit_index()
+
+    git(repo, "reset", "-q", "--hard", "HEAD~1")
+    commit(repo, "c.py", "feat: c (01-03)")
+
+    assert [c["message"] for c in git_ops.load_commit_index()] == ["feat: c (01-03)", "feat: a (01-01)"]
+    assert git_ops.find_plan_commits("01-02") == []
+
+
+def test_untracked_commits(repo):
+    commit(repo, "a.py", "feat: planned (01-01)")
+    commit(repo, ".planning/STATE.md", "chore: status")
+    commit(repo, "fix.py", "manual fix")
+
+    untracked = git_ops.find_untracked_commits()
+    assert [c["message"] for c in untracked] == ["manual fix"]
+    assert untracked[0]["files"] == ["fix.py"]
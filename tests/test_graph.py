@@ -572,3 +572,42 @@ def test_get_transitive_deps():
     assert "src/module_b.py" in deps
     assert "src/module_c.py" in deps
     assert "src/module_a.py" not in deps  # Shouldn't include itself
+
+
+# TF-IDF module search (ops.find_modules)
+
+
+def test_ops_find_modules_ranks_summary_match(sample_graph):
+    """find_modules scores modules through the TF-IDF index."""
+    from erirpg.ops import find_modules
+
+    results = find_modules(sample_graph, "utilities")
+    assert results[0][0].path == "src/module_b.py"
+    assert all(score > 0 for _, score in results)
+    assert find_modules(sample_graph, "nonexistentterm") == []
+
+
+def test_ops_find_modules_batch_matches_single(sample_graph):
+    """Batch scoring returns the same ranking as one query at a time."""
+    from erirpg.ops import find_modules, find_modules_batch
+
+    queries = ["core functionality", "ClassB", "helper"]
+    batch = find_modules_batch(sample_graph, queries)
+    for query, results in zip(queries, batch):
+        single = find_modules(sample_graph, query)
+        assert [m.path for m, _ in results] == [m.path for m, _ in single]
+        assert [round(s, 9) for _, s in results] == [round(s, 9) for _, s in single]
+
+
+def test_module_index_persisted_next_to_graph(sample_graph, tmp_path):
+    """The index round-trips through tfidf.json and is keyed to indexed_at."""
+    from erirpg.tfidf import ModuleIndex, build_module_index, get_index_path, get_module_index
+
+    graph_path = tmp_path / "graph.json"
+    built = build_module_index(sample_graph, str(graph_path))
+    assert os.path.exists(get_index_path(str(graph_path)))
+
+    loaded = ModuleIndex.load(get_index_path(str(graph_path)))
+    assert loaded.stamp == sample_graph.indexed_at.isoformat()
+    assert loaded.score("ClassA") == built.score("ClassA")
+    assert get_module_index(sample_graph, str(graph_path)) is built
@@ -250,5 +250,632 @@ class TestHookEdgeCases:
         assert result.get("decision") != "block"
 
 
+class TestHookDaemon:
+    """Test the hook client shim and the resident hook daemon."""
+
+    def setup_method(self):
+        """Create a maintain-mode project and a private socket directory."""
+        self.temp_dir = str(Path.home() / ".eri-rpg-test" / f"daemon-{os.getpid()}")
+        self.project_path = self.temp_dir
+        eri_dir = Path(self.temp_dir) / ".eri-rpg"
+        (eri_dir / "runs").mkdir(parents=True, exist_ok=True)
+        (eri_dir / "config.json").write_text(json.dumps({"mode": "maintain"}))
+
+        self.socket_dir = tempfile.mkdtemp(prefix="hookd-")
+        self.socket_path = os.path.join(self.socket_dir, "hookd.sock")
+        self.client_script = Path(__file__).parent.parent / "erirpg" / "hooks" / "client.py"
+
+    def teardown_method(self):
+        """Cleanup temp directories."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        shutil.rmtree(self.socket_dir, ignore_errors=True)
+        parent = Path(self.temp_dir).parent
+        if parent.exists() and not any(parent.iterdir()):
+            parent.rmdir()
+
+    def _input(self, file_name="src/app.py"):
+        return json.dumps({
+            "tool_name": "Edit",
+            "tool_input": {"file_path": os.path.join(self.project_path, file_name)},
+            "cwd": self.project_path,
+        })
+
+    def _start_server(self):
+        import threading
+        from erirpg.hooks.daemon import HookServer
+
+        server = HookServer(self.socket_path)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def test_client_falls_back_without_daemon(self):
+        """Without a daemon the client runs the hook in-process."""
+        env = dict(os.environ, ERIRPG_HOOKD_SOCKET=self.socket_path)
+        result = subprocess.run(
+            ["python3", str(self.client_script), "pretooluse"],
+            input=self._input(),
+            capture_output=True,
+            text=True,
+            timeout=10,
+            env=env,
+        )
+        assert json.loads(result.stdout)["decision"] == "block"
+
+    def test_daemon_serves_hook(self):
+        """The daemon runs the hook and relays its output."""
+        from erirpg.hooks.client import forward
+
+        server = self._start_server()
+        try:
+            reply = forward("pretooluse", self._input(), self.socket_path)
+            assert reply["exit"] == 0
+            assert json.loads(reply["stdout"])["decision"] == "block"
+
+            # Picks up state changes between calls
+            eri_dir = Path(self.project_path) / ".eri-rpg"
+            (eri_dir / "config.json").write_text(json.dumps({"mode": "bootstrap", "x": 1}))
+            reply = forward("pretooluse", self._input(), self.socket_path)
+            assert json.loads(reply["stdout"]) == {}
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_daemon_defers_on_env_mismatch(self):
+        """A client with different ERIRPG_* env runs the hook itself."""
+        from erirpg.hooks.client import request
+
+        server = self._start_server()
+        try:
+            reply = request({
+                "hook": "pretooluse",
+                "stdin": self._input(),
+                "env": {"ERIRPG_HOOKS_DISABLED": "1", "ERIRPG_TEST_ONLY": "1"},
+            }, self.socket_path)
+            assert reply == {"fallback": True}
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_state_files_parsed_once_while_unchanged(self):
+        """read_json_cached reuses parsed data until the file changes."""
+        from erirpg.hooks.active import read_json_cached
+
+        config = Path(self.project_path) / ".eri-rpg" / "config.json"
+        first = read_json_cached(config)
+        assert read_json_cached(config) is first
+
+        config.write_text(json.dumps({"mode": "bootstrap", "changed": True}))
+        assert read_json_cached(config)["changed"] is True
+
+
+class TestHookTiming:
+    """Test per-phase hook latency records and their summary."""
+
+    def test_timer_accumulates_phases(self, tmp_path):
+        from erirpg.hooks.timing import HookTimer, load_records
+
+        path = str(tmp_path / "hook-timings.jsonl")
+        timer = HookTimer("pretooluse", loaded_at=0.0, path=path)
+        timer.phase("state")
+        timer.phase("decision")
+        timer.phase("state")
+        timer.finish()
+
+        [record] = load_records(path)
+        assert record["hook"] == "pretooluse"
+        assert set(record["ms"]) == {"imports", "state", "decision"}
+        assert record["total"] >= record["ms"]["state"]
+
+        # Import time is only counted for the first call after a load
+        second = HookTimer("pretooluse", loaded_at=0.0, path=path)
+        assert "imports" not in second.ms
+
+    def test_summarize_percentiles(self):
+        from erirpg.hooks.timing import percentile, summarize
+
+        records = [
+            {"hook": "posttooluse", "ms": {"write": float(i)}, "total": float(i)}
+            for i in range(1, 101)
+        ]
+        summary = summarize(records)["posttooluse"]
+
+        assert summary["total"] == {"n": 100, "p50": 50.0, "p95": 95.0, "p99": 99.0}
+        assert summary["write"]["p99"] == 99.0
+        assert percentile([], 50) == 0.0
+
+    def test_rotation_keeps_previous_file(self, tmp_path, monkeypatch):
+        from erirpg.hooks import timing
+
+        monkeypatch.setattr(timing, "MAX_TIMINGS_BYTES", 200)
+        path = str(tmp_path / "hook-timings.jsonl")
+        for i in range(10):
+            timing.append_record({"hook": "h", "ms": {}, "total": float(i)}, path)
+
+        assert os.path.exists(path + ".1")
+        assert os.path.getsize(path + ".1") <= 400
+        totals = [r["total"] for r in timing.load_records(path)]
+        assert totals == sorted(totals) and totals[-1] == 9.0
+
+    def test_hook_process_records_timing(self, tmp_path):
+        (tmp_path / ".eri-rpg").mkdir()
+        hook_script = Path(__file__).parent.parent / "erirpg" / "hooks" / "pretooluse.py"
+        subprocess.run(
+            ["python3", str(hook_script)],
+            input=json.dumps({"tool_name": "Glob", "tool_input": {}, "cwd": str(tmp_path)}),
+            capture_output=True,
+            text=True,
+            timeout=10,
+            env=dict(os.environ, HOME=str(tmp_path)),
+        )
+
+        lines = (tmp_path / ".eri-rpg" / "hook-timings.jsonl").read_text().splitlines()
+        record = json.loads(lines[-1])
+        assert record["hook"] == "pretooluse"
+        assert {"imports", "input", "project"} <= set(record["ms"])
+
+
+class TestModifiedFilesLog:
+    """Test the per-session modified-files logs written by posttooluse."""
+
+    def test_sessions_merge_and_dedup(self, tmp_path):
+        from erirpg.hooks.modified_files import append_modified, read_modified
+
+        (tmp_path / ".eri-rpg").mkdir()
+        append_modified(str(tmp_path), "s1", "/p/a.py")
+        append_modified(str(tmp_path), "s2", "/p/b.py")
+        append_modified(str(tmp_path), "s1", "/p/a.py")
+
+        assert sorted(read_modified(str(tmp_path))) == ["/p/a.py", "/p/b.py"]
+        assert len(list((tmp_path / ".eri-rpg" / "modified").iterdir())) == 2
+
+    def test_untracked_project_not_written(self, tmp_path):
+        from erirpg.hooks.modified_files import append_modified, read_modified
+
+        append_modified(str(tmp_path), "s1", "/p/a.py")
+        assert read_modified(str(tmp_path)) == []
+        assert not any(tmp_path.iterdir())
+
+    def test_old_sessions_rotate_out(self, tmp_path, monkeypatch):
+        from erirpg.hooks import modified_files
+
+        monkeypatch.setattr(modified_files, "MAX_SESSIONS", 3)
+        (tmp_path / ".eri-rpg").mkdir()
+        for i in range(5):
+            modified_files.append_modified(str(tmp_path), f"s{i}", f"/p/{i}.py")
+            log = tmp_path / ".eri-rpg" / "modified" / f"s{i}.log"
+            os.utime(log, (1000 + i, 1000 + i))
+
+        # Logs older than MAX_SESSION_AGE go too, except the new session's
+        modified_files.append_modified(str(tmp_path), "s5", "/p/5.py")
+        assert modified_files.read_modified(str(tmp_path)) == ["/p/5.py"]
+
+    def test_clear_keeps_files_tracked_after_read(self, tmp_path):
+        from erirpg.commit import clear_modified_files, get_modified_files
+        from erirpg.hooks.modified_files import append_modified
+
+        (tmp_path / ".eri-rpg").mkdir()
+        append_modified(str(tmp_path), "s1", "/p/a.py")
+        committed = get_modified_files(str(tmp_path))
+        append_modified(str(tmp_path), "s1", "/p/late.py")
+
+        clear_modified_files(str(tmp_path), committed)
+        assert get_modified_files(str(tmp_path)) == ["/p/late.py"]
+
+    def test_clear_accepts_relative_paths(self, tmp_path):
+        from erirpg.commit import clear_modified_files, get_modified_files
+        from erirpg.hooks.modified_files import append_modified
+
+        (tmp_path / ".eri-rpg").mkdir()
+        append_modified(str(tmp_path), "s1", str(tmp_path / "src" / "a.py"))
+        append_modified(str(tmp_path), "s1", str(tmp_path / "b.py"))
+
+        clear_modified_files(str(tmp_path), ["src/a.py"])
+        assert get_modified_files(str(tmp_path)) == [str(tmp_path / "b.py")]
+
+    def test_append_racing_clear_is_kept(self, tmp_path):
+        """A writer holding the log open across a clear doesn't lose its entry."""
+        from erirpg.hooks.modified_files import append_modified, clear_modified, read_modified
+
+        (tmp_path / ".eri-rpg").mkdir()
+        append_modified(str(tmp_path), "s1", "/p/a.py")
+        log = tmp_path / ".eri-rpg" / "modified" / "s1.log"
+        fd = os.open(log, os.O_WRONLY | os.O_APPEND)
+        try:
+            clear_modified(str(tmp_path), ["/p/a.py"])
+            os.write(fd, b"/p/late.py\n")
+        finally:
+            os.close(fd)
+
+        assert read_modified(str(tmp_path)) == ["/p/late.py"]
+
+    def test_posttooluse_appends_to_session_log(self, tmp_path):
+        project = tmp_path / "proj"
+        (project / ".eri-rpg").mkdir(parents=True)
+        hook_script = Path(__file__).parent.parent / "erirpg" / "hooks" / "posttooluse.py"
+        result = subprocess.run(
+            ["python3", str(hook_script)],
+            input=json.dumps({
+                "session_id": "abc-123",
+                "tool_name": "Edit",
+                "tool_input": {"file_path": str(project / "app.py")},
+                "cwd": str(project),
+            }),
+            capture_output=True,
+            text=True,
+            timeout=30,
+            env=dict(os.environ, HOME=str(tmp_path)),
+        )
+
+        assert json.loads(result.stdout) == {"continue": True}
+        log = project / ".eri-rpg" / "modified" / "abc-123.log"
+        assert log.read_text() == os.path.realpath(project / "app.py") + "\n"
+
+
+class TestActivePointer:
+    """Test the .eri-rpg/active.json pointer read by pretooluse."""
+
+    def _project(self, tmp_path):
+        eri_dir = tmp_path / ".eri-rpg"
+        (eri_dir / "runs").mkdir(parents=True)
+        (eri_dir / "config.json").write_text(json.dumps({"mode": "maintain"}))
+        (eri_dir / "runs" / "run-1.json").write_text(json.dumps({"id": "run-1", "completed_at": None}))
+        (eri_dir / "preflight_state.json").write_text(
+            json.dumps({"ready": True, "target_files": ["a.py"], "learnings_status": {}})
+        )
+        return str(tmp_path)
+
+    def test_pointer_condenses_decision_inputs(self, tmp_path):
+        from erirpg.hooks.active import active_state
+
+        project = self._project(tmp_path)
+        state = active_state(project)
+
+        assert state["mode"] == "maintain"
+        assert state["run"] == {"id": "run-1"}
+        assert state["preflight"] == {"ready": True, "target_files": ["a.py"]}
+        assert state["quick_fix"] is None
+        assert (tmp_path / ".eri-rpg" / "active.json").exists()
+
+    def test_valid_pointer_skips_run_scan(self, tmp_path, monkeypatch):
+        from erirpg.hooks import active
+
+        project = self._project(tmp_path)
+        active.refresh_active(project)
+
+        def no_scan(project_path):
+            raise AssertionError("runs were scanned")
+
+        monkeypatch.setattr(active, "_latest_run_file", no_scan)
+        assert active.active_state(project)["run"] == {"id": "run-1"}
+
+    def test_changed_source_invalidates_pointer(self, tmp_path):
+        from erirpg.hooks.active import active_state, load_active, refresh_active
+
+        project = self._project(tmp_path)
+        refresh_active(project)
+        (tmp_path / ".eri-rpg" / "runs" / "run-1.json").write_text(
+            json.dumps({"id": "run-1", "completed_at": "2026-01-01T00:00:00"})
+        )
+
+        assert load_active(project) is None
+        assert active_state(project)["run"] is None
+
+    def test_quick_fix_refreshes_pointer(self, tmp_path):
+        from erirpg.hooks.active import load_active
+        from erirpg.quick import clear_quick_fix_state, save_quick_fix_state
+
+        project = self._project(tmp_path)
+        save_quick_fix_state(project, "b.py", "fix")
+        pointer = load_active(project)
+        assert pointer["quick_fix"] == {"quick_fix_active": True, "target_file": "b.py"}
+
+        clear_quick_fix_state(project)
+        assert load_active(project)["quick_fix"] is None
+
+
+class TestSessionStartGather:
+    """Test the deadline-bounded context gathering in sessionstart.py."""
+
+    def test_slow_section_is_truncated(self):
+        import time
+        from erirpg.hooks.sessionstart import Gatherer
+
+        gather = Gatherer(budget=0.2)
+        gather.submit("fast", lambda: "ok")
+        gather.submit("slow", time.sleep, 5)
+
+        started = time.monotonic()
+        assert gather.result("fast") == "ok"
+        assert gather.result("slow", "default") == "default"
+        assert time.monotonic() - started < 1.0
+        assert gather.status == {"fast": "complete", "slow": "truncated"}
+
+    def test_partial_context_on_slow_source(self, tmp_path, monkeypatch, capsys):
+        import io
+        import sys
+        import time
+        from erirpg.hooks import sessionstart
+
+        (tmp_path / ".eri-rpg" / "runs").mkdir(parents=True)
+        (tmp_path / ".eri-rpg" / "quick_fix_state.json").write_text(
+            json.dumps({"quick_fix_active": True, "target_file": "a.py"})
+        )
+        monkeypatch.setattr(sessionstart, "GATHER_BUDGET", 0.3)
+        monkeypatch.setattr(sessionstart, "get_incomplete_runs", lambda path: time.sleep(5))
+        monkeypatch.setattr(sessionstart, "get_sqlite_context_summary", lambda path: None)
+        monkeypatch.setattr(sessionstart, "start_new_sqlite_session", lambda path: None)
+        monkeypatch.setattr(sys, "stdin", io.StringIO(json.dumps({"cwd": str(tmp_path)})))
+
+        sessionstart.main()
+        message = json.loads(capsys.readouterr().out)["systemMessage"]
+
+        assert "Quick fix active on a.py" in message
+        assert "[truncated] Not gathered within 0.3s: runs" in message
+
+    def test_session_created_when_summary_truncated(self, tmp_path, monkeypatch, capsys):
+        import io
+        import sys
+        import time
+        from erirpg.hooks import sessionstart
+
+        (tmp_path / ".eri-rpg").mkdir()
+        created = []
+        monkeypatch.setattr(sessionstart, "GATHER_BUDGET", 0.3)
+        monkeypatch.setattr(sessionstart, "get_sqlite_context_summary", lambda path: time.sleep(5))
+        monkeypatch.setattr(sessionstart, "start_new_sqlite_session", lambda path: created.append(path) or "s1")
+        monkeypatch.setattr(sys, "stdin", io.StringIO(json.dumps({"cwd": str(tmp_path)})))
+
+        sessionstart.main()
+        message = json.loads(capsys.readouterr().out)["systemMessage"]
+
+        assert "[truncated] Not gathered within 0.3s: session" in message
+        assert created == [str(tmp_path)]
+
+
+class TestPersonaStateWrites:
+    """Test change-only, debounced persona writes to the global state."""
+
+    def test_update_state_merges_and_skips_unchanged(self, tmp_path):
+        from erirpg.hooks.global_state import read_state, update_state
+
+        path = str(tmp_path / "state.json")
+        (tmp_path / "state.json").write_text(json.dumps({"phase": "planning"}))
+
+        assert update_state({"persona": "qa"}, path) is True
+        assert read_state(path) == {"phase": "planning", "persona": "qa"}
+        mtime = os.stat(path).st_mtime_ns
+
+        assert update_state({"persona": "qa"}, path) is False
+        assert os.stat(path).st_mtime_ns == mtime
+
+    def test_update_state_requires_existing_dir(self, tmp_path):
+        from erirpg.hooks.global_state import update_state
+
+        assert update_state({"persona": "qa"}, str(tmp_path / "missing" / "state.json")) is False
+
+    def test_rapid_transitions_coalesce(self):
+        from datetime import datetime, timedelta
+        from erirpg.hooks.persona_detect import PERSONA_DEBOUNCE, persona_update
+
+        now = datetime(2026, 1, 1, 12, 0, 0)
+        state = {"persona": "analyzer", "persona_auto": True, "persona_updated": now.isoformat()}
+
+        assert persona_update(state, "analyzer", now + timedelta(seconds=60)) is None
+        assert persona_update(state, "backend", now + timedelta(seconds=1)) is None
+
+        later = now + timedelta(seconds=PERSONA_DEBOUNCE + 1)
+        fields = persona_update(state, "backend", later)
+        assert fields == {"persona": "backend", "persona_auto": True, "persona_updated": later.isoformat()}
+
+    def test_debounced_transition_lands_when_window_ends(self, tmp_path):
+        """The last persona of a burst is written once the window expires."""
+        from datetime import datetime
+        from erirpg.hooks.global_state import defer_update, flush_pending, read_state, update_state
+        from erirpg.hooks.persona_detect import persona_deferred, persona_update
+
+        path = str(tmp_path / "state.json")
+        now = datetime(2026, 1, 1, 12, 0, 0)
+        update_state({"persona": "analyzer", "persona_auto": True, "persona_updated": now.isoformat()}, path)
+
+        state = read_state(path)
+        assert persona_update(state, "backend", now) is None
+        fields, due = persona_deferred(state, "backend")
+        assert defer_update(fields, due.timestamp(), path)
+
+        assert not flush_pending(path, now=due.timestamp() - 1)
+        assert read_state(path)["persona"] == "analyzer"
+        assert flush_pending(path, now=due.timestamp())
+        assert read_state(path)["persona"] == "backend"
+        assert not (tmp_path / "state.json.pending").exists()
+
+    def test_deferred_update_keeps_first_due_time(self, tmp_path):
+        import json
+        from erirpg.hooks.global_state import defer_update
+
+        path = str(tmp_path / "state.json")
+        assert defer_update({"persona": "qa"}, 100.0, path)
+        assert not defer_update({"persona": "qa"}, 200.0, path)
+        assert defer_update({"persona": "devops"}, 300.0, path)
+        assert json.loads((tmp_path / "state.json.pending").read_text()) == {
+            "due": 300.0, "fields": {"persona": "devops"},
+        }
+
+    def test_update_parked_during_flush_survives(self, tmp_path, monkeypatch):
+        """A defer_update racing a flush waits for it instead of being deleted."""
+        import json
+        import threading
+        import time
+        from erirpg.hooks import global_state
+
+        path = str(tmp_path / "state.json")
+        assert global_state.defer_update({"persona": "qa"}, 100.0, path)
+
+        merge = global_state._merge
+        racer = threading.Thread(
+            target=global_state.defer_update, args=({"persona": "devops"}, 300.0, path),
+        )
+
+        def merge_while_parking(fields, state_path):
+            racer.start()
+            time.sleep(0.1)
+            assert racer.is_alive()  # Blocked on the state lock
+            return merge(fields, state_path)
+
+        monkeypatch.setattr(global_state, "_merge", merge_while_parking)
+        assert global_state.flush_pending(path, now=200.0)
+        racer.join()
+
+        assert global_state.read_state(path)["persona"] == "qa"
+        assert json.loads((tmp_path / "state.json.pending").read_text()) == {
+            "due": 300.0, "fields": {"persona": "devops"},
+        }
+
+    def test_concurrent_flushes_apply_once(self, tmp_path, monkeypatch):
+        import threading
+        import time
+        from erirpg.hooks import global_state
+
+        path = str(tmp_path / "state.json")
+        assert global_state.defer_update({"persona": "qa"}, 100.0, path)
+
+        merge = global_state._merge
+        merged = []
+        results = []
+        other = threading.Thread(
+            target=lambda: results.append(global_state.flush_pending(path, now=200.0)),
+        )
+
+        def merge_while_flushing(fields, state_path):
+            merged.append(fields)
+            if not other.is_alive() and not results:
+                other.start()
+                time.sleep(0.1)
+            return merge(fields, state_path)
+
+        monkeypatch.setattr(global_state, "_merge", merge_while_flushing)
+        assert global_state.flush_pending(path, now=200.0)
+        other.join()
+
+        assert results == [False]
+        assert merged == [{"persona": "qa"}]
+        assert not (tmp_path / "state.json.pending").exists()
+
+    def test_manual_persona_is_not_debounced(self):
+        from datetime import datetime
+        from erirpg.hooks.persona_detect import persona_update
+
+        now = datetime(2026, 1, 1, 12, 0, 0)
+        state = {"persona": "architect", "persona_updated": now.isoformat()}
+        assert persona_update(state, "qa", now)["persona"] == "qa"
+
+    def test_detection_rules(self):
+        from erirpg.hooks.persona_detect import detect_persona
+
+        assert detect_persona("Bash", {"command": "python -m pytest -q"}) == "qa"
+        assert detect_persona("Bash", {"command": "cd x && git status"}) == "devops"
+        assert detect_persona("Bash", {"command": "ruff check ."}) == "refactorer"
+        assert detect_persona("Edit", {"file_path": "src/auth/login.py"}) == "security"
+        assert detect_persona("Read", {"file_path": "docs/guide.md"}) == "scribe"
+        assert detect_persona("Bash", {"command": "ls"}) is None
+
+
+class TestPrecompactSnapshot:
+    """Test incremental precompact snapshots."""
+
+    def _run(self, project, monkeypatch, capsys):
+        import io
+        import sys
+        from erirpg.hooks import precompact
+
+        monkeypatch.setattr(sys, "stdin", io.StringIO(json.dumps({"cwd": str(project)})))
+        precompact.main()
+        return json.loads(capsys.readouterr().out)["systemMessage"]
+
+    def test_delta_since_last_snapshot(self, tmp_path, monkeypatch, capsys):
+        from erirpg import storage
+        from erirpg.hooks.modified_files import append_modified
+
+        monkeypatch.setenv("ERI_RPG_DB", str(tmp_path / "graphs.db"))
+        project = tmp_path / "proj"
+        (project / ".eri-rpg").mkdir(parents=True)
+        (project / ".eri-rpg" / "state.json").write_text(json.dumps({"session_id": "s1"}))
+        append_modified(str(project), "cc", str(project / "a.py"))
+
+        first = self._run(project, monkeypatch, capsys)
+        assert "Session: s1" in first
+        assert "Since last snapshot" not in first
+        assert storage.get_session("s1").files_modified == ["a.py"]
+
+        context_md = project / ".eri-rpg" / "CONTEXT.md"
+        mtime = context_md.stat().st_mtime_ns
+        self._run(project, monkeypatch, capsys)
+        assert context_md.stat().st_mtime_ns == mtime  # unchanged snapshot
+
+        append_modified(str(project), "cc", str(project / "b.py"))
+        storage.add_decision("s1", "storage", "use sqlite")
+        second = self._run(project, monkeypatch, capsys)
+        assert "Files changed: b.py" in second
+        assert "New decisions: 1" in second
+        assert "use sqlite" in context_md.read_text()
+
+
+class TestGitRefs:
+    """Test the .git-reading git facade against git itself."""
+
+    def _git(self, cwd, *args):
+        return subprocess.run(
+            ["git", *args], cwd=cwd, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    def _repo(self, tmp_path):
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        self._git(repo, "init", "-q", "-b", "main")
+        self._git(repo, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "one")
+        return repo
+
+    def test_branch_and_head_match_git(self, tmp_path):
+        from erirpg.hooks.gitrefs import current_branch, head_commit
+
+        repo = self._repo(tmp_path)
+        (repo / "sub").mkdir()
+        assert current_branch(str(repo / "sub")) == "main"
+        assert head_commit(str(repo)) == self._git(repo, "rev-parse", "HEAD")
+
+        self._git(repo, "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "--allow-empty", "-m", "two")
+        assert head_commit(str(repo)) == self._git(repo, "rev-parse", "HEAD")
+
+    def test_packed_refs_and_detached_head(self, tmp_path):
+        from erirpg.hooks.gitrefs import current_branch, head_commit
+
+        repo = self._repo(tmp_path)
+        sha = self._git(repo, "rev-parse", "HEAD")
+        self._git(repo, "pack-refs", "--all")
+        assert not (repo / ".git" / "refs" / "heads" / "main").exists()
+        assert head_commit(str(repo)) == sha
+
+        self._git(repo, "checkout", "-q", "--detach")
+        assert current_branch(str(repo)) == "HEAD"
+        assert head_commit(str(repo)) == sha
+
+    def test_worktree(self, tmp_path):
+        from erirpg.hooks.gitrefs import current_branch, head_commit
+
+        repo = self._repo(tmp_path)
+        self._git(repo, "worktree", "add", "-q", "-b", "side", str(tmp_path / "wt"))
+        assert current_branch(str(tmp_path / "wt")) == "side"
+        assert head_commit(str(tmp_path / "wt")) == self._git(repo, "rev-parse", "side")
+
+    def test_unborn_branch(self, tmp_path):
+        from erirpg.hooks.gitrefs import current_branch, head_commit
+
+        repo = tmp_path / "new"
+        repo.mkdir()
+        self._git(repo, "init", "-q", "-b", "main")
+        assert current_branch(str(repo)) == "main"
+        assert head_commit(str(repo)) is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
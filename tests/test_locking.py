@@ -0,0 +1,187 @@
+"""
+Tests for cross-process locking and three-way merging of state files.
+"""
+
+import multiprocessing
+import time
+from datetime import datetime
+
+import pytest
+
+from erirpg.locking import (
+    LockTimeout,
+    file_lock,
+    fcntl,
+    merge_fields,
+    merge_record_lists,
+    merge_records,
+)
+from erirpg.memory import KnowledgeStore, StoredLearning
+
+
+def _hold_lock(path, ready, release):
+    with file_lock(path):
+        ready.set()
+        release.wait(10)
+
+
+def _learning(path, summary="Summary"):
+    return StoredLearning(
+        module_path=path,
+        learned_at=datetime.now(),
+        summary=summary,
+        purpose="Purpose",
+    )
+
+
+class TestFileLock:
+    """Tests for file_lock()."""
+
+    @pytest.mark.skipif(fcntl is None, reason="fcntl not available")
+    def test_times_out_when_held_by_other_process(self, tmp_path):
+        path = str(tmp_path / "knowledge.json")
+        ready = multiprocessing.Event()
+        release = multiprocessing.Event()
+        holder = multiprocessing.Process(target=_hold_lock, args=(path, ready, release))
+        holder.start()
+        try:
+            assert ready.wait(10)
+            start = time.monotonic()
+            with pytest.raises(LockTimeout):
+                with file_lock(path, timeout=0.2):
+                    pass
+            assert time.monotonic() - start < 5
+        finally:
+            release.set()
+            holder.join(10)
+
+        with file_lock(path, timeout=1):
+            pass
+
+    def test_reentrant_in_same_thread(self, tmp_path):
+        path = str(tmp_path / "state.json")
+        with file_lock(path):
+            with file_lock(path, timeout=0.1):
+                pass
+
+
+class TestMerge:
+    """Tests for the three-way merge helpers."""
+
+    def test_merge_fields_combines_disjoint_changes(self):
+        base = {"phase": "idle", "task": None, "history": [1]}
+        ours = {"phase": "planning", "task": None, "history": [1, 2]}
+        theirs = {"phase": "idle", "task": "auth", "history": [1, 3]}
+        merged = merge_fields(base, ours, theirs)
+        assert merged == {"phase": "planning", "task": "auth", "history": [1, 2, 3]}
+
+    def test_merge_fields_conflict_keeps_ours(self):
+        assert merge_fields({"a": 1}, {"a": 2}, {"a": 3}) == {"a": 2}
+
+    def test_merge_records_keeps_deletions(self):
+        base = {"a": 1, "b": 1}
+        ours = {"a": 1, "b": 1, "c": 1}
+        theirs = {"b": 2}
+        assert merge_records(base, ours, theirs) == {"b": 2, "c": 1}
+
+    def test_merge_record_lists_by_key(self):
+        base = [{"id": 1}]
+        ours = [{"id": 1}, {"id": 2}]
+        theirs = [{"id": 1}, {"id": 3}]
+        merged = merge_record_lists(base, ours, theirs, key=lambda r: r["id"])
+        assert [r["id"] for r in merged] == [1, 2, 3]
+
+
+class TestKnowledgeMerge:
+    """Tests for merging concurrent KnowledgeStore saves."""
+
+    def test_stale_save_merges_instead_of_overwriting(self, tmp_path):
+        path = str(tmp_path / "knowledge.json")
+        base = KnowledgeStore(project="test")
+        base.add_learning(_learning("shared.py"))
+        base.save(path)
+
+        writer_a = KnowledgeStore.load(path)
+        writer_b = KnowledgeStore.load(path)
+        writer_a.add_learning(_learning("a.py"))
+        writer_a.add_pattern("a", "from a")
+        writer_b.add_learning(_learning("b.py"))
+        writer_b.remove_learning("shared.py")
+        writer_a.save(path)
+        writer_b.save(path)
+
+        loaded = KnowledgeStore.load(path)
+        assert set(loaded.learnings) == {"a.py", "b.py"}
+        assert loaded.patterns == {"a": "from a"}
+        # The stale writer sees the merged view too
+        assert set(writer_b.learnings) == {"a.py", "b.py"}
+
+    def test_conflicting_record_keeps_last_writer(self, tmp_path):
+        path = str(tmp_path / "knowledge.json")
+        base = KnowledgeStore(project="test")
+        base.add_learning(_learning("x.py", "original"))
+        base.save(path)
+
+        writer_a = KnowledgeStore.load(path)
+        writer_b = KnowledgeStore.load(path)
+        writer_a.add_learning(_learning("x.py", "from a"))
+        writer_b.add_learning(_learning("x.py", "from b"))
+        writer_a.save(path)
+        writer_b.save(path)
+
+        assert KnowledgeStore.load(path).learnings["x.py"].summary == "from b"
+
+
+class TestStateMerge:
+    """Tests for merging concurrent state writers."""
+
+    def test_orchestration_state_merges_fields_and_history(self, tmp_path, monkeypatch):
+        from erirpg.state import State
+
+        monkeypatch.setenv("HOME", str(tmp_path))
+        State.load().save()
+
+        writer_a = State.load()
+        writer_b = State.load()
+        writer_a.current_task = "auth"
+        writer_a.log("task", "auth")
+        writer_b.phase = "planning"
+        writer_b.log("plan")
+
+        loaded = State.load()
+        assert loaded.current_task == "auth"
+        assert loaded.phase == "planning"
+        assert [e["action"] for e in loaded.history] == ["task", "plan"]
+
+    def test_second_save_keeps_merged_fields(self, tmp_path, monkeypatch):
+        from erirpg.state import State
+
+        monkeypatch.setenv("HOME", str(tmp_path))
+        State.load().save()
+
+        writer_a = State.load()
+        writer_b = State.load()
+        writer_b.phase = "extracting"
+        writer_b.save()
+
+        writer_a.save()
+        assert State.load().phase == "extracting"
+        assert writer_a.phase == "extracting"
+        writer_a.save()
+        assert State.load().phase == "extracting"
+
+    def test_project_state_merges_lists(self, tmp_path):
+        from erirpg.models.state import State, load_state, save_state
+
+        save_state(str(tmp_path), State(project_name="p"))
+
+        writer_a = load_state(str(tmp_path))
+        writer_b = load_state(str(tmp_path))
+        writer_a.add_todo("write docs")
+        writer_b.add_blocker("waiting on API")
+        save_state(str(tmp_path), writer_a)
+        save_state(str(tmp_path), writer_b)
+
+        loaded = load_state(str(tmp_path))
+        assert loaded.todos == ["write docs"]
+        assert loaded.blockers == ["waiting on API"]
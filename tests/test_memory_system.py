@@ -637,5 +637,549 @@ class TestSearchFunctionality:
                 f"Non-matching score {non_matching_score} should be much lower than matching {matching_score}"
 
 
+# =============================================================================
+# Knowledge Journal Tests
+# =============================================================================
+
+class TestKnowledgeJournal:
+    """Tests for the append-only mutation journal."""
+
+    def _learning(self, path, summary="Summary"):
+        return StoredLearning(
+            module_path=path,
+            learned_at=datetime.now(),
+            summary=summary,
+            purpose="Purpose",
+        )
+
+    def test_flush_appends_without_rewriting_snapshot(self, tmp_path):
+        """flush() writes to the journal and leaves knowledge.json alone."""
+        path = tmp_path / "knowledge.json"
+        store = KnowledgeStore(project="test")
+        store.add_learning(self._learning("a.py"))
+        store.save(str(path))
+        snapshot_before = path.read_text()
+
+        store = KnowledgeStore.load(str(path))
+        store.add_learning(self._learning("b.py"))
+        assert store.flush(str(path)) == 1
+
+        assert path.read_text() == snapshot_before
+        loaded = KnowledgeStore.load(str(path))
+        assert set(loaded.learnings) == {"a.py", "b.py"}
+
+    def test_concurrent_flushes_do_not_clobber(self, tmp_path):
+        """Two writers loaded from the same base both keep their learnings."""
+        path = tmp_path / "knowledge.json"
+        KnowledgeStore(project="test").save(str(path))
+
+        writer_a = KnowledgeStore.load(str(path))
+        writer_b = KnowledgeStore.load(str(path))
+        writer_a.add_learning(self._learning("a.py"))
+        writer_b.add_learning(self._learning("b.py"))
+        writer_a.flush(str(path))
+        writer_b.flush(str(path))
+
+        loaded = KnowledgeStore.load(str(path))
+        assert set(loaded.learnings) == {"a.py", "b.py"}
+
+    def test_save_keeps_records_appended_after_load(self, tmp_path):
+        """A full save preserves journal records written by other writers."""
+        path = tmp_path / "knowledge.json"
+        KnowledgeStore(project="test").save(str(path))
+
+        slow = KnowledgeStore.load(str(path))
+        fast = KnowledgeStore.load(str(path))
+        fast.add_learning(self._learning("fast.py"))
+        fast.flush(str(path))
+
+        slow.add_pattern("p", "pattern")
+        slow.save(str(path))
+
+        loaded = KnowledgeStore.load(str(path))
+        assert "fast.py" in loaded.learnings
+        assert loaded.patterns == {"p": "pattern"}
+
+    def test_compaction_folds_journal(self, tmp_path):
+        """compact_journal moves records into the snapshot."""
+        from erirpg.memory import compact_journal, get_journal_path
+
+        path = tmp_path / "knowledge.json"
+        KnowledgeStore(project="test").save(str(path))
+        store = KnowledgeStore.load(str(path))
+        store.add_learning(self._learning("a.py"))
+        store.add_run(RunRecord(
+            timestamp=datetime.now(),
+            command="eri-rpg learn",
+            success=True,
+        ))
+        store.flush(str(path))
+        assert os.path.exists(get_journal_path(str(path)))
+
+        compact_journal(str(path))
+
+        assert not os.path.exists(get_journal_path(str(path)))
+        data = json.loads(path.read_text())
+        assert "a.py" in data["learnings"]
+        assert len(data["runs"]) == 1
+
+    def test_flush_without_snapshot_writes_snapshot(self, tmp_path):
+        """The first flush creates knowledge.json so raw readers see it."""
+        from erirpg.ui.data import load_knowledge as load_raw
+
+        eri_dir = tmp_path / ".eri-rpg"
+        store = KnowledgeStore(project="test")
+        store.add_learning(self._learning("a.py"))
+        store.flush(str(eri_dir / "knowledge.json"))
+        assert (eri_dir / "knowledge.json").exists()
+
+        store = KnowledgeStore.load(str(eri_dir / "knowledge.json"))
+        store.add_learning(self._learning("b.py"))
+        store.flush(str(eri_dir / "knowledge.json"))
+        assert set(load_raw(str(tmp_path))["learnings"]) == {"a.py", "b.py"}
+
+    def test_raw_reader_matches_store_replay(self, tmp_path):
+        """The UI loader replays the journal exactly as KnowledgeStore.load does."""
+        from erirpg.ui.data import load_knowledge as load_raw
+
+        path = tmp_path / ".eri-rpg" / "knowledge.json"
+        KnowledgeStore(project="test").save(str(path))
+        store = KnowledgeStore.load(str(path))
+        store.add_learning(self._learning("a.py"))
+        store.learnings["a.py"].drift_confidence = 0.75
+        store.record_enrichment("a.py")
+        store.flush(str(path))
+
+        raw = load_raw(str(tmp_path))
+        assert raw["learnings"]["a.py"]["drift_confidence"] == 0.75
+        reloaded = KnowledgeStore.load(str(path))
+        assert set(raw["learnings"]) == set(reloaded.learnings)
+
+    def test_enrichment_record_replays(self, tmp_path):
+        """record_enrichment journals drift fields onto an existing learning."""
+        path = tmp_path / "knowledge.json"
+        store = KnowledgeStore(project="test")
+        store.add_learning(self._learning("a.py"))
+        store.save(str(path))
+
+        store = KnowledgeStore.load(str(path))
+        learning = store.get_learning("a.py")
+        learning.drift_pattern_id = "api-rest"
+        learning.validated_by_drift = True
+        store.record_enrichment("a.py")
+        store.flush(str(path))
+
+        loaded = KnowledgeStore.load(str(path))
+        assert loaded.learnings["a.py"].drift_pattern_id == "api-rest"
+        assert loaded.learnings["a.py"].validated_by_drift
+
+    def test_partial_trailing_record_ignored(self, tmp_path):
+        """A half-written last line does not break loading."""
+        from erirpg.memory import get_journal_path
+
+        path = tmp_path / "knowledge.json"
+        KnowledgeStore(project="test").save(str(path))
+        store = KnowledgeStore.load(str(path))
+        store.add_learning(self._learning("a.py"))
+        store.flush(str(path))
+        with open(get_journal_path(str(path)), "a") as f:
+            f.write('{"op": "add_learning", "learn')
+
+        loaded = KnowledgeStore.load(str(path))
+        assert set(loaded.learnings) == {"a.py"}
+
+
+# =============================================================================
+# Snapshot Blob Store Tests
+# =============================================================================
+
+class TestSnapshotBlobs:
+    """Tests for content-addressed snapshot storage."""
+
+    def test_snapshot_stores_hashes_not_content(self, tmp_path):
+        """Versions reference blobs; identical content is stored once."""
+        from erirpg.blobs import BlobStore
+
+        (tmp_path / "mod.py").write_text("def f():\n    return 1\n")
+        learning = StoredLearning(
+            module_path="mod.py",
+            learned_at=datetime.now(),
+            summary="s",
+            purpose="p",
+        )
+        v1 = learning.snapshot("create", "first", ["mod.py"], str(tmp_path))
+        v2 = learning.snapshot("modify", "second", ["mod.py"], str(tmp_path))
+
+        assert v1.files_content is None
+        assert v1.files_blobs["mod.py"] == v2.files_blobs["mod.py"]
+        assert "files_content" not in v1.to_dict()
+        assert len(list(BlobStore(str(tmp_path)).iter_digests())) == 1
+
+    def test_rollback_files_reads_through_blobs(self, tmp_path):
+        """rollback_files restores content from the blob store."""
+        target = tmp_path / "mod.py"
+        target.write_text("original\n")
+        learning = StoredLearning(
+            module_path="mod.py",
+            learned_at=datetime.now(),
+            summary="s",
+            purpose="p",
+        )
+        learning.snapshot("create", "first", ["mod.py"], str(tmp_path))
+        learning.current_version = 2
+        target.write_text("changed\n")
+
+        result = learning.rollback_files(str(tmp_path), to_version=1)
+
+        assert result.success
+        assert target.read_text() == "original\n"
+
+    def test_gc_removes_unreferenced_and_externalizes_inline(self, tmp_path):
+        """gc_blobs moves inline content to blobs and drops orphans."""
+        from erirpg.blobs import BlobStore
+        from erirpg.memory import LearningVersion, gc_blobs
+
+        blobs = BlobStore(str(tmp_path))
+        orphan = blobs.put("nobody references me")
+        old = time.time() - 3600
+        os.utime(blobs._path(orphan), (old, old))
+
+        learning = StoredLearning(
+            module_path="mod.py",
+            learned_at=datetime.now(),
+            summary="s",
+            purpose="p",
+            versions=[LearningVersion(
+                version=1,
+                timestamp=datetime.now(),
+                operation="create",
+                summary="s",
+                purpose="p",
+                files_content={"mod.py": "legacy inline\n"},
+            )],
+        )
+        store = KnowledgeStore(project="test")
+        store.add_learning(learning)
+        save_knowledge(str(tmp_path), store)
+
+        stats = gc_blobs(str(tmp_path))
+
+        assert stats["removed"] == 1
+        assert stats["externalized"] == 1
+        assert not blobs.has(orphan)
+        loaded = load_knowledge(str(tmp_path), "test")
+        version = loaded.get_learning("mod.py").versions[0]
+        assert version.files_content is None
+        assert version.load_files_content(str(tmp_path)) == {"mod.py": "legacy inline\n"}
+
+    def test_gc_keeps_recent_unreferenced_blobs(self, tmp_path):
+        """Blobs put() but not yet referenced survive gc within the grace period."""
+        from erirpg.blobs import BlobStore
+
+        blobs = BlobStore(str(tmp_path))
+        fresh = blobs.put("about to be referenced")
+        stale = blobs.put("long forgotten")
+        old = time.time() - 3600
+        os.utime(blobs._path(stale), (old, old))
+
+        stats = blobs.gc([])
+
+        assert stats == {"kept": 1, "removed": 1, "bytes_freed": stats["bytes_freed"]}
+        assert blobs.has(fresh)
+        assert not blobs.has(stale)
+
+    def test_put_refreshes_existing_blob(self, tmp_path):
+        """Re-putting an old blob makes it recent again so gc spares it."""
+        from erirpg.blobs import BlobStore
+
+        blobs = BlobStore(str(tmp_path))
+        digest = blobs.put("reused content")
+        old = time.time() - 3600
+        os.utime(blobs._path(digest), (old, old))
+
+        assert blobs.put("reused content") == digest
+        blobs.gc([])
+        assert blobs.has(digest)
+
+
+# =============================================================================
+# Delta-Encoded Version History Tests
+# =============================================================================
+
+class TestVersionDeltas:
+    """Tests for delta-encoded version history and retention."""
+
+    def _version(self, num, when, summary="s", gotchas=None):
+        from erirpg.memory import LearningVersion
+        return LearningVersion(
+            version=num,
+            timestamp=when,
+            operation="modify",
+            summary=summary,
+            purpose="same purpose",
+            key_functions={"f": "does f"},
+            gotchas=gotchas or [],
+        )
+
+    def test_unchanged_fields_not_repeated(self, tmp_path):
+        """Later versions only store fields that changed."""
+        from erirpg.memory import decode_version_deltas, encode_version_deltas
+
+        now = datetime.now()
+        versions = [
+            self._version(1, now, summary="first"),
+            self._version(2, now, summary="second"),
+            self._version(3, now, summary="second", gotchas=["careful"]),
+        ]
+        encoded = encode_version_deltas(versions)
+
+        assert "purpose" in encoded[0]
+        assert encoded[1]["delta"] and "purpose" not in encoded[1]
+        assert encoded[1]["summary"] == "second"
+        assert "summary" not in encoded[2]
+
+        decoded = decode_version_deltas(json.loads(json.dumps(encoded)))
+        assert [v.summary for v in decoded] == ["first", "second", "second"]
+        assert decoded[2].gotchas == ["careful"]
+        assert decoded[0].gotchas == []
+        assert decoded[2].key_functions is not decoded[1].key_functions
+
+    def test_rollback_after_roundtrip(self, tmp_path):
+        """Rollback reconstructs a version stored as a delta."""
+        now = datetime.now()
+        learning = StoredLearning(
+            module_path="mod.py",
+            learned_at=now,
+            summary="third",
+            purpose="same purpose",
+            versions=[
+                self._version(1, now, summary="first"),
+                self._version(2, now, summary="second"),
+            ],
+            current_version=3,
+        )
+        loaded = StoredLearning.from_dict(json.loads(json.dumps(learning.to_dict())))
+
+        loaded.rollback(2)
+        assert loaded.summary == "second"
+        assert loaded.purpose == "same purpose"
+        assert loaded.key_functions == {"f": "does f"}
+
+    def test_retention_keeps_recent_and_checkpoints(self, tmp_path):
+        """Retention keeps the last N plus daily/weekly checkpoints."""
+        from datetime import timedelta
+        from erirpg.memory import VersionRetention
+
+        start = datetime(2026, 1, 1, 12, 0)
+        # 30 days, two versions per day
+        versions = []
+        for day in range(30):
+            for hour in (9, 17):
+                when = start + timedelta(days=day, hours=hour - 12)
+                versions.append(self._version(len(versions) + 1, when))
+
+        policy = VersionRetention(keep_last=4, keep_daily=3, keep_weekly=2)
+        kept = policy.select(versions, current_version=1)
+        nums = [v.version for v in kept]
+
+        assert nums[0] == 1  # current version always survives
+        assert nums[-4:] == [57, 58, 59, 60]
+        assert 56 in nums  # daily checkpoint (last of day)
+        assert 55 not in nums
+        assert 50 in nums  # weekly checkpoint (last of previous ISO week)
+        assert len(nums) < len(versions)
+
+    def test_save_applies_retention(self, tmp_path):
+        """KnowledgeStore.save prunes version history."""
+        from erirpg.memory import VersionRetention
+
+        now = datetime.now()
+        learning = StoredLearning(
+            module_path="mod.py",
+            learned_at=now,
+            summary="s",
+            purpose="p",
+            versions=[self._version(i, now) for i in range(1, 11)],
+            current_version=10,
+        )
+        store = KnowledgeStore(project="test", retention=VersionRetention(keep_last=3))
+        store.add_learning(learning)
+        path = tmp_path / "knowledge.json"
+        store.save(str(path))
+
+        loaded = KnowledgeStore.load(str(path))
+        assert [v.version for v in loaded.learnings["mod.py"].versions] == [8, 9, 10]
+
+
+# =============================================================================
+# BM25 Index Tests
+# =============================================================================
+
+class TestLearningIndex:
+    """Tests for the persistent BM25 learning index."""
+
+    def _store(self):
+        store = KnowledgeStore(project="test")
+        store.add_learning(StoredLearning(
+            module_path="db/connection.py",
+            learned_at=datetime.now(),
+            summary="Database connection pool",
+            purpose="Manages database connections",
+            key_functions={"connect": "Open a pooled connection"},
+        ))
+        store.add_learning(StoredLearning(
+            module_path="ui/render.py",
+            learned_at=datetime.now(),
+            summary="Renders widgets",
+            purpose="Drawing code",
+            gotchas=["Database calls here are slow"],
+        ))
+        return store
+
+    def test_field_weights_rank_summary_above_gotchas(self, tmp_path):
+        """A term in summary/purpose outranks the same term in gotchas."""
+        results = self._store().search("database", limit=10)
+        assert [r[0] for r in results] == ["db/connection.py", "ui/render.py"]
+
+    def test_index_persisted_and_updated_incrementally(self, tmp_path):
+        """The index is written next to knowledge.json and re-synced on change."""
+        from erirpg.search import LearningIndex
+
+        path = tmp_path / ".eri-rpg" / "knowledge.json"
+        self._store().save(str(path))
+
+        store = KnowledgeStore.load(str(path))
+        assert store.search("pool")[0][0] == "db/connection.py"
+        index_path = tmp_path / ".eri-rpg" / "search-index.json"
+        assert index_path.exists()
+
+        learning = store.get_learning("ui/render.py")
+        learning.summary = "Widget pool renderer"
+        store.add_learning(learning)
+        store.flush(str(path))
+
+        store = KnowledgeStore.load(str(path))
+        paths = [r[0] for r in store.search("pool")]
+        assert set(paths) == {"db/connection.py", "ui/render.py"}
+
+        index = LearningIndex.load(str(index_path))
+        assert "widget" in index.postings
+        assert "widgets" not in index.postings
+
+    def test_remove_drops_postings(self, tmp_path):
+        """Removing a learning removes its terms from the index."""
+        from erirpg.search import LearningIndex
+
+        store = self._store()
+        index = LearningIndex()
+        index.sync(store.learnings)
+        store.remove_learning("ui/render.py")
+        assert index.sync(store.learnings) == 1
+        assert "widgets" not in index.postings
+        assert list(index.docs) == ["db/connection.py"]
+
+    def test_search_after_remove_learning(self, tmp_path):
+        """Searching after an unsaved removal resyncs instead of raising."""
+        path = tmp_path / ".eri-rpg" / "knowledge.json"
+        self._store().save(str(path))
+
+        store = KnowledgeStore.load(str(path))
+        assert [r[0] for r in store.search("widgets")] == ["ui/render.py"]
+        store.remove_learning("ui/render.py")
+        assert store.search("widgets") == []
+        assert [r[0] for r in store.search("database")] == ["db/connection.py"]
+
+    def test_staleness_penalizes_top_results(self, tmp_path):
+        """Stale learnings drop below fresh ones when project_path is given."""
+        (tmp_path / "a.py").write_text("x = 1\n")
+        (tmp_path / "b.py").write_text("y = 1\n")
+        store = KnowledgeStore(project="test")
+        for name in ("a.py", "b.py"):
+            store.add_learning(StoredLearning(
+                module_path=name,
+                learned_at=datetime.now(),
+                summary="parser helpers",
+                purpose="parsing",
+                source_ref=CodeRef.from_file(str(tmp_path), name),
+            ))
+        (tmp_path / "a.py").write_text("x = 2\n")
+
+        results = store.search("parser", project_path=str(tmp_path))
+        assert results[0][0] == "b.py"
+        assert results[1][2] < results[0][2]
+
+
+# =============================================================================
+# Batched Staleness Tests
+# =============================================================================
+
+class TestStalenessService:
+    """Tests for batched staleness checks with the stat-keyed hash cache."""
+
+    def _refs(self, tmp_path, names):
+        refs = {}
+        for name in names:
+            (tmp_path / name).write_text(f"# {name}\n")
+            refs[name] = CodeRef.from_file(str(tmp_path), name)
+        return refs
+
+    def test_batch_matches_single_checks(self, tmp_path):
+        """check_refs agrees with CodeRef.is_stale for each ref."""
+        from erirpg.staleness import StalenessService
+
+        refs = self._refs(tmp_path, ["a.py", "b.py", "c.py", "d.py"])
+        (tmp_path / "a.py").write_text("# changed\n")
+        os.utime(tmp_path / "b.py", ns=(0, 1_000_000_000))  # touched, same content
+        (tmp_path / "c.py").unlink()
+        refs["none.py"] = None
+
+        result = StalenessService(str(tmp_path), max_workers=4).check_refs(refs)
+
+        assert result == {"a.py": True, "b.py": False, "c.py": True, "d.py": False, "none.py": False}
+        for name, ref in refs.items():
+            if ref is not None:
+                assert ref.is_stale(str(tmp_path)) == result[name]
+
+    def test_hash_cache_skips_unchanged_files(self, tmp_path, monkeypatch):
+        """Files with an unchanged stat signature are not re-hashed."""
+        from erirpg import staleness
+
+        (tmp_path / ".eri-rpg").mkdir()
+        refs = self._refs(tmp_path, ["a.py", "b.py"])
+        for name in refs:
+            os.utime(tmp_path / name, ns=(0, 1_000_000_000))
+
+        staleness.StalenessService(str(tmp_path)).check_refs(refs)
+        assert (tmp_path / ".eri-rpg" / "hash-cache.json").exists()
+
+        calls = []
+        real_hash = staleness.hash_path
+        monkeypatch.setattr(staleness, "hash_path", lambda p: calls.append(p) or real_hash(p))
+
+        service = staleness.StalenessService(str(tmp_path))  # fresh process-equivalent
+        assert service.check_refs(refs) == {"a.py": False, "b.py": False}
+        assert calls == []
+
+        (tmp_path / "a.py").write_text("# edited\n")
+        assert service.check_refs(refs)["a.py"] is True
+        assert len(calls) == 1
+
+    def test_store_stale_and_fresh_lists(self, tmp_path):
+        """KnowledgeStore staleness helpers use the batch check."""
+        store = KnowledgeStore(project="test")
+        for name, ref in self._refs(tmp_path, ["a.py", "b.py"]).items():
+            store.add_learning(StoredLearning(
+                module_path=name,
+                learned_at=datetime.now(),
+                summary="s",
+                purpose="p",
+                source_ref=ref,
+            ))
+        (tmp_path / "b.py").write_text("# different\n")
+
+        assert store.get_stale_learnings(str(tmp_path)) == ["b.py"]
+        assert store.get_fresh_learnings(str(tmp_path)) == ["a.py"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
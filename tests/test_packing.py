@@ -0,0 +1,112 @@
+"""
+Tests for relevance-weighted context packing.
+"""
+
+import itertools
+import re
+
+from erirpg.graph import Edge, Graph, Module
+from erirpg.packing import ContextItem, candidate_items, module_relevance, pack_items
+
+
+def _graph(paths, edges):
+    graph = Graph(project="test")
+    for path in paths:
+        graph.add_module(Module(path=path, lang="python"))
+    for source, target in edges:
+        graph.add_edge(Edge(source=source, target=target, edge_type="imports", specifics=[]))
+    return graph
+
+
+def _item(path, kind, tokens, fidelity):
+    return ContextItem(path, kind, "x", tokens, fidelity)
+
+
+class TestModuleRelevance:
+    """Tests for module_relevance()."""
+
+    def test_closer_modules_rank_higher(self):
+        paths = ["core.py", "helper.py", "far.py", "island.py"]
+        graph = _graph(paths, [("core.py", "helper.py"), ("helper.py", "far.py")])
+
+        relevance = module_relevance(paths, graph, primary="core.py")
+
+        assert relevance["core.py"] == 1.0
+        assert relevance["helper.py"] > relevance["far.py"] > relevance["island.py"]
+
+    def test_query_scores_break_ties(self):
+        paths = ["a.py", "b.py"]
+        relevance = module_relevance(paths, None, query_scores={"b.py": 2.0})
+        assert relevance["b.py"] > relevance["a.py"]
+
+
+class TestPackItems:
+    """Tests for pack_items()."""
+
+    def test_prefers_relevant_signatures_over_irrelevant_bodies(self):
+        items = {
+            "central.py": [_item("central.py", "full", 900, 1.0),
+                           _item("central.py", "signatures", 100, 0.45)],
+            "big_util.py": [_item("big_util.py", "full", 400, 1.0)],
+        }
+        relevance = {"central.py": 1.0, "big_util.py": 0.2}
+
+        chosen = pack_items(items, relevance, budget=500)
+
+        assert chosen["central.py"].kind == "signatures"
+        assert chosen["big_util.py"].kind == "full"
+
+    def test_matches_brute_force(self):
+        items = {
+            f"m{i}.py": [
+                _item(f"m{i}.py", "full", 100 + 37 * i, 1.0),
+                _item(f"m{i}.py", "truncated", 40 + 11 * i, 0.6),
+                _item(f"m{i}.py", "summary", 10, 0.2),
+            ]
+            for i in range(5)
+        }
+        relevance = {f"m{i}.py": 1.0 / (1 + i) for i in range(5)}
+        budget = 300
+
+        chosen = pack_items(items, relevance, budget)
+        value = sum(relevance[p] * it.fidelity for p, it in chosen.items())
+        assert sum(it.tokens for it in chosen.values()) <= budget
+
+        best = 0.0
+        for combo in itertools.product(*[[None] + opts for opts in items.values()]):
+            picked = [it for it in combo if it is not None]
+            if sum(it.tokens for it in picked) <= budget:
+                best = max(best, sum(relevance[it.path] * it.fidelity for it in picked))
+        assert abs(value - best) < 1e-9
+
+    def test_overhead_and_empty_budget(self):
+        items = {"a.py": [_item("a.py", "full", 95, 1.0)]}
+        assert pack_items(items, {"a.py": 1.0}, budget=100, overhead=10) == {}
+        assert pack_items(items, {"a.py": 1.0}, budget=0) == {}
+
+
+class TestCandidateItems:
+    """Tests for candidate_items()."""
+
+    def test_builds_all_renderings(self):
+        code = "\n".join(
+            f"def f{i}():\n    return {i}" for i in range(40)
+        )
+
+        def count(text):
+            return len(text.split())
+
+        def truncate(text, max_tokens, path):
+            lines = text.split("\n")
+            kept = lines[:max(1, max_tokens // 2)]
+            out = "\n".join(kept) + f"\n\n# ... [{len(lines) - len(kept)} lines truncated]"
+            return out, count(out), True
+
+        items = candidate_items(
+            "m.py", code, count, truncate, re.compile(r"^def "), summary="Does things"
+        )
+        kinds = [it.kind for it in items]
+
+        assert kinds == ["full", "truncated", "truncated", "signatures", "summary"]
+        assert all(it.tokens < items[0].tokens for it in items[1:])
+        assert items[1].fidelity > items[2].fidelity
@@ -0,0 +1,166 @@
+"""
+Tests for symbol-level slicing of feature code.
+"""
+
+from erirpg.graph import Graph, Interface, Module
+from erirpg.ops import Feature
+from erirpg.refs import CodeRef
+from erirpg.slicing import matches_query, render_slices, slice_feature, symbol_ranges
+
+UTIL = '''import os
+
+LIMIT = 3
+
+
+def parse_token(text):
+    return _strip(text)
+
+
+def _strip(text):
+    return text.strip()
+
+
+def unrelated_big():
+    return 1 + 2 + 3
+
+
+@decorated
+def also_unrelated():
+    pass
+'''
+
+MAIN = '''from util import parse_token
+
+
+def count_tokens(text):
+    return len(parse_token(text))
+
+
+def render_page():
+    return "page"
+'''
+
+
+def _interfaces(text):
+    """Interfaces with line numbers, as the Python parser reports them."""
+    result = []
+    for i, line in enumerate(text.split("\n"), 1):
+        if line.startswith("def "):
+            name = line[4:].split("(")[0]
+            result.append(Interface(name=name, type="function", line=i))
+    return result
+
+
+def _project(tmp_path):
+    (tmp_path / "util.py").write_text(UTIL)
+    (tmp_path / "main.py").write_text(MAIN)
+    graph = Graph(project="test")
+    graph.add_module(Module(path="util.py", lang="python", interfaces=_interfaces(UTIL)))
+    graph.add_module(Module(path="main.py", lang="python", interfaces=_interfaces(MAIN)))
+    return graph
+
+
+def _feature(tmp_path, graph):
+    components = ["util.py", "main.py"]
+    return Feature(
+        name="tokens",
+        source_project="test",
+        primary_module="main.py",
+        components=components,
+        code_refs={p: CodeRef.from_file(str(tmp_path), p) for p in components},
+        symbol_refs=slice_feature(graph, str(tmp_path), components, "main.py", "count tokens"),
+    )
+
+
+class TestSymbolRanges:
+    """Tests for symbol_ranges()."""
+
+    def test_ranges_include_decorators_and_skip_blank_tails(self):
+        lines = UTIL.splitlines(keepends=True)
+        module = Module(path="util.py", lang="python", interfaces=_interfaces(UTIL))
+        ranges = symbol_ranges(module, lines)
+
+        assert ranges[""] == (1, 5)
+        assert ranges["parse_token"] == (6, 7)
+        start, _ = ranges["also_unrelated"]
+        assert lines[start - 1].startswith("@decorated")
+
+    def test_query_matching_uses_word_stems(self):
+        assert matches_query("count_tokens", "token counting")
+        assert matches_query("TokenCounter", "tokens")
+        assert not matches_query("render_page", "token counting")
+
+
+class TestSliceFeature:
+    """Tests for slice_feature() and Feature.hydrate_slices()."""
+
+    def test_keeps_used_symbols_and_local_callees(self, tmp_path):
+        graph = _project(tmp_path)
+        feature = _feature(tmp_path, graph)
+
+        names = {p: [r.name for r in refs] for p, refs in feature.symbol_refs.items()}
+        assert names["main.py"] == ["", "count_tokens"]
+        assert names["util.py"] == ["", "parse_token", "_strip"]
+
+        code = feature.hydrate_slices(str(tmp_path))
+        assert "def _strip" in code["util.py"]
+        assert "unrelated_big" not in code["util.py"]
+        assert "# ... (" in code["util.py"]
+        assert "render_page" not in code["main.py"]
+
+    def test_symbol_refs_round_trip(self, tmp_path):
+        graph = _project(tmp_path)
+        feature = _feature(tmp_path, graph)
+        path = str(tmp_path / "feature.json")
+        feature.save(path)
+
+        loaded = Feature.load(path)
+        assert loaded.symbol_refs == feature.symbol_refs
+
+    def test_edit_elsewhere_keeps_slice(self, tmp_path):
+        graph = _project(tmp_path)
+        feature = _feature(tmp_path, graph)
+        ref = feature.symbol_refs["util.py"][1]
+
+        # Change only an unused function's body
+        (tmp_path / "util.py").write_text(UTIL.replace("1 + 2 + 3", "4 + 5 + 6"))
+
+        assert not ref.is_stale(str(tmp_path))
+        assert "parse_token" in feature.hydrate_slices(str(tmp_path))["util.py"]
+
+    def test_lines_inserted_above_keep_slice(self, tmp_path):
+        graph = _project(tmp_path)
+        feature = _feature(tmp_path, graph)
+        refs = feature.symbol_refs["util.py"]
+
+        # A new function above the sliced ones shifts them down
+        shifted = UTIL.replace("def parse_token", "def added_first():\n    pass\n\n\ndef parse_token")
+        (tmp_path / "util.py").write_text(shifted)
+
+        assert not refs[1].is_stale(str(tmp_path))
+        assert refs[1].locate(shifted.splitlines(keepends=True)) == (
+            refs[1].line_start + 4, refs[1].line_end + 4
+        )
+        code = feature.hydrate_slices(str(tmp_path))["util.py"]
+        assert "def parse_token" in code
+        assert "def _strip" in code
+        assert "added_first" not in code
+        assert "unrelated_big" not in code
+
+    def test_changed_symbol_falls_back_to_whole_file(self, tmp_path):
+        graph = _project(tmp_path)
+        feature = _feature(tmp_path, graph)
+        edited = UTIL.replace("return _strip(text)", "return _strip(text).lower()")
+        (tmp_path / "util.py").write_text(edited)
+
+        assert feature.symbol_refs["util.py"][1].is_stale(str(tmp_path))
+        assert feature.hydrate_slices(str(tmp_path))["util.py"] == edited
+        assert render_slices(edited, feature.symbol_refs["util.py"], "util.py") is None
+
+    def test_unmatched_primary_is_kept_whole(self, tmp_path):
+        graph = _project(tmp_path)
+        refs = slice_feature(graph, str(tmp_path), ["util.py", "main.py"], "main.py", "zebra")
+
+        assert "main.py" not in refs
+        # Dependencies are still sliced to what the whole primary uses
+        assert [r.name for r in refs["util.py"]] == ["", "parse_token", "_strip"]
@@ -0,0 +1,64 @@
+"""
+Tests for the status line render cache.
+"""
+
+import json
+
+import pytest
+
+from erirpg import statusline
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.setattr(statusline.Path, "home", lambda: tmp_path / "home")
+    (tmp_path / "proj" / ".eri-rpg").mkdir(parents=True)
+    (tmp_path / "proj" / ".eri-rpg" / "config.json").write_text(json.dumps({"tier": "standard"}))
+    git_dir = tmp_path / "proj" / ".git"
+    git_dir.mkdir()
+    (git_dir / "HEAD").write_text("ref: refs/heads/feature/cache\n")
+    return tmp_path / "proj"
+
+
+def test_branch_read_from_head(project):
+    assert statusline.get_git_branch(str(project)) == "feature/cache"
+    (project / ".git" / "HEAD").write_text("0123456789abcdef0123456789abcdef01234567\n")
+    assert statusline.get_git_branch(str(project)) == "HEAD"
+
+
+def test_branch_in_worktree(tmp_path, project):
+    worktree = tmp_path / "wt"
+    worktree.mkdir()
+    gitdir = project / ".git" / "worktrees" / "wt"
+    gitdir.mkdir(parents=True)
+    (gitdir / "HEAD").write_text("ref: refs/heads/other\n")
+    (worktree / ".git").write_text(f"gitdir: {gitdir}\n")
+    assert statusline.get_git_branch(str(worktree / "sub")) == "other"
+
+
+def test_unchanged_inputs_hit_cache(project, monkeypatch):
+    facts = statusline.load_facts(str(project), str(project))
+    assert facts["tier"] == "standard"
+    assert facts["branch"] == "feature/cache"
+    assert (project / ".eri-rpg" / statusline.CACHE_FILE).exists()
+
+    def no_collect(cwd):
+        raise AssertionError("inputs were re-read")
+
+    monkeypatch.setattr(statusline, "collect_facts", no_collect)
+    assert statusline.load_facts(str(project), str(project)) == facts
+
+
+def test_changed_input_rebuilds(project):
+    statusline.load_facts(str(project), str(project))
+
+    (project / ".eri-rpg" / "config.json").write_text(json.dumps({"tier": "full"}))
+    (project / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    planning = project / ".planning"
+    planning.mkdir()
+    (planning / "STATE.md").write_text("**Phase:** 2 of 5\n")
+
+    facts = statusline.load_facts(str(project), str(project))
+    assert facts["tier"] == "full"
+    assert facts["branch"] == "main"
+    assert (facts["coder_current"], facts["coder_total"]) == (2, 5)